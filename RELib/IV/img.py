@@ -0,0 +1,173 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# GTA IV IMG archives (version 3)
+#
+# Layout on disk:
+#   0x00  u32      Magic          0xA94E2A52
+#   0x04  u32      Version        3
+#   0x08  u32      Entry Count
+#   0x0C  u32      Table Size     Bytes of entry table + name table
+#   0x10  u16      Entry Size     16
+#   0x12  u16      Unknown
+#   0x14  entries  Entry Count x
+#           u32  Item Size        RSC flags on resource entries, byte size otherwise
+#           u32  Resource Type    RSC version on resource entries (110 drawables, 8 textures, ...)
+#           u32  Offset           In 2048 byte blocks from the start of the archive
+#           u16  Used Blocks
+#           u16  Padding          Low 11 bits: unused bytes in the last block
+#   ....  names    Entry Count zero-terminated names, in entry order
+#
+# The archive is mmapped and the table parsed once per file (size + mtime), so
+# entries are served as zero-copy slices that RSCResource.from_buffer inflates
+# directly. Archives whose header is encrypted (the magic does not match) are not
+# supported; they have to be decrypted first.
+
+import os
+import mmap
+import struct
+
+from fnmatch import fnmatch
+
+from .rsc import RSC_MAGIC, RSCResource
+
+IMG_MAGIC = 0xA94E2A52
+IMG_VERSION = 3
+IMG_BLOCK_SIZE = 2048
+IMG_HEADER = struct.Struct('<IIIIHH')
+IMG_ENTRY = struct.Struct('<IIIHH')
+IMG_PADDING_MASK = 0x7FF
+
+_tables = {}        # Absolute path -> (size, mtime_ns, [ImgEntry, ...])
+
+
+#######################################################
+class ImgEntry:
+    __slots__ = ('index', 'name', 'offset', 'size', 'item_size', 'resource_type')
+
+    def __init__(self, index, name, offset, size, item_size, resource_type):
+        self.index = index
+        self.name = name
+        self.offset = offset                # Byte offset in the archive
+        self.size = size                    # Byte size, last block padding excluded
+        self.item_size = item_size          # RSC flags on resource entries
+        self.resource_type = resource_type  # RSC version on resource entries
+
+    @property
+    def extension(self):
+        return os.path.splitext(self.name)[1].lower()
+
+
+#######################################################
+def read_img_table(buffer):
+    if len(buffer) < IMG_HEADER.size:
+        raise ValueError("Not an IMG archive: file is too small.")
+
+    magic, version, entry_count, table_size, entry_size, _ = IMG_HEADER.unpack_from(buffer, 0)
+    if magic != IMG_MAGIC:
+        raise ValueError("Not an unencrypted IMG v3 archive (encrypted headers are not supported).")
+    if version != IMG_VERSION:
+        raise ValueError(f"IMG version {version} is not supported, expected {IMG_VERSION}.")
+    if entry_size != IMG_ENTRY.size:
+        raise ValueError(f"Unexpected IMG entry size {entry_size}.")
+
+    table_offset = IMG_HEADER.size
+    names_offset = table_offset + entry_count * IMG_ENTRY.size
+    names_end = table_offset + table_size
+    if names_end > len(buffer) or names_offset > names_end:
+        raise ValueError("IMG entry table runs past the end of the file.")
+
+    names = bytes(buffer[names_offset:names_end]).split(b'\0')
+    entries = []
+    for index, (item_size, resource_type, block_offset, used_blocks, padding) in enumerate(IMG_ENTRY.iter_unpack(buffer[table_offset:names_offset])):
+        offset = block_offset * IMG_BLOCK_SIZE
+        size = used_blocks * IMG_BLOCK_SIZE - (padding & IMG_PADDING_MASK)
+        if offset + size > len(buffer):
+            raise ValueError(f"IMG entry {index} runs past the end of the file.")
+        name = names[index].decode('utf-8', 'replace') if index < len(names) else f"entry_{index}"
+        entries.append(ImgEntry(index, name, offset, size, item_size, resource_type))
+    return entries
+
+
+#######################################################
+class ImgArchive:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.name = os.path.basename(filepath)
+
+        with open(filepath, 'rb') as f:
+            self._mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self.entries = self._load_table()
+        except Exception:
+            self._mapped_file.close()
+            raise
+        self._by_name = {entry.name.lower(): entry for entry in self.entries}
+
+    def _load_table(self):
+        path = os.path.abspath(self.filepath)
+        info = os.stat(path)
+        cached = _tables.get(path)
+        if cached is not None and cached[:2] == (info.st_size, info.st_mtime_ns):
+            return cached[2]
+        entries = read_img_table(self._mapped_file)
+        _tables[path] = (info.st_size, info.st_mtime_ns, entries)
+        return entries
+
+    def find(self, name):
+        return self._by_name.get(name.lower())
+
+    def match(self, patterns):
+        # Entries whose name matches any of the (case-insensitive) fnmatch patterns, in archive order
+        patterns = [pattern.lower() for pattern in patterns]
+        return [entry for entry in self.entries if any(fnmatch(entry.name.lower(), pattern) for pattern in patterns)]
+
+    def view(self, entry):
+        # Zero-copy slice of the entry's bytes
+        return memoryview(self._mapped_file)[entry.offset:entry.offset + entry.size]
+
+    def is_resource(self, entry):
+        return entry.size >= 4 and self._mapped_file[entry.offset:entry.offset + len(RSC_MAGIC)] == RSC_MAGIC
+
+    def resource(self, entry):
+        # RSCResource straight over the entry slice; only the entry's own bytes are ever read
+        if not self.is_resource(entry):
+            raise ValueError(f"{entry.name} in {self.name} is not an RSC resource.")
+        return RSCResource.from_buffer(self.view(entry), entry.name)
+
+    def close(self):
+        if self._mapped_file is None:
+            return
+        try:
+            self._mapped_file.close()
+        except BufferError:
+            pass    # An uncompressed entry is still served from the mapping; it goes once that view is collected
+        self._mapped_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,71 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Vectorized index buffer decoding for RAGE IV drawables
+#
+# Index data sits in the graphics segment as little-endian u16: the index
+# buffer records no format, and a vertex buffer holds at most 0xFFFF vertices.
+# The geometry's primitive type decides whether it is a plain triangle list or
+# a triangle strip.
+
+import numpy as np
+
+from ...REutils.diagnostics import diagnostics as diag
+
+PRIMITIVE_TRIANGLE_LIST = 3     # grcDrawMode drawTris
+PRIMITIVE_TRIANGLE_STRIP = 4    # grcDrawMode drawTriStrip
+
+INDEX_SIZE_16 = 2
+
+#######################################################
+def decode_index_buffer(buffer, index_count, primitive_type=PRIMITIVE_TRIANGLE_LIST):
+    if index_count * INDEX_SIZE_16 > len(buffer):
+        raise ValueError(f"Index buffer holds {len(buffer)} bytes, {index_count} indices need {index_count * INDEX_SIZE_16}.")
+
+    indices = np.frombuffer(buffer, dtype='<u2', count=index_count)
+
+    if primitive_type == PRIMITIVE_TRIANGLE_STRIP:
+        return triangle_strip_to_list(indices)
+
+    if primitive_type != PRIMITIVE_TRIANGLE_LIST:
+        # Read as a list, like the original importer did, rather than losing the whole drawable
+        diag.error("⚠️ Unknown primitive type {}, reading {} indices as a triangle list.", primitive_type, index_count)
+
+    usable_count = index_count - (index_count % 3)      # A trailing partial triangle cannot be drawn
+    return indices[:usable_count].reshape(-1, 3)
+#######################################################
+def triangle_strip_to_list(strip):
+    if len(strip) < 3:
+        return np.empty((0, 3), dtype=strip.dtype)
+
+    first = strip[:-2]
+    second = strip[1:-1]
+    third = strip[2:]
+
+    # Every other strip triangle is wound backwards; swap its last two corners to keep facing consistent
+    odd = (np.arange(len(first)) & 1).astype(bool)
+    triangles = np.column_stack((first, np.where(odd, third, second), np.where(odd, second, third)))
+
+    # D3D9 strips are stitched with degenerate triangles, which carry no surface
+    keep = (first != second) & (second != third) & (first != third)
+    return triangles[keep]
@@ -0,0 +1,187 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Block layouts for RAGE IV drawables (.wdr, and the drawables embedded in .wdd)
+#
+# Each layout is a list of (field name, struct format) pairs compiled once into a
+# struct.Struct, so a whole block is decoded with a single unpack_from straight out
+# of the segment view. Records are namedtuples (slotted, no per-instance dict).
+# Fields named None are padding and are skipped on read and zero-filled on write.
+# All pointer fields hold raw 0x5/0x6 pointers for RSCResource.resolve().
+
+import struct
+
+from collections import namedtuple
+
+LAYOUTS = {}        # Record name -> BlockLayout
+
+
+#######################################################
+def make_record(name, values):
+    # Unpickles a record; namedtuple classes built at runtime are not importable by name
+    return LAYOUTS[name].record._make(values)
+
+
+#######################################################
+class BlockLayout:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = tuple(fields)
+        self.struct = struct.Struct('<' + ''.join(field_format for _, field_format in self.fields))
+        self.size = self.struct.size
+
+        # Padding ('x') produces no value, so it never becomes a record field
+        self.field_names = tuple(field_name for field_name, _ in self.fields if field_name is not None)
+        self.record = namedtuple(name, self.field_names)
+        self.record.__reduce__ = lambda record: (make_record, (name, tuple(record)))   # Records cross process boundaries by layout name
+        LAYOUTS[name] = self
+
+    def unpack_from(self, buffer, offset=0):
+        return self.record._make(self.struct.unpack_from(buffer, offset))
+
+    def read(self, resource, pointer):
+        segment, offset = resource.resolve(pointer, self.size)
+        return self.unpack_from(segment, offset)
+
+    def pack(self, record=None, **values):
+        if record is not None:
+            values = {**record._asdict(), **values}
+        return self.struct.pack(*(values.get(field_name, 0) for field_name in self.field_names))
+
+    def pack_into(self, buffer, offset, record=None, **values):
+        buffer[offset:offset + self.size] = self.pack(record, **values)
+
+
+#######################################################
+def read_pointer_array(resource, pointer, count):
+    # atArray<T*> payload: count raw u32 pointers in one unpack
+    if count == 0:
+        return ()
+    segment, offset = resource.resolve(pointer, 4 * count)
+    return struct.unpack_from(f'<{count}I', segment, offset)
+
+
+#######################################################
+WDR_HEADER = BlockLayout("WDRHeader", (
+    ('vtable', 'I'),                    # 0x00
+    ('block_map_ptr', 'I'),             # 0x04  Low byte is the header length on standalone drawables
+    ('shadergroup_ptr', 'I'),           # 0x08
+    ('skeleton_ptr', 'I'),              # 0x0C
+    ('center_x', 'f'), ('center_y', 'f'), ('center_z', 'f'), ('center_w', 'f'),    # 0x10
+    ('min_x', 'f'), ('min_y', 'f'), ('min_z', 'f'), ('min_w', 'f'),                 # 0x20
+    ('max_x', 'f'), ('max_y', 'f'), ('max_z', 'f'), ('max_w', 'f'),                 # 0x30
+    ('model_collection_ptr', 'I'),      # 0x40  High detail
+    ('lod1_ptr', 'I'),                  # 0x44
+    ('lod2_ptr', 'I'),                  # 0x48
+    ('lod3_ptr', 'I'),                  # 0x4C
+    ('max_vector_x', 'f'), ('max_vector_y', 'f'), ('max_vector_z', 'f'), ('max_vector_w', 'f'),    # 0x50
+    ('object_count', 'I'),              # 0x60
+    ('unk64', 'I'),
+    ('unk68', 'I'),
+    ('unk6c', 'I'),
+    ('unk70', 'f'),
+    ('unk74', 'I'),
+    ('unk78', 'I'),
+    ('unk7c', 'I'),
+    ('fx_ptr', 'I'),                    # 0x80  2DFX
+    ('fx_count', 'H'),
+    ('fx_size', 'H'),
+    ('reserved', '8s'),                 # 0x88
+    ('end_header', 'I'),                # 0x90
+))
+
+MODEL_COLLECTION = BlockLayout("ModelCollection", (
+    ('model_array_ptr', 'I'),           # 0x00  Pointer to an array of model pointers
+    ('model_count', 'H'),               # 0x04
+    ('model_capacity', 'H'),            # 0x06
+    ('padding_1', 'I'),                 # 0x08
+    ('padding_2', 'I'),                 # 0x0C
+))
+
+MODEL = BlockLayout("Model", (
+    ('vtable', 'I'),                    # 0x00
+    ('geometry_collection_ptr', 'I'),   # 0x04  Pointer to an array of geometry pointers
+    ('number_of_geo_ptrs', 'H'),        # 0x08
+    ('number_of_geometries', 'H'),      # 0x0A
+    ('vector_array_ptr', 'I'),          # 0x0C
+    ('material_array_ptr', 'I'),        # 0x10
+    ('unk1', 'H'),                      # 0x14
+    ('unk2', 'H'),                      # 0x16
+    ('unk3', 'H'),                      # 0x18
+    ('geometry_count', 'H'),            # 0x1A
+    ('padding', 'I'),                   # 0x1C
+))
+
+GEOMETRY = BlockLayout("Geometry", (
+    ('vtable', 'I'),                    # 0x00
+    ('unk1', 'I'),                      # 0x04
+    ('unk2', 'I'),                      # 0x08
+    ('vertex_buffer_ptr', 'I'),         # 0x0C
+    ('unk3', 'I'),                      # 0x10
+    ('unk4', 'I'),                      # 0x14
+    ('unk5', 'I'),                      # 0x18
+    ('index_buffer_ptr', 'I'),          # 0x1C
+    ('unk6', 'I'),                      # 0x20
+    ('unk7', 'I'),                      # 0x24
+    ('unk8', 'I'),                      # 0x28
+    ('index_count', 'I'),               # 0x2C
+    ('face_count', 'I'),                # 0x30
+    ('vertex_count', 'H'),              # 0x34
+    ('primitive_type', 'H'),            # 0x36
+    ('unk9', 'I'),                      # 0x38
+    ('vertex_stride', 'H'),             # 0x3C
+    ('unk10', 'H'),                     # 0x3E
+    ('unk11', 'I'),                     # 0x40
+    ('unk12', 'I'),                     # 0x44
+    ('unk13', 'I'),                     # 0x48
+    ('padding', 'I'),                   # 0x4C
+))
+
+VERTEX_BUFFER = BlockLayout("VertexBuffer", (
+    ('vtable', 'I'),                    # 0x00
+    ('vertex_count', 'H'),              # 0x04
+    ('unknown1', 'H'),                  # 0x06
+    ('data_ptr1', 'I'),                 # 0x08  Vertex data, graphics segment
+    ('stride', 'I'),                    # 0x0C
+    ('decl_ptr', 'I'),                  # 0x10  Vertex declaration, system segment
+    ('unknown2', 'I'),                  # 0x14
+    ('data_ptr2', 'I'),                 # 0x18
+    ('unknown3', 'I'),                  # 0x1C
+))
+
+INDEX_BUFFER = BlockLayout("IndexBuffer", (
+    ('vtable', 'I'),                    # 0x00
+    ('index_count', 'I'),               # 0x04
+    ('data_ptr', 'I'),                  # 0x08  Index data, graphics segment
+    ('unknown1', 'I'),                  # 0x0C
+    ('padding', '48s'),                 # 0x10 - 0x3F
+))
+
+VERTEX_DECLARATION = BlockLayout("VertexDeclaration", (
+    ('usage_flags', 'I'),               # 0x00
+    ('stride', 'H'),                    # 0x04
+    ('decoder', 'B'),                   # 0x06
+    ('decl_type', 'B'),                 # 0x07
+    ('unk1', 'I'),                      # 0x08
+    ('unk2', 'I'),                      # 0x0C
+))
@@ -0,0 +1,372 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# RSC5 resource container shared by every RAGE IV loader (.wdr, .wdd, .wtd, ...)
+#
+# Layout on disk:
+#   0x00  char[3]  Magic         'RSC'
+#   0x03  u8       File Type     0x05 for IV (RSC5)
+#   0x04  u32      Version       110 for drawables
+#   0x08  u32      Flags         packed system (physical) + graphics (virtual) sizes
+#   0x0C  ...      Payload       zlib stream (best compression), or raw on some dumps
+#
+# Once inflated, the payload is the system segment immediately followed by the
+# graphics segment. 0x5XXXXXXX pointers address the former, 0x6XXXXXXX the latter,
+# with the low 28 bits holding the offset into that segment.
+
+import os
+import mmap
+import zlib
+import struct
+
+from . import zran
+
+RSC_MAGIC = b'RSC'
+RSC_HEADER = struct.Struct('<3sBII')    # Magic, file type, version, flags
+RSC_HEADER_SIZE = RSC_HEADER.size       # 12 bytes
+
+POINTER_SYSTEM = 0x5        # Top nibble of pointers into the system (physical) segment
+POINTER_GRAPHICS = 0x6      # Top nibble of pointers into the graphics (virtual) segment
+POINTER_OFFSET_MASK = 0x0FFFFFFF
+
+SYSTEM_READ_SIZE = 1 << 16      # Compressed bytes read per step by RSCResource.open_system
+
+
+#######################################################
+class RSCPointerError(ValueError):
+    pass
+
+
+#######################################################
+def get_system_mem_size(flags):     # Thanks to Utopiadeferred for memory size functions
+    return (flags & 0x7FF) << (((flags >> 11) & 0xF) + 8)
+#######################################################
+def get_graphics_mem_size(flags):
+    return ((flags >> 15) & 0x7FF) << (((flags >> 26) & 0xF) + 8)
+#######################################################
+def encode_mem_size(size):
+    # Inverse of the getters above: smallest (count, shift) with count <= 0x7FF covering size
+    for shift in range(16):
+        page_size = 0x100 << shift
+        count = -(-size // page_size)
+        if count <= 0x7FF:
+            return count, shift, count * page_size
+    raise ValueError(f"Segment of {size} bytes is too large for an RSC5 header.")
+#######################################################
+def get_rsc_flags(system_size, graphics_size):
+    # Returns (flags, padded system size, padded graphics size)
+    system_count, system_shift, system_padded = encode_mem_size(system_size)
+    graphics_count, graphics_shift, graphics_padded = encode_mem_size(graphics_size)
+    flags = system_count | (system_shift << 11) | (graphics_count << 15) | (graphics_shift << 26)
+    return flags, system_padded, graphics_padded
+#######################################################
+def read_rsc_header(data):
+    if len(data) < RSC_HEADER_SIZE:
+        raise ValueError(f"Not a valid RSC header: expected {RSC_HEADER_SIZE} bytes, got {len(data)}.")
+
+    magic, file_type, version, flags = RSC_HEADER.unpack_from(data, 0)
+    if magic != RSC_MAGIC:
+        raise ValueError("Not a valid RSC header.")
+
+    return {
+        'magic': magic,
+        'file_type': file_type,
+        'version': version,
+        'flags': flags,
+        'system_mem': get_system_mem_size(flags),
+        'graphics_mem': get_graphics_mem_size(flags),
+    }
+
+
+#######################################################
+class ResourceStream:
+    # Minimal file-like cursor over a memoryview. read() hands back slices of the
+    # underlying buffer instead of copies, so the rage_iv_helpers readers and
+    # struct.unpack work on it exactly as they did on io.BytesIO.
+
+    def __init__(self, view, position=0):
+        self.view = view if isinstance(view, memoryview) else memoryview(view)
+        self.position = position
+
+    def read(self, size=-1):
+        start = self.position
+        end = len(self.view) if size is None or size < 0 else min(start + size, len(self.view))
+        self.position = max(end, start)
+        return self.view[start:end]
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self.position + offset
+        elif whence == os.SEEK_END:
+            position = len(self.view) + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+
+        self.position = position
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+#######################################################
+class RSCResource:
+    # One decoded RSC5 resource: header fields decoded once, payload inflated once,
+    # and the system/graphics segments exposed as zero-copy memoryviews.
+    #
+    # Opened with a zran.ZlibIndex, the payload is instead inflated on demand:
+    # data starts out as an untouched buffer and resolve() inflates the checkpoint
+    # segments under each block the first time it is addressed.
+
+    def __init__(self, buffer, name="", mapped_file=None, compressed=None, index=None, build_index=False):
+        # compressed=None detects a zlib payload; False serves an already inflated payload as-is.
+        # index: ZlibIndex of the payload, inflate lazily; build_index: inflate in full, recording one in self.index
+        self.name = name
+        self._mapped_file = mapped_file
+        self._payload = None
+        self._inflated = None
+        self.index = None
+
+        raw = memoryview(buffer)
+        payload = None
+        try:
+            header = read_rsc_header(raw)
+
+            self.magic = header['magic']
+            self.file_type = header['file_type']
+            self.version = header['version']
+            self.flags = header['flags']
+            self.system_size = header['system_mem']
+            self.graphics_size = header['graphics_mem']
+            self.total_size = self.system_size + self.graphics_size
+
+            payload = raw[RSC_HEADER_SIZE:]
+            self.compressed = False
+            if index is not None:
+                # Lazy: the payload (and its mapping) stays around to inflate segments from
+                self.compressed = True
+                self.index = index
+                self._payload = payload
+                self._inflated = mmap.mmap(-1, max(index.total_out, 1))    # Anonymous: pages are only committed once inflated into
+                self._filled = bytearray(len(index.checkpoints))
+                inflated = None
+            elif build_index and compressed is not False and zran.available():
+                try:
+                    inflated = bytearray(self.total_size)
+                    self.index = zran.ZlibIndex.build(payload, inflated)
+                    inflated = memoryview(inflated)[:self.index.total_out]
+                    self.compressed = True
+                except zran.ZlibIndexError:
+                    self.index = None
+            if compressed is not False and not self.compressed:
+                try:
+                    # bufsize pre-sizes the output to the size the flags promise,
+                    # avoiding repeated reallocation while inflating big dictionaries
+                    inflated = zlib.decompress(payload, zlib.MAX_WBITS, max(self.total_size, zlib.DEF_BUF_SIZE))
+                    self.compressed = True
+                except zlib.error:
+                    inflated = None
+        except BaseException:
+            # Views of buffer outlive a failed constructor in the traceback; release them so the
+            # caller can still close its mapping, and the real error is the one that surfaces
+            if payload is not None:
+                payload.release()
+            raw.release()
+            raise
+
+        if self._payload is not None:
+            raw.release()
+            self.data = memoryview(self._inflated)[:index.total_out]
+        elif self.compressed:
+            # The compressed bytes are no longer needed - drop the mapping right away
+            payload.release()
+            raw.release()
+            self._close_mapping()
+            self.data = memoryview(inflated)
+        else:
+            raw.release()
+            self.data = payload     # Uncompressed payload is served straight out of the mapping
+
+        self.system = self.data[:self.system_size]
+        self.graphics = self.data[self.system_size:self.total_size]
+        self._blocks = {}       # (pointer, size) -> memoryview, shared blocks are sliced once
+        self.decoded = {}       # Content hash -> decoded arrays, shared by byte-identical buffers
+
+    @classmethod
+    def open(cls, filepath, lazy=False):
+        # lazy: inflate only the blocks that are read, through a .zidx checkpoint sidecar.
+        # The first lazy open inflates in full and writes the sidecar; without a system
+        # zlib (see zran.available) lazy opens behave like eager ones.
+        index = zran.ZlibIndex.load(filepath) if lazy and zran.available() else None
+
+        with open(filepath, 'rb') as f:
+            mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            resource = cls(mapped_file, os.path.basename(filepath), mapped_file, index=index, build_index=lazy and index is None)
+        except Exception:
+            mapped_file.close()
+            raise
+
+        if lazy and index is None and resource.index is not None:
+            try:
+                resource.index.save(filepath)
+            except OSError:
+                pass    # Read-only folder: this open still worked, the next one inflates in full again
+        return resource
+
+    @classmethod
+    def open_system(cls, filepath):
+        # Only the system segment: every block structure, but none of the vertex/index data in the
+        # graphics segment. The payload holds the system segment first, so inflating stops as soon
+        # as it is complete. Graphics (0x6) pointers do not resolve on the result.
+        with open(filepath, 'rb') as f:
+            raw = f.read(RSC_HEADER_SIZE)
+            system_size = read_rsc_header(raw)['system_mem']
+
+            inflater = zlib.decompressobj()
+            system = bytearray()
+            compressed = True
+            try:
+                while len(system) < system_size and not inflater.eof:
+                    chunk = inflater.unconsumed_tail or f.read(SYSTEM_READ_SIZE)
+                    if not chunk:
+                        break
+                    system += inflater.decompress(chunk, system_size - len(system))
+            except zlib.error:
+                # Raw dump: the system segment is simply the next system_size bytes
+                f.seek(RSC_HEADER_SIZE)
+                system = f.read(system_size)
+                compressed = False
+
+        resource = cls(bytes(raw) + bytes(system), os.path.basename(filepath), compressed=False)
+        resource.compressed = compressed
+        return resource
+
+    @classmethod
+    def from_buffer(cls, buffer, name="", compressed=None):
+        return cls(buffer, name, compressed=compressed)
+
+    def stream(self, position=0):
+        return ResourceStream(self.data, position)
+
+    def resolve(self, pointer, size=0):
+        # Maps a raw 0x5/0x6 pointer to (segment view, offset into that segment),
+        # rejecting null, foreign-nibble and out-of-bounds pointers
+        nibble = pointer >> 28
+        offset = pointer & POINTER_OFFSET_MASK
+
+        if nibble == POINTER_SYSTEM:
+            segment = self.system
+        elif nibble == POINTER_GRAPHICS:
+            segment = self.graphics
+        elif pointer == 0:
+            raise RSCPointerError(f"Null pointer in {self.name or 'resource'}.")
+        else:
+            raise RSCPointerError(f"Pointer 0x{pointer:08X} in {self.name or 'resource'} is not a system (0x5) or graphics (0x6) pointer.")
+
+        if offset + size > len(segment):
+            raise RSCPointerError(
+                f"Pointer 0x{pointer:08X} (+{size} bytes) is outside its {len(segment)} byte segment in {self.name or 'resource'}."
+            )
+
+        if self._payload is not None:
+            self.ensure(offset if segment is self.system else self.system_size + offset, size)
+        return segment, offset
+
+    def resolve_offset(self, pointer, size=0):
+        # Same as resolve(), but as an offset into self.data so a stream can seek to it
+        segment, offset = self.resolve(pointer, size)
+        if segment is self.graphics:
+            return self.system_size + offset
+        return offset
+
+    def ensure(self, offset, size):
+        # Inflates data[offset:offset + size] on lazy resources; a no-op once filled or when eager
+        if self._payload is None:
+            return
+        index = self.index
+        pending = [point for point in index.segments(offset, max(size, 1)) if not self._filled[point]]
+        while pending:
+            # Consecutive unfilled segments inflate in one pass from the first one's checkpoint
+            first = last = pending.pop(0)
+            while pending and pending[0] == last + 1:
+                last = pending.pop(0)
+            index.inflate_segments(self._payload, self._inflated, first, last)
+            self._filled[first:last + 1] = b'\x01' * (last + 1 - first)
+
+    def inflate_all(self):
+        if self._payload is not None:
+            self.ensure(0, len(self.data))
+
+    @property
+    def inflated_bytes(self):
+        # Bytes actually inflated so far
+        if self._payload is None:
+            return len(self.data) if self.compressed else 0
+        return sum(self.index.segment_end(point) - self.index.offsets[point] for point, filled in enumerate(self._filled) if filled)
+
+    def block(self, pointer, size):
+        key = (pointer, size)
+        view = self._blocks.get(key)
+        if view is None:
+            segment, offset = self.resolve(pointer, size)
+            view = segment[offset:offset + size]
+            self._blocks[key] = view
+        return view
+
+    def close(self):
+        for view in self._blocks.values():
+            view.release()
+        self._blocks.clear()
+        self.decoded.clear()
+
+        for view in (self.system, self.graphics, self.data):
+            view.release()
+        if self._payload is not None:
+            self._payload.release()
+            self._payload = None
+            self._inflated.close()
+        self._close_mapping()
+
+    def _close_mapping(self):
+        if self._mapped_file is None:
+            return
+        try:
+            self._mapped_file.close()
+        except BufferError:
+            # A caller still holds a view into the mapping; it is unmapped once that view is collected
+            pass
+        self._mapped_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
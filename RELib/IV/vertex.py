@@ -0,0 +1,190 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Vectorized vertex buffer decoding for RAGE IV drawables
+#
+# Every vertex layout is a NumPy structured dtype matching the byte order of the
+# rage_iv_helpers.read_strideNN readers, so a whole buffer is decoded with one
+# np.frombuffer over the graphics segment view and then split into contiguous
+# per-attribute arrays.
+#
+# Layouts are built from the vertex declaration's usage flags: each set bit adds
+# its element, in bit order. Built decoders are memoized per
+# (usage flags, stride, type), so every geometry sharing a declaration reuses one.
+
+import numpy as np
+
+# Vertex elements, in the order they appear inside a vertex
+POSITION      = ('position', '<f4', (3,))       # x, y, z
+BLEND_WEIGHTS = ('blend_weights', 'u1', (4,))   # bw1 - bw4
+BLEND_INDICES = ('blend_indices', 'u1', (4,))   # bi1 - bi4
+NORMAL        = ('normal', '<f4', (3,))         # nx, ny, nz
+COLOR         = ('color', 'u1', (4,))           # r, g, b, a
+SPECULAR      = ('specular', 'u1', (4,))        # r2, g2, b2, a2
+UV0           = ('uv0', '<f4', (2,))            # u, v
+UV1           = ('uv1', '<f4', (2,))            # u2, v2
+TANGENT       = ('tangent', '<f4', (4,))        # tx, ty, tz, tw
+BINORMAL      = ('binormal', '<f4', (4,))       # bx, by, bz, bw
+
+# Vertex declaration usage flags, one bit per element in vertex order
+USAGE_POSITION      = 1 << 0
+USAGE_BLEND_WEIGHTS = 1 << 1
+USAGE_BLEND_INDICES = 1 << 2
+USAGE_NORMAL        = 1 << 3
+USAGE_COLOR         = 1 << 4
+USAGE_SPECULAR      = 1 << 5
+USAGE_TEXCOORD0     = 1 << 6      # Texcoords 0 - 7 occupy bits 6 - 13
+USAGE_TANGENT       = 1 << 14
+USAGE_BINORMAL      = 1 << 15
+
+USAGE_ELEMENTS = (
+    (USAGE_POSITION, POSITION),
+    (USAGE_BLEND_WEIGHTS, BLEND_WEIGHTS),
+    (USAGE_BLEND_INDICES, BLEND_INDICES),
+    (USAGE_NORMAL, NORMAL),
+    (USAGE_COLOR, COLOR),
+    (USAGE_SPECULAR, SPECULAR),
+    *((USAGE_TEXCOORD0 << channel, (f'uv{channel}', '<f4', (2,))) for channel in range(8)),
+    (USAGE_TANGENT, TANGENT),
+    (USAGE_BINORMAL, BINORMAL),
+)
+
+#######################################################     # Thanks to Utopiadeferred for stride layouts
+STRIDE_DTYPES = {
+    28: np.dtype([POSITION, COLOR, SPECULAR, UV0]),
+    36: np.dtype([POSITION, NORMAL, COLOR, UV0]),
+    44: np.dtype([POSITION, BLEND_WEIGHTS, BLEND_INDICES, NORMAL, COLOR, UV0]),
+    52: np.dtype([POSITION, NORMAL, COLOR, UV0, TANGENT]),
+    60: np.dtype([POSITION, BLEND_WEIGHTS, BLEND_INDICES, NORMAL, COLOR, UV0, TANGENT]),
+    68: np.dtype([POSITION, BLEND_WEIGHTS, BLEND_INDICES, NORMAL, COLOR, UV0, UV1, TANGENT]),
+}
+
+
+#######################################################
+class VertexData:
+    # Contiguous per-attribute arrays for one vertex buffer; attributes the
+    # layout does not carry are None
+    __slots__ = (
+        'count',
+        'positions',
+        'normals',
+        'colors',
+        'specular',
+        'uvs',
+        'blend_weights',
+        'blend_indices',
+        'tangents',
+        'binormals',
+    )
+
+    def __init__(self, count, positions, normals=None, colors=None, specular=None, uvs=(), blend_weights=None, blend_indices=None, tangents=None, binormals=None):
+        self.count = count
+        self.positions = positions          # (count, 3) float32
+        self.normals = normals              # (count, 3) float32
+        self.colors = colors                # (count, 4) uint8
+        self.specular = specular            # (count, 4) uint8
+        self.uvs = list(uvs)                # [(count, 2) float32, ...] per UV channel
+        self.blend_weights = blend_weights  # (count, 4) uint8
+        self.blend_indices = blend_indices  # (count, 4) uint8
+        self.tangents = tangents            # (count, 4) float32
+        self.binormals = binormals          # (count, 4) float32
+
+
+#######################################################
+class VertexDecoder:
+    __slots__ = ('usage_flags', 'stride', 'decl_type', 'dtype')
+
+    def __init__(self, usage_flags, stride, decl_type, vertex_dtype):
+        self.usage_flags = usage_flags
+        self.stride = stride
+        self.decl_type = decl_type
+        self.dtype = vertex_dtype
+
+    def decode(self, buffer, count):
+        return decode_vertex_buffer(buffer, count, self.dtype)
+
+
+_decoder_cache = {}     # (usage_flags, stride, decl_type) -> VertexDecoder
+
+
+#######################################################
+def build_vertex_dtype(usage_flags, stride):
+    elements = [element for usage_bit, element in USAGE_ELEMENTS if usage_flags & usage_bit]
+    if not elements or elements[0] is not POSITION:
+        raise ValueError(f"Vertex declaration 0x{usage_flags:08X} has no position element.")
+
+    vertex_dtype = np.dtype(elements)
+
+    if vertex_dtype.itemsize > stride:
+        # Flags describe more than the stride holds - only trust a known stride layout
+        fallback_dtype = STRIDE_DTYPES.get(stride)
+        if fallback_dtype is None:
+            raise ValueError(
+                f"Vertex declaration 0x{usage_flags:08X} describes {vertex_dtype.itemsize} bytes per vertex, but the stride is {stride}."
+            )
+        return fallback_dtype
+
+    if vertex_dtype.itemsize < stride:
+        # Keep the described elements at their offsets and step over the trailing bytes
+        vertex_dtype = np.dtype({
+            'names': vertex_dtype.names,
+            'formats': [vertex_dtype.fields[name][0] for name in vertex_dtype.names],
+            'offsets': [vertex_dtype.fields[name][1] for name in vertex_dtype.names],
+            'itemsize': stride,
+        })
+
+    return vertex_dtype
+#######################################################
+def get_vertex_decoder(usage_flags, stride, decl_type):
+    key = (usage_flags, stride, decl_type)
+    decoder = _decoder_cache.get(key)
+    if decoder is None:
+        decoder = VertexDecoder(usage_flags, stride, decl_type, build_vertex_dtype(usage_flags, stride))
+        _decoder_cache[key] = decoder
+    return decoder
+#######################################################
+def decode_vertex_buffer(buffer, count, vertex_dtype):
+    if vertex_dtype.itemsize * count > len(buffer):
+        raise ValueError(f"Vertex buffer holds {len(buffer)} bytes, {count} vertices of stride {vertex_dtype.itemsize} need {vertex_dtype.itemsize * count}.")
+
+    vertices = np.frombuffer(buffer, dtype=vertex_dtype, count=count)
+    names = vertex_dtype.names
+
+    def field(name):
+        # Fields are strided inside the record array; copy each out once into its own contiguous block
+        return np.ascontiguousarray(vertices[name]) if name in names else None
+
+    uvs = [field(name) for name in names if name.startswith('uv')]
+
+    return VertexData(
+        count,
+        field('position'),
+        normals=field('normal'),
+        colors=field('color'),
+        specular=field('specular'),
+        uvs=uvs,
+        blend_weights=field('blend_weights'),
+        blend_indices=field('blend_indices'),
+        tangents=field('tangent'),
+        binormals=field('binormal'),
+    )
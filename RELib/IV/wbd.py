@@ -23,7 +23,6 @@
 
 import io
 import os
-import bpy
 import struct
 
 def read_u32(f): return struct.unpack('<I', f.read(4))[0]
@@ -42,38 +41,43 @@ class WBDImporter:
 
     def load(self):
         with open(self.filepath, 'rb') as f:
-            vtable = read_u32(f)
-            blockmap_offset = read_u32(f)
-            unknown_1 = read_u32(f)
-            unknown_2 = read_u32(f)
+            self.read_header(f)
 
-            hash_coll_offset = f.tell()
-            hash_data_offset = read_offset(f)
-            hash_count = read_u16(f)
-            _ = read_u16(f)
+            for i, offset in enumerate(self.bounds_offsets):
+                f.seek(offset)
+                self.read_bounds(f, i)
+
+    def read_header(self, f, verbose=True):
+        # Hash and bounds tables only; f may be any file-like object over the system segment
+        vtable = read_u32(f)
+        blockmap_offset = read_u32(f)
+        unknown_1 = read_u32(f)
+        unknown_2 = read_u32(f)
 
-            bound_coll_offset = f.tell()
-            bound_ptr_offset = read_offset(f)
-            bound_count = read_u16(f)
-            _ = read_u16(f)
+        hash_coll_offset = f.tell()
+        hash_data_offset = read_offset(f)
+        hash_count = read_u16(f)
+        _ = read_u16(f)
 
+        bound_coll_offset = f.tell()
+        bound_ptr_offset = read_offset(f)
+        bound_count = read_u16(f)
+        _ = read_u16(f)
+
+        if verbose:
             print(f"📦 WBD File: {self.filepath}")
             print(f"  Hash Count:  {hash_count}")
             print(f"  Bounds Count: {bound_count}")
             print(f"  Hash Data Offset:  0x{hash_data_offset:X}")
             print(f"  Bounds Ptr Offset: 0x{bound_ptr_offset:X}")
 
-            # Read model hashes
-            f.seek(hash_data_offset)
-            self.hashes = [read_u32(f) for _ in range(hash_count)]
-
-            # Read pointers to bounds data
-            f.seek(bound_ptr_offset)
-            self.bounds_offsets = [read_offset(f) for _ in range(bound_count)]
+        # Read model hashes
+        f.seek(hash_data_offset)
+        self.hashes = [read_u32(f) for _ in range(hash_count)]
 
-            for i, offset in enumerate(self.bounds_offsets):
-                f.seek(offset)
-                self.read_bounds(f, i)
+        # Read pointers to bounds data
+        f.seek(bound_ptr_offset)
+        self.bounds_offsets = [read_offset(f) for _ in range(bound_count)]
 
     def read_bounds(self, f, idx):
         print(f"\n📍 Bounds Entry {idx} at 0x{f.tell():08X}")
@@ -23,6 +23,5 @@
 
 import io
 import os
-import bpy
 import zlib 
 import struct 
\ No newline at end of file
@@ -21,10 +21,24 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import bpy
+import os
 import struct
+import multiprocessing
 
-from ...REutils import rage_iv_helpers as rh
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+from .rsc import RSC_HEADER, RSC_HEADER_SIZE, RSCResource
+from .wdr import LOD_HIGH, read_drawable, count_resource_bytes
+from ...REutils.diagnostics import DEBUG, diagnostics as diag
+from ...REutils.import_stats import NULL_STATS, ImportStats
+from ...REutils.name_hash import NameTable, parse_hash_key
+
+WDD_HEADER_SIZE = 0x30          # Bytes read_wdd_header consumes: nine 4-byte fields and 12 bytes of padding
+PARALLEL_MIN_BYTES = 256 << 20  # Inflated bytes of the selected entries below which worker processes cost more than they save:
+                                # starting the spawn pool costs ~0.7 s and sending drawables back ~5 ms/MiB,
+                                # against ~100-125 MiB/s for parsing in this process
 
 #######################################################
 
@@ -48,29 +62,218 @@ def read_wdd_header(s):
 
     header['unknown']            = struct.unpack('<I', s.read(4))[0]
 
-    padding = s.read(12)
+    padding = bytes(s.read(12))
     header['padding'] = padding
     header['valid_padding'] = all(b == 0xCD for b in padding)
 
-    print("== WDD Header ==")
-    print(f"VTable:            0x{header['vtable']:08X}")
-    print(f"BlockMapAddress:   0x{header['block_map_address']:08X}")
-    print(f"ParentDictionary:  0x{header['parent_dictionary']:08X}")
-    print(f"UsageCount:        {header['usage_count']}")
-    print(f"Hashes Offset:     0x{header['hashes_offset']:08X}")
-    print(f"Hashes Count:      {header['hashes_count']} (Stride: {header['hashes_stride']})")
-    print(f"WDRs Offset:       0x{header['wdrs_offset']:08X}")
-    print(f"WDRs Count:        {header['wdrs_count']} (Flags: {header['wdrs_flags']})")
-    print(f"Unknown:           0x{header['unknown']:08X}")
-    print(f"Padding:           {padding.hex().upper()}")
-    print(f"Padding OK:        {header['valid_padding']}")
+    if diag.enabled(DEBUG):
+        print("== WDD Header ==")
+        print(f"VTable:            0x{header['vtable']:08X}")
+        print(f"BlockMapAddress:   0x{header['block_map_address']:08X}")
+        print(f"ParentDictionary:  0x{header['parent_dictionary']:08X}")
+        print(f"UsageCount:        {header['usage_count']}")
+        print(f"Hashes Offset:     0x{header['hashes_offset']:08X}")
+        print(f"Hashes Count:      {header['hashes_count']} (Stride: {header['hashes_stride']})")
+        print(f"WDRs Offset:       0x{header['wdrs_offset']:08X}")
+        print(f"WDRs Count:        {header['wdrs_count']} (Flags: {header['wdrs_flags']})")
+        print(f"Unknown:           0x{header['unknown']:08X}")
+        print(f"Padding:           {padding.hex().upper()}")
+        print(f"Padding OK:        {header['valid_padding']}")
 
     return header
 
 def read_wdd_hashes(s, offset, count, stride):
-    s.seek(offset)
-    return [struct.unpack('<II', s.read(8)) for _ in range(count)]  # hash + rel_ptr
+    # atArray<u32> of entry name hashes, parallel to the drawable pointers. The u16 read
+    # as the stride is the array capacity; the elements are always plain u32 hashes.
+    s.seek(offset + 4 * count)
+    return list(struct.unpack_from(f'<{count}I', s.view, offset))
 
 def read_wdd_wdr_offsets(s, offset, count):
-    s.seek(offset)
-    return [struct.unpack('<I', s.read(4))[0] for _ in range(count)]
+    # One unpack straight out of the shared view; entries are then addressed by offset, never sliced out
+    s.seek(offset + 4 * count)
+    return list(struct.unpack_from(f'<{count}I', s.view, offset))
+
+#######################################################
+class DrawableDictionary:
+    __slots__ = ('name', 'header', 'hashes', 'wdr_offsets', 'hash_index', 'entry_names', 'drawables', 'errors', 'unmatched')
+
+    def __init__(self, name, header, hashes, wdr_offsets):
+        self.name = name
+        self.header = header                # read_wdd_header dict
+        self.hashes = hashes                # u32 joaat name hash per entry
+        self.wdr_offsets = wdr_offsets      # Raw 0x5 pointers, one per entry
+        self.hash_index = {entry_hash: idx for idx, entry_hash in enumerate(hashes)}
+        self.entry_names = []               # Resolved name per entry, <dictionary>_wdr_<idx> when unknown
+        self.drawables = []                 # Drawable per entry, None where the entry was not selected or failed to parse
+        self.errors = {}                    # Entry index -> error message
+        self.unmatched = []                 # Selectors that matched no entry
+
+    def index_of(self, key):
+        # Entry index for a hash, a '0x' hash string or a name; None when absent
+        return self.hash_index.get(parse_hash_key(key))
+
+    def select(self, keys):
+        indices = []
+        for key in keys:
+            idx = self.index_of(key)
+            if idx is None or idx >= len(self.wdr_offsets):
+                self.unmatched.append(key)
+            elif idx not in indices:
+                indices.append(idx)
+        return sorted(indices)
+
+    def name_entries(self, base_name, names=()):
+        # Names whose hash appears in the table label their entries; names is a NameTable or a plain name list
+        table = names if isinstance(names, NameTable) else NameTable.from_names(names)
+        resolved = table.lookup_many(self.hashes[:len(self.wdr_offsets)])
+        self.entry_names = [
+            resolved[idx] if idx < len(resolved) and resolved[idx] else f"{base_name}_wdr_{idx}"
+            for idx in range(len(self.wdr_offsets))
+        ]
+
+#######################################################
+def read_wdd(filepath, stats=NULL_STATS, lod=LOD_HIGH, jobs=1, select=None, names=(), lazy=False, progress=None):
+    # lazy: inflate only the selected entries' blocks through a .zidx checkpoint sidecar (see RSCResource.open)
+    diag.reset()
+    name = os.path.basename(filepath)
+    with stats.stage('inflate'):
+        resource = RSCResource.open(filepath, lazy)
+    with resource:
+        try:
+            return read_drawable_dictionary(resource, name, stats, lod, jobs, select, names, progress)
+        finally:
+            count_resource_bytes(filepath, resource, stats)     # After parsing, lazy resources inflate as they go
+            diag.flush_offset_map(name)
+
+def read_drawable_dictionary(resource, name="", stats=NULL_STATS, lod=LOD_HIGH, jobs=1, select=None, names=(), progress=None):
+    # jobs: worker processes for the entries; 1 parses in this process, 0 or None uses every core
+    # select: hashes, '0x' hash strings or names of the entries to parse; None parses every entry
+    # names: NameTable or candidate asset names, used to name the entries whose hash they match
+    # progress: called as progress(entries done, entries selected); an exception it raises stops the read
+    diag.info(
+        "📦 WDD RSC HEADER: FileType: 0x{:02X}, Version: {}, Flags: 0x{:08X}, SystemMem: {}, GraphicsMem: {}, TotalMem: {} {}",
+        resource.file_type, resource.version, resource.flags, resource.system_size, resource.graphics_size, resource.total_size,
+        "🟢 Decompression successful." if resource.compressed else "⚪ File was not compressed - raw data used."
+    )
+
+    with stats.stage('structures'):
+        resource.ensure(0, WDD_HEADER_SIZE)
+        s = resource.stream()
+        header = read_wdd_header(s)
+
+    diag.info(
+        "📦 WDD File: {}  Hashes: {}, Pointers: {}, Hash Offset: 0x{:X}, Pointer Offset: 0x{:X}",
+        name, header['hashes_count'], header['wdrs_count'], header['hashes_offset'], header['wdrs_offset']
+    )
+
+    with stats.stage('structures'):
+        hash_offset = resource.resolve_offset(header['hashes_offset'], 4 * header['hashes_count'])
+        ptr_offset  = resource.resolve_offset(header['wdrs_offset'], 4 * header['wdrs_count'])
+
+        dictionary = DrawableDictionary(
+            name,
+            header,
+            read_wdd_hashes(s, hash_offset, header['hashes_count'], header['hashes_stride']),
+            read_wdd_wdr_offsets(s, ptr_offset, header['wdrs_count'])
+        )
+
+    dictionary.name_entries(os.path.splitext(name)[0], names)
+
+    # Unselected entries are never resolved, so one prop out of a big dictionary costs one entry's parse
+    selected = dictionary.select(select) if select is not None else range(len(dictionary.wdr_offsets))
+    entries = [(idx, dictionary.wdr_offsets[idx], dictionary.entry_names[idx]) for idx in selected]
+    if dictionary.unmatched:
+        diag.info("⚠️ No entry in {} matches: {}", name, ', '.join(str(key) for key in dictionary.unmatched))
+
+    results = None
+    # Entry sizes are unknown until parsed, so the selected share of the inflated resource stands in for the work
+    workers = min(jobs or os.cpu_count() or 1, len(entries))
+    work = resource.total_size * len(entries) // max(len(dictionary.wdr_offsets), 1)
+    if workers > 1 and work >= PARALLEL_MIN_BYTES:
+        try:
+            results = read_dictionary_entries_parallel(resource, entries, lod, workers, stats, progress)
+        except (BrokenProcessPool, OSError) as e:
+            # E.g. a host that cannot start worker interpreters; the serial path gives the same result
+            diag.error("⚠️ Parallel parsing unavailable ({}), reading entries in this process.", e)
+    if results is None:
+        results = read_dictionary_entries(resource, entries, lod, stats, progress)
+
+    # Both paths report progress themselves, as entries are parsed
+    dictionary.drawables = [None] * len(dictionary.wdr_offsets)
+    for idx, drawable, error in results:
+        dictionary.drawables[idx] = drawable
+        if error is not None:
+            dictionary.errors[idx] = error
+
+    return dictionary
+
+def read_dictionary_entry(resource, idx, raw_offset, entry_name, stats=NULL_STATS, lod=LOD_HIGH):
+    # One broken entry should not cost the rest of the dictionary; returns (idx, drawable or None, error or None)
+    try:
+        adjusted_offset = resource.resolve_offset(raw_offset)
+        diag.info("\n🧩 WDR {} at 0x{:X} (adjusted: 0x{:X})", idx, raw_offset, adjusted_offset)
+        drawable = read_drawable(resource, adjusted_offset, entry_name, stats, lod)
+        stats.count('drawables')
+        return idx, drawable, None
+    except Exception as e:
+        diag.post_mortem(f"FATAL ERROR while reading WDR {idx} at 0x{raw_offset:08X}: {e}")
+        return idx, None, str(e)
+
+def read_dictionary_entries(resource, entries, lod=LOD_HIGH, stats=NULL_STATS, progress=None):
+    # Serial counterpart of read_dictionary_entries_parallel, parsing each entry as it is consumed
+    for done, (idx, raw_offset, entry_name) in enumerate(entries, 1):
+        result = read_dictionary_entry(resource, idx, raw_offset, entry_name, stats, lod)
+        if progress is not None:
+            progress(done, len(entries))
+        yield result
+
+#######################################################
+def read_dictionary_entries_parallel(resource, entries, lod=LOD_HIGH, workers=2, stats=NULL_STATS, progress=None):
+    # The inflated dictionary is copied once into shared memory, laid out as an uncompressed RSC5
+    # file. Workers map that block without copying it, parse their entries and send back only the
+    # decoded drawables; results come back in entry order. Nothing here touches bpy, so Blender
+    # objects are still created on the main thread by the caller.
+    resource.inflate_all()
+    memory = shared_memory.SharedMemory(create=True, size=RSC_HEADER_SIZE + len(resource.data))
+    try:
+        memory.buf[:RSC_HEADER_SIZE] = RSC_HEADER.pack(resource.magic, resource.file_type, resource.version, resource.flags)
+        memory.buf[RSC_HEADER_SIZE:RSC_HEADER_SIZE + len(resource.data)] = resource.data
+
+        # spawn: forking a running Blender is not safe, and workers only need the bpy-free parsers
+        with stats.stage('parallel_parse'), ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_entry_worker,
+            initargs=(memory.name, resource.name),
+        ) as executor:
+            chunksize = max(1, len(entries) // (workers * 4))
+            results = []
+            try:
+                for idx, drawable, error, stages, counters in executor.map(_read_entry_in_worker, entries, [lod] * len(entries), chunksize=chunksize):
+                    stats.merge(stages, counters)
+                    results.append((idx, drawable, error))
+                    if progress is not None:
+                        progress(len(results), len(entries))
+            except BaseException:
+                # E.g. a cancelled import: drop the queued entries instead of waiting for them
+                executor.shutdown(cancel_futures=True)
+                raise
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return results
+
+_worker_memory = None
+_worker_resource = None
+
+def _init_entry_worker(memory_name, name):
+    global _worker_memory, _worker_resource
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_resource = RSCResource.from_buffer(_worker_memory.buf, name, compressed=False)
+
+def _read_entry_in_worker(entry, lod):
+    idx, raw_offset, entry_name = entry
+    stats = ImportStats()
+    idx, drawable, error = read_dictionary_entry(_worker_resource, idx, raw_offset, entry_name, stats, lod)
+    return idx, drawable, error, stats.stages, stats.counters
@@ -21,790 +21,285 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import io
+# RAGE IV drawable (.wdr, and the gtaDrawables embedded in .wdd) parser
+#
+# Plain Python + NumPy: no bpy. read_drawable() walks header -> model collection
+# -> model -> geometries and returns Drawable/DrawableModel/DrawableGeometry
+# objects holding decoded vertex and triangle arrays. The Blender operators in
+# REops turn those into meshes.
+
 import os
-import bpy
-import zlib
 import struct
+import hashlib
+import numpy as np
+
+from .rsc import RSCResource, read_rsc_header
+from .vertex import get_vertex_decoder
+from .indices import decode_index_buffer, INDEX_SIZE_16
+from .layouts import (
+    WDR_HEADER,
+    MODEL_COLLECTION,
+    MODEL,
+    GEOMETRY,
+    VERTEX_BUFFER,
+    INDEX_BUFFER,
+    VERTEX_DECLARATION,
+    read_pointer_array
+)
+from ...REutils.diagnostics import diagnostics as diag
+from ...REutils.import_stats import NULL_STATS
+
+# Model collections a drawable header points at, most detailed first; names match openFormat LODs
+LOD_NAMES = ("high", "med", "low", "vlow")
+LOD_POINTER_FIELDS = ('model_collection_ptr', 'lod1_ptr', 'lod2_ptr', 'lod3_ptr')
+
+CONTENT_HASH_SIZE = 16     # blake2b digest bytes; hex digests are stored on shared meshes
+PARSER_VERSION = 1         # Bump whenever decoded output changes; cached imports of older parsers are ignored
+
+# Which model collections to parse
+LOD_HIGH = 'HIGH'       # Highest detail only
+LOD_LOW = 'LOW'         # Lowest detail present, the high collection when there are no others
+LOD_ALL = 'ALL'         # Every collection present
+
 
-from io import BytesIO
-from bpy.types import Operator
-from bpy.props import StringProperty
-from bpy_extras.io_utils import ImportHelper
+#######################################################
+class DrawableGeometry:
+    __slots__ = ('index', 'record', 'vertex_buffer', 'index_buffer', 'declaration', 'vertex_data', 'triangles', 'index_size', 'content_hash')
+
+    def __init__(self, index, record, vertex_buffer, index_buffer, declaration, vertex_data, triangles, index_size, content_hash=""):
+        self.index = index
+        self.record = record                # GEOMETRY record
+        self.vertex_buffer = vertex_buffer  # VERTEX_BUFFER record
+        self.index_buffer = index_buffer    # INDEX_BUFFER record
+        self.declaration = declaration      # VERTEX_DECLARATION record
+        self.vertex_data = vertex_data      # VertexData
+        self.triangles = triangles          # (N, 3) index array
+        self.index_size = index_size        # Bytes per index, always 2 on IV
+        self.content_hash = content_hash    # Hex digest of layout + raw vertex/index bytes, equal for identical geometry
 
-from ...REutils import rage_iv_helpers as rh
 
 #######################################################
-class IMPORT_OT_wdr_reader(Operator, ImportHelper):
-    bl_idname = "import_scene.wdr_reader"
-    bl_label = "Import RAGE IV Drawable (.wdr)"
-    bl_options = {'REGISTER', 'UNDO'}
-    filename_ext = ".wdr"
-    #######################################################
-    filter_glob: StringProperty(default="*.wdr", options={'HIDDEN'})
-
-    def execute(self, context):
-    
-        try:
-            filename = os.path.basename(self.filepath)
-            print(f"\n ...BEGIN READING FOR {filename}...\n")
-
-            with open(self.filepath, "rb") as f:
-                # Read RSC Header
-                magic_dword = f.read(3)  # 'RSC'
-                file_type = f.read(1)  # e.g., 05 for IV
-                version = struct.unpack('<I', f.read(4))[0] # Version 110 for IV
-                flags = struct.unpack('<I', f.read(4))[0] # Physical + graphics size
-
-                #######################################################
-                def get_memory_sizes(filename, flags):  # Thanks to Utopiadeferred for memory size functions
-                    total_mem_size = get_total_mem_size(flags)
-                    system_mem_size = get_system_mem_size(flags)
-                    graphics_mem_size = get_graphics_mem_size(flags)
-
-                    print(f"Total Memory Size: {total_mem_size} bytes, System Memory Size: {system_mem_size} bytes, Graphics Memory Size: {graphics_mem_size} bytes.")
-                #######################################################
-                def get_total_mem_size(flags: int) -> int:
-                    return get_system_mem_size(flags) + get_graphics_mem_size(flags)
-                #######################################################
-                def get_system_mem_size(flags: int) -> int:
-                    return (flags & 0x7FF) << (((flags >> 11) & 0xF) + 8)   # Bitmasking to get size
-                #######################################################
-                def get_graphics_mem_size(flags: int) -> int:
-                    return ((flags >> 15) & 0x7FF) << (((flags >> 26) & 0xF) + 8)
-                #######################################################
-                def get_graphics_mem_size(flags: int) -> int:
-                    return ((flags >> 15) & 0x7FF) << (((flags >> 26) & 0xF) + 8)
-                #######################################################
-                system_mem = get_system_mem_size(flags)
-                graphics_mem = get_graphics_mem_size(flags)
-                total_mem_size = system_mem + graphics_mem
-
-                get_memory_sizes(filename, flags)
-                
-                print("--------------------------------------------------")
-                print("\n ... READING RESOURCE(RSC) HEADER ...")
-                print("--------------------------------------------------")
-                print(f"  Magic DWORD:         {magic_dword.decode(errors='ignore')}")  # RSC
-                print(f"  File Type:     {file_type.hex()}")                            # IV = RSC5
-                print(f"  Version:       {version}")                                    # IV = 110                      
-                print(f"  Flags:         {hex(flags)}")
-                print(f"  System Mem:    {system_mem} bytes")                           # Physical size
-                print(f"  Graphics Mem:  {graphics_mem} bytes")                         # Data size
-                print(f"  Total Mem:     {total_mem_size} bytes (for pointer fixup)")
-                
-                
-                # Read CPU data
-                cpu_data = f.read()
-
-                # Decompress CPU data
-                try:
-                    print("\n!!  Attempting decompression...")
-                    cpu_data = zlib.decompress(cpu_data)        # IV models = best Zlib compression
-                    print("🟢 Decompression successful.")
-                except zlib.error:
-                    print("⚪ File was not compressed - raw data used.")                # If not Zlib compressed
-
-                s = io.BytesIO(cpu_data)    
-
-
-                print("--------------------------------------------------")
-                print("\n ... READING WDR HEADER...")
-                print("--------------------------------------------------")
-                vtable = rh.read_u32(s)
-                header_length = rh.read_u8(s)
-                s.read(3)
-                shadergroup_offset = rh.read_data_offset(s)
-                skeleton_offset = rh.read_data_offset(s)
-                cx, cy, cz, cw = rh.read_f32(s), rh.read_f32(s), rh.read_f32(s), rh.read_f32(s)
-                minx, miny, minz, minw = rh.read_f32(s), rh.read_f32(s), rh.read_f32(s), rh.read_f32(s)
-                maxx, maxy, maxz, maxw = rh.read_f32(s), rh.read_f32(s), rh.read_f32(s), rh.read_f32(s)
-
-                s.seek(0x43)
-                model_ptr = rh.read_u8(s)
-                s.seek(0x47)
-                lod1 = rh.read_u8(s)
-                s.seek(0x4B)
-                lod2 = rh.read_u8(s)
-                s.seek(0x4F)
-                lod3 = rh.read_u8(s)
-
-                s.seek(0x50)
-                maxvx, maxvy, maxvz, maxvw = rh.read_f32(s), rh.read_f32(s), rh.read_f32(s), rh.read_f32(s)
-
-                s.seek(0x60)
-                obj_count = rh.read_u32(s)
-                
-                object_vertices = [[] for _ in range(obj_count)]
-                object_indices = [[] for _ in range(obj_count)]
-                geometry_counts = []
-                geometries_read = 0
-                current_object = 0
-                
-                unk64, unk68, unk6c = rh.read_u32(s), rh.read_u32(s), rh.read_u32(s)
-                unk70 = rh.read_f32(s)
-                unk74, unk78, unk7c = rh.read_u32(s), rh.read_u32(s), rh.read_u32(s)
-
-                fx_offset = rh.read_data_offset(s)
-                fx_count = rh.read_u16(s)
-                fx_size = rh.read_u16(s)
-                raw88 = s.read(8)
-                end_header = rh.read_u32(s)
-
-                print("\n🔥 WDR HEADER:")
-                print(f"  VTable:        0x{vtable:08X}")
-                print(f"  ShaderGroup:   0x{shadergroup_offset:08X}")
-                print(f"  SkeletonData:  0x{skeleton_offset:08X}")
-                print(f"  Center:        ({cx}, {cy}, {cz}, {cw})")
-                print(f"  Min:           ({minx}, {miny}, {minz}, {minw})")
-                print(f"  Max:           ({maxx}, {maxy}, {maxz}, {maxw})")
-                print(f"  ModelPtrs:     MC=0x{model_ptr:X}, LOD1=0x{lod1:X}, LOD2=0x{lod2:X}, LOD3=0x{lod3:X}")
-                print(f"  Max Vector:    ({maxvx}, {maxvy}, {maxvz}, {maxvw})")
-                print(f"  ObjCount:      {obj_count}")
-                print(f"  Unknowns:      {hex(unk64)}, {hex(unk68)}, {hex(unk6c)}, {unk70}")
-                print(f"                {hex(unk74)}, {hex(unk78)}, {hex(unk7c)}")
-                print(f"  2DFX Offset:   0x{fx_offset:08X}, Count: {fx_count}, Size: {fx_size}")
-                print(f"  Reserved:      {' '.join(f'{b:02X}' for b in raw88)}")
-                print(f"  End Header:    0x{end_header:08X}")
-
-                print("--------------------------------------------------")
-                print("\n ... READING MODELCOLLECTION...")
-                print("--------------------------------------------------")
-                s.seek(0x40)
-                model_collection_offset = rh.read_data_offset(s)
-                s.seek(model_collection_offset)
-                model_pointer_offset_ptr = rh.read_data_offset(s)
-                num_ptrs_1 = rh.read_u16(s)
-                num_ptrs_2 = rh.read_u16(s)
-                padding_1 = rh.read_u32(s)
-                padding_2 = rh.read_u32(s)
-
-                print("\n📦 Model Collection:")
-                print(f"  Collection Offset:    0x{model_collection_offset:08X}")
-                print(f"  Model Pointer Offset: 0x{model_pointer_offset_ptr:08X}")
-                print(f"  Pointer Counts:       {num_ptrs_1}, {num_ptrs_2}")
-                print(f"  Padding:              0x{padding_1:08X}, 0x{padding_2:08X}")
-
-                s.seek(model_pointer_offset_ptr)
-                model_offset = rh.read_data_offset(s)
-
-                print("--------------------------------------------------")
-                print("\n ... READING MODEL SECTION...")
-                print("--------------------------------------------------")
-                s.seek(model_offset)
-                model_vtable = rh.read_u32(s)
-                geometry_collection_offset = rh.read_data_offset(s)
-                number_of_geo_ptrs = rh.read_u16(s)
-                number_of_geometries = rh.read_u16(s)
-                vector_array_offset = rh.read_data_offset(s)
-                material_array_offset = rh.read_data_offset(s)
-                unk1 = rh.read_u16(s)
-                unk2 = rh.read_u16(s)
-                unk3 = rh.read_u16(s)
-                geometry_count = rh.read_u16(s)
-                model_padding = rh.read_u32(s)
-
-                print("\n🔷 Model Block:")
-                print(f"  VTable:             0x{model_vtable:08X}")
-                print(f"  Geometry Ptr:       0x{geometry_collection_offset:08X}")
-                print(f"  Number of Geometry Ptrs:       {number_of_geo_ptrs}")
-                print(f"  Number of Geometries:          {number_of_geometries}")
-                print(f"  Vector4 Array Ptr:  0x{vector_array_offset:08X}")
-                print(f"  Material Array Ptr: 0x{material_array_offset:08X}")
-                print(f"  Unknowns:           {unk1}, {unk2}, {unk3}")
-                print(f"  Geometry Count:     {geometry_count}")
-                print(f"  Padding:            0x{model_padding:08X}")
-
-                print("--------------------------------------------------")
-                print("\n ... READING GEOMETRY...")
-                print("--------------------------------------------------")
-                print("\n📏 Geometries:")
-                s.seek(geometry_collection_offset)
-                geometry_offsets = [rh.read_data_offset(s) for _ in range(number_of_geometries)]
-
-                total_vertex_count_so_far = 0
-
-                for i, geom_offset in enumerate(geometry_offsets):
-                    s.seek(geom_offset)
-                    geo_vtable = rh.read_u32(s)
-                    unk1 = rh.read_u32(s)
-                    unk2 = rh.read_u32(s)
-                    vertex_buffer_ptr = rh.read_data_offset(s)
-                    unk3 = rh.read_u32(s)
-                    unk4 = rh.read_u32(s)
-                    unk5 = rh.read_u32(s)
-                    index_buffer_ptr = rh.read_data_offset(s)
-                    unk6 = rh.read_u32(s)
-                    unk7 = rh.read_u32(s)
-                    unk8 = rh.read_u32(s)
-                    index_count = rh.read_u32(s)
-                    face_count = rh.read_u32(s)
-                    vertex_count = rh.read_u16(s)
-                    primitive_type = rh.read_u16(s)
-                    unk9 = rh.read_u32(s)
-                    vertex_stride = rh.read_u16(s)
-                    
-                    vertex_data_length = vertex_count * vertex_stride
-                    print(f"    Vertex Data Length: {vertex_data_length} bytes")
-
-                    unk10 = rh.read_u16(s)
-                    unk11 = rh.read_u32(s)
-                    unk12 = rh.read_u32(s)
-                    unk13 = rh.read_u32(s)
-                    padding = rh.read_u32(s)
-
-                    print(f"\n  Geometry {i} Offset: 0x{geom_offset:08X}")
-                    print(f"    VTable:          0x{geo_vtable:08X}")
-                    print(f"    Vertex Buffer:   0x{vertex_buffer_ptr:08X}")
-                    print(f"    Index Buffer:    0x{index_buffer_ptr:08X}")
-                    print(f"    Index Count:     {index_count}")
-                    print(f"    Face Count:      {face_count}")
-                    print(f"    Vertex Count:    {vertex_count}")
-                    print(f"    Primitive Type:  {primitive_type}")
-                    print(f"    Vertex Stride:   {vertex_stride}")
-                    print(f"    Padding:         0x{padding:08X}")
-
-                    print("--------------------------------------------------")
-                    print("\n ... READING VERTEX BUFFER...")
-                    print("--------------------------------------------------")
-                    s.seek(vertex_buffer_ptr)
-                    vb_vtable = rh.read_u32(s)
-                    vb_vert_count = rh.read_u16(s)
-                    vb_unknown1 = rh.read_u16(s)
-                    vb_data_offset1 = rh.read_data_offset(s)
-                    vb_stride = rh.read_u32(s)
-                    vb_decl_offset = rh.read_data_offset(s)
-                    vb_unknown2 = rh.read_u32(s)
-                    vb_data_offset2 = rh.read_data_offset(s)
-                    vb_unknown3 = rh.read_u32(s)
-
-                    print(f"    🔹 Vertex Buffer:")
-                    print(f"      VTable:        0x{vb_vtable:08X}")
-                    print(f"      Vertex Count:  {vb_vert_count}")
-                    print(f"      Stride:        {vb_stride}")
-                    print(f"      Data Offset 1: 0x{vb_data_offset1:08X}")
-                    print(f"      Decl Offset:   0x{vb_decl_offset:08X}")
-                    print(f"      Data Offset 2: 0x{vb_data_offset2:08X}")
-
-                    print("--------------------------------------------------")
-                    print("\n ... READING INDEX BUFFER...")
-                    print("--------------------------------------------------")
-                    s.seek(index_buffer_ptr)
-                    ib_vtable = rh.read_u32(s)
-                    ib_index_count = rh.read_u32(s)
-                    ib_data_offset = rh.read_data_offset(s)
-                    ib_unknown1 = rh.read_u32(s)
-
-                    print(f"    🔸 Index Buffer:")
-                    print(f"      VTable:        0x{ib_vtable:08X}")
-                    print(f"      Index Count:   {ib_index_count}")
-                    print(f"      Data Offset:   0x{ib_data_offset:08X}")
-                    print(f"      Unknown 1:   0x{ib_unknown1:08X}")
-
-                    print("--------------------------------------------------")
-                    print("\n ... READING VERTEX DECLARATION...")
-                    print("--------------------------------------------------")
-                    s.seek(vb_decl_offset)
-                    usage_flags = rh.read_u32(s)
-                    stride = rh.read_u16(s)
-                    decoder = rh.read_u8(s)
-                    decl_type = rh.read_u8(s)
-                    unk1 = rh.read_u32(s)
-                    unk2 = rh.read_u32(s)
-
-                    print(f"    📄 Vertex Declaration:")
-                    print(f"      Usage Flags:   0x{usage_flags:08X}")
-                    print(f"      Stride:        {stride}")
-                    print(f"      Decoder:       {decoder}")
-                    print(f"      Type:          {decl_type}")
-                    print(f"      Unknown 1:     0x{unk1:08X}")
-                    print(f"      Unknown 2:     0x{unk2:08X}")
-                    
-                    print("--------------------------------------------------")
-                    print("\n ... READING VERTEX DATA...")
-                    print("--------------------------------------------------")
-                    real_vtx_offset = vb_data_offset1
-                    s.seek(real_vtx_offset)
-                    data = memoryview(cpu_data)
-
-                    verts = []
-
-                    stride_map = {
-                        28: rh.read_stride28,
-                        36: rh.read_stride36,
-                        44: rh.read_stride44,
-                        52: rh.read_stride52,
-                        60: rh.read_stride60,
-                        68: rh.read_stride68,
-                    }
-
-                    stride_func = stride_map.get(stride)
-                    if stride_func is None:
-                        raise ValueError(f"Unsupported vertex stride: {stride}")
-
-                    verts = []
-                    vertex_data_start = real_vtx_offset + system_mem
-                    vertex_buffer_slice = cpu_data[vertex_data_start : vertex_data_start + (vb_vert_count * stride)]
-                    vert_stream = BytesIO(vertex_buffer_slice)
-
-                    for v in range(vb_vert_count):
-                        values = stride_func(vert_stream)
-                        x, y, z = values[0], values[1], values[2]
-                        verts.append((x, y, z))
-
-                        print(f"  Vertex {v}: Pos=({x:.5f}, {y:.5f}, {z:.5f}) | Stride {stride} → {len(values)} components")
-                              
-                        
-                    print("--------------------------------------------------")
-                    print("\n ... READING INDEX DATA...")
-                    print("--------------------------------------------------")
-                    s.seek(index_buffer_ptr)
-                    ib_vtable = rh.read_u32(s)               # 0x00
-                    ib_index_count = rh.read_u32(s)          # 0x04   Indices Count
-                    ib_data_offset = rh.read_data_offset(s)  # 0x08 Index Buffer Offset
-                    ib_unknown1 = rh.read_u32(s)             # 0x0C   Unknown
-                    ib_padding = s.read(0x30)             # 0x10 - 0x3F (padding)
-
-                    print(f"    🔸 Full IndexBuffer Read:")
-                    print(f"      VTable:       0x{ib_vtable:08X}")
-                    print(f"      Index Count:  {ib_index_count}")
-                    print(f"      Data Offset:  0x{ib_data_offset:08X}")
-                    print(f"      Unknown 1:    0x{ib_unknown1:08X}")
-                    print(f"      Padding:      {' '.join(f'{b:02X}' for b in ib_padding)}")
-
-                    indices = []
-                    index_data_offset = ib_data_offset + system_mem  # Data offset + physical size, similar to vertex data
-                    print(f"     New Data Offset:  0x{index_data_offset:08X}")
-                    for tri_index in range(ib_index_count // 3):  # Tristrips
-                        base = index_data_offset + (tri_index * 6)
-
-                        offset_i0 = base + 0
-                        offset_i1 = base + 2
-                        offset_i2 = base + 4
-
-
-                        print(f"🔍 Triangle {tri_index}: reading indices from offsets {offset_i0:#X}, {offset_i1:#X}, {offset_i2:#X}")
-
-                        i0 = struct.unpack_from('<H', data, offset_i0)[0]
-                        i1 = struct.unpack_from('<H', data, offset_i1)[0]
-                        i2 = struct.unpack_from('<H', data, offset_i2)[0]
-                        indices.append((i0, i1, i2))
-
-                        print(f"    Indices = ({i0}, {i1}, {i2})")
-
-                        
-                        object_vertices[current_object] = verts
-                        object_indices[current_object] = indices
-
-
-                    print(f"      ✅ Read {len(indices)} triangle faces from index data.")
-                    
-                    for i, verts in enumerate(object_vertices):
-                        if not verts:
-                            continue
-
-                        base_name = os.path.splitext(filename)[0]
-                        mesh = bpy.data.meshes.new(f"{base_name}_Mesh_{i}")
-                        obj = bpy.data.objects.new(f"{base_name}_Object_{i}", mesh)
-
-                        bpy.context.collection.objects.link(obj)
-
-                        tris = indices
-                        mesh.from_pydata(verts, [], tris)
-                        mesh.update()
-
-                        print(f"🚀 Created {base_name}_Object_{i} with {len(verts)} vertices and {len(tris)} triangles.")
-
-            
-            return {'FINISHED'}
-
-                
-        except Exception as e:
-            self.report({'ERROR'}, f"Failed to parse WDR: {e}")
-            return {'CANCELLED'}
+class DrawableModel:
+    __slots__ = ('index', 'record', 'geometries', 'lod')
+
+    def __init__(self, index, record, geometries, lod="high"):
+        self.index = index
+        self.record = record                # MODEL record
+        self.geometries = geometries        # [DrawableGeometry, ...]
+        self.lod = lod                      # One of LOD_NAMES
+
+
 #######################################################
+class Drawable:
+    __slots__ = ('name', 'header', 'models')
 
+    def __init__(self, name, header, models):
+        self.name = name
+        self.header = header                # WDR_HEADER record
+        self.models = models                # [DrawableModel, ...]
 
-def safe_read(label, func, stream):
-    offset = stream.tell()
-    try:
-        value = func(stream)
-        print(f"✅ {label} at 0x{offset:08X} = {value}")
-        return value
-    except Exception as e:
-        print(f"❌ FAILED reading {label} at 0x{offset:08X}: {e}")
-        raise
+    @property
+    def center(self):
+        return (self.header.center_x, self.header.center_y, self.header.center_z)
 
-def read_rsc_header_wdd(data):
-    import struct
-    magic = data[:3]
-    if magic != b'RSC':
-        raise ValueError("Not a valid RSC header.")
-    
-    file_type = data[3]
-    version = struct.unpack_from('<I', data, 4)[0]
-    flags = struct.unpack_from('<I', data, 8)[0]
+    @property
+    def bounds_min(self):
+        return (self.header.min_x, self.header.min_y, self.header.min_z)
+
+    @property
+    def bounds_max(self):
+        return (self.header.max_x, self.header.max_y, self.header.max_z)
 
-    def get_system_mem_size(flags):
-        return (flags & 0x7FF) << (((flags >> 11) & 0xF) + 8)
+    @property
+    def lods(self):
+        # LOD names that were parsed, most detailed first
+        return [lod for lod in LOD_NAMES if any(model.lod == lod for model in self.models)]
 
-    def get_graphics_mem_size(flags):
-        return ((flags >> 15) & 0x7FF) << (((flags >> 26) & 0xF) + 8)
+    def geometries(self, lod=None):
+        for model in self.models:
+            if lod is None or model.lod == lod:
+                yield from model.geometries
 
-    system_mem = get_system_mem_size(flags)
-    graphics_mem = get_graphics_mem_size(flags)
-    total_mem = system_mem + graphics_mem
 
-    print("📦 WDD RSC HEADER:")
-    print(f"  FileType: 0x{file_type:02X}, Version: {version}, Flags: 0x{flags:08X}")
-    print(f"  SystemMem: {system_mem}, GraphicsMem: {graphics_mem}, TotalMem: {total_mem}")
-    
-    return system_mem
+#######################################################
+def read_wdr(filepath, stats=NULL_STATS, lod=LOD_HIGH, progress=None):
+    diag.reset()
+    with stats.stage('inflate'):
+        resource = RSCResource.open(filepath)
+    with resource:
+        count_resource_bytes(filepath, resource, stats)
+        diag.info(
+            "Total Memory Size: {} bytes, System Memory Size: {} bytes, Graphics Memory Size: {} bytes. {}",
+            resource.total_size, resource.system_size, resource.graphics_size,
+            "🟢 Decompression successful." if resource.compressed else "⚪ File was not compressed - raw data used."
+        )
+        try:
+            # Decoded arrays are copies, so the drawable outlives the resource
+            return read_drawable(resource, 0, os.path.basename(filepath), stats, lod, progress)
+        finally:
+            diag.flush_offset_map(os.path.basename(filepath))
+#######################################################
+def count_resource_bytes(filepath, resource, stats):
+    stats.count('bytes_read', os.path.getsize(filepath))
+    if resource.compressed:
+        stats.count('bytes_decompressed', resource.inflated_bytes)
+#######################################################
+def select_lod_pointers(header, lod=LOD_HIGH):
+    # (LOD name, model collection pointer) pairs to follow; absent LODs have null pointers
+    present = [(lod_name, getattr(header, field)) for lod_name, field in zip(LOD_NAMES, LOD_POINTER_FIELDS) if getattr(header, field)]
+    if lod == LOD_ALL:
+        return present
+    if lod == LOD_HIGH:
+        return present[:1]
+    if lod == LOD_LOW:
+        return present[-1:]
+    raise ValueError(f"Unknown LOD selection: {lod}")
+#######################################################
+def read_drawable(resource, header_offset=0, name="", stats=NULL_STATS, lod=LOD_HIGH, progress=None):
+    # Standalone drawables start at the top of the system segment; dictionary entries
+    # sit further in. Pointers inside are absolute either way and resolve against the whole resource.
+    # progress: called as progress(models done, models selected); an exception it raises stops the read
+    diag.info("\n ...BEGIN READING FOR {}...\n", name)
+
+    with stats.stage('structures'):
+        diag.section("READING WDR HEADER FOR {}", name)
+        resource.ensure(header_offset, WDR_HEADER.size)
+        header = WDR_HEADER.unpack_from(resource.data, header_offset)    # One unpack for the whole 0x94 byte header
+        diag.structure(header_offset, WDR_HEADER.size, header, "{} Header", name)
+
+    # Only the chosen collections are followed, so skipped LODs are never decoded
+    collections = []
+    for lod_name, model_collection_ptr in select_lod_pointers(header, lod):
+        with stats.stage('structures'):
+            diag.section("READING MODELCOLLECTION ({})", lod_name.upper())
+            model_collection = MODEL_COLLECTION.read(resource, model_collection_ptr)
+            diag.structure(model_collection_ptr, MODEL_COLLECTION.size, model_collection, "{} Model Collection {}", name, lod_name)
+
+            collections.append((lod_name, read_pointer_array(resource, model_collection.model_array_ptr, model_collection.model_count)))
+
+    model_total = sum(len(model_ptrs) for _, model_ptrs in collections)
+    models = []
+    for lod_name, model_ptrs in collections:
+        for i, model_ptr in enumerate(model_ptrs):
+            models.append(read_model(resource, model_ptr, i, name, stats, lod_name))
+            if progress is not None:
+                progress(len(models), model_total)
+
+    return Drawable(name, header, models)
+#######################################################
+def read_model(resource, model_ptr, model_index, name="", stats=NULL_STATS, lod="high"):
+    with stats.stage('structures'):
+        diag.section("READING MODEL SECTION")
+        model = MODEL.read(resource, model_ptr)
+        diag.structure(model_ptr, MODEL.size, model, "{} {} Model {}", name, lod, model_index)
 
+        diag.section("READING GEOMETRY")
+        geometry_ptrs = read_pointer_array(resource, model.geometry_collection_ptr, model.number_of_geometries)
+    geometries = [read_geometry(resource, geometry_ptr, i, name, stats, model_index, lod) for i, geometry_ptr in enumerate(geometry_ptrs)]
 
+    return DrawableModel(model_index, model, geometries, lod)
+#######################################################
+def read_geometry(resource, geometry_ptr, geometry_index, name="", stats=NULL_STATS, model_index=0, lod="high"):
+    label = (name, lod, model_index, geometry_index)     # Formatted by diag only when shown
+
+    with stats.stage('structures'):
+        geometry = GEOMETRY.read(resource, geometry_ptr)
+        diag.structure(geometry_ptr, GEOMETRY.size, geometry, "{} {} Model {} Geometry {}", *label)
+
+        vertex_buffer = VERTEX_BUFFER.read(resource, geometry.vertex_buffer_ptr)
+        diag.structure(geometry.vertex_buffer_ptr, VERTEX_BUFFER.size, vertex_buffer, "{} {} Model {} Geometry {} Vertex Buffer", *label)
+        vb_vert_count = vertex_buffer.vertex_count
+
+        index_buffer = INDEX_BUFFER.read(resource, geometry.index_buffer_ptr)
+        diag.structure(geometry.index_buffer_ptr, INDEX_BUFFER.size, index_buffer, "{} {} Model {} Geometry {} Index Buffer", *label)
+        ib_index_count = index_buffer.index_count
+
+        declaration = VERTEX_DECLARATION.unpack_from(resource.block(vertex_buffer.decl_ptr, VERTEX_DECLARATION.size))    # Shared by geometries, sliced once
+        diag.structure(vertex_buffer.decl_ptr, VERTEX_DECLARATION.size, declaration, "{} {} Model {} Geometry {} Vertex Declaration", *label)
+        stride = declaration.stride
+
+    index_size = INDEX_SIZE_16     # vertex_count is a u16, so 16-bit indices address every vertex
+    vertex_buffer_slice = resource.block(vertex_buffer.data_ptr1, vb_vert_count * stride)      # 0x6 pointer, graphics segment
+    index_block = resource.block(index_buffer.data_ptr, ib_index_count * index_size)    # 0x6 pointer, graphics segment
+    diag.structure(vertex_buffer.data_ptr1, vb_vert_count * stride, None, "{} {} Model {} Geometry {} Vertex Data", *label)
+    diag.structure(index_buffer.data_ptr, ib_index_count * index_size, None, "{} {} Model {} Geometry {} Index Data", *label)
+
+    with stats.stage('content_hash'):
+        content_hash = hash_geometry_content(declaration, geometry.primitive_type, vertex_buffer_slice, index_block)
+
+    decoded = resource.decoded.get(content_hash)
+    if decoded is not None:
+        # Byte-identical to a geometry already decoded from this resource; share its arrays
+        vertex_data, triangles = decoded
+        stats.count('geometries_deduplicated')
+        diag.debug("  Reusing decoded geometry {}", content_hash)
+    else:
+        with stats.stage('vertex_decode'):
+            vertex_decoder = get_vertex_decoder(declaration.usage_flags, stride, declaration.decl_type)      # Memoized per declaration
+            vertex_data = vertex_decoder.decode(vertex_buffer_slice, vb_vert_count)    # One frombuffer for the whole buffer
+        diag.debug("  Decoded {} vertices | Stride {} → {}", vertex_data.count, stride, ', '.join(vertex_decoder.dtype.names))
+
+        with stats.stage('index_decode'):
+            triangles = decode_index_buffer(index_block, ib_index_count, geometry.primitive_type)    # One frombuffer, strips unrolled
+            if triangles.base is not None:
+                # Triangle lists are still a view into the resource; own them so the resource can close
+                triangles = triangles.copy()
+        diag.debug("  Decoded {} triangles | {}-bit indices", len(triangles), index_size * 8)
+
+        resource.decoded[content_hash] = (vertex_data, triangles)
+
+    stats.count('geometries')
+    stats.count('vertices', vertex_data.count)
+    stats.count('triangles', len(triangles))
+
+    return DrawableGeometry(geometry_index, geometry, vertex_buffer, index_buffer, declaration, vertex_data, triangles, index_size, content_hash)
+#######################################################
+def hash_geometry_content(declaration, primitive_type, vertex_block, index_block):
+    # Everything that decides the decoded result: vertex layout, primitive type and the raw buffers.
+    # The buffers are fed straight from their segment views, no copies.
+    content = hashlib.blake2b(digest_size=CONTENT_HASH_SIZE)
+    content.update(VERTEX_DECLARATION.pack(declaration))
+    content.update(struct.pack('<HII', primitive_type, len(vertex_block), len(index_block)))     # Fixes the buffer boundary
+    content.update(vertex_block)
+    content.update(index_block)
+    return content.hexdigest()
 #######################################################
-def read_wdr_dictionary(self, name, data, adjusted_offset, system_mem):
-    # gtaDrawable Dictionaries skip the ModelCollection selection
-    # As such, for Windows Drawable Dictionaries, the WDR struct varies.
-    
-    try:
-        with open(self.filepath, 'rb') as s:
-        
-            print(f"\n ...BEGIN READING FOR {name}...\n")
-            s = io.BytesIO(data)                            # Slice WDRs within dictionaries into buffers
-            cpu_data = data
-
-            #######################################################
-
-            print("--------------------------------------------------")
-            print(f"\n ... READING EMBEDDED WDR HEADER FOR {name} ...")
-            print("--------------------------------------------------")
-
-            try:
-                vtable = safe_read("VTable", rh.read_u32, s)
-                unknown_1 = safe_read("Unknown_1", rh.read_u32, s)
-                shadergroup_offset = safe_read("ShaderGroup Offset", rh.read_data_offset, s)
-                unknown_2 = safe_read("Unknown_2", rh.read_u32, s)
-
-                cx = safe_read("Center X", rh.read_f32, s)
-                cy = safe_read("Center Y", rh.read_f32, s)
-                cz = safe_read("Center Z", rh.read_f32, s)
-                cw = safe_read("Center W", rh.read_f32, s)
-
-                minx = safe_read("Min X", rh.read_f32, s)
-                miny = safe_read("Min Y", rh.read_f32, s)
-                minz = safe_read("Min Z", rh.read_f32, s)
-                minw = safe_read("Min W", rh.read_f32, s)
-
-                maxx = safe_read("Max X", rh.read_f32, s)
-                maxy = safe_read("Max Y", rh.read_f32, s)
-                maxz = safe_read("Max Z", rh.read_f32, s)
-                maxw = safe_read("Max W", rh.read_f32, s)
-
-                model_pointer_offset_ptr = safe_read("Model Section Offset", rh.read_data_offset, s)
-                unknown_3 = safe_read("Unknown_3", rh.read_u32, s)
-                unknown_4 = safe_read("Unknown_4", rh.read_u32, s)
-                unknown_5 = safe_read("Unknown_5", rh.read_u32, s)
-
-                maxvx = safe_read("MaxVec X", rh.read_f32, s)
-                maxvy = safe_read("MaxVec Y", rh.read_f32, s)
-                maxvz = safe_read("MaxVec Z", rh.read_f32, s)
-                maxvw = safe_read("MaxVec W", rh.read_f32, s)
-
-                obj_count = safe_read("Object Count", rh.read_u32, s)
-                object_vertices = [[] for _ in range(obj_count)]
-                object_indices = [[] for _ in range(obj_count)]
-                current_object = 0
-
-                print("\n🔥 EMBEDDED WDR HEADER SUMMARY:")
-                print(f"  Center:      ({cx}, {cy}, {cz}, {cw})")
-                print(f"  Bounds Min:  ({minx}, {miny}, {minz}, {minw})")
-                print(f"  Bounds Max:  ({maxx}, {maxy}, {maxz}, {maxw})")
-                print(f"  Max Vector:  ({maxvx}, {maxvy}, {maxvz}, {maxvw})")
-
-
-            except Exception as e:
-                print(f"❌ FATAL ERROR while reading header: {e}")
-                return None
-
-            print("--------------------------------------------------")
-            print("\n ... READING MODEL SECTION...")
-            print("--------------------------------------------------")
-            try:
-                last_offset = 0
-
-                def debug_read(label, func):
-                    nonlocal last_offset
-                    print(f"🔍 {label} @ 0x{s.tell():08X}")
-                    last_offset = s.tell()
-                    try:
-                        val = func(s)
-                        print(f"✅ {label} = 0x{val:08X}" if isinstance(val, int) else f"✅ {label} = {val}")
-                        return val
-                    except Exception as e:
-                        print(f"❌ FAILED to read {label} at 0x{s.tell():08X}: {e}")
-                        print(f"🧠 Last successful reaq1q1  d was at 0x{last_offset:08X}")
-                        raise
-                
-                fuckboi = model_pointer_offset_ptr - adjusted_offset        # Buffer slices, so we subtract the adjusted offset
-                s.seek(fuckboi)
-                cumhead = rh.read_data_offset(s)
-                s.seek(cumhead - adjusted_offset)
-                bro = rh.read_data_offset(s)
-                s.seek(bro - adjusted_offset)
-                bruh = rh.read_u32(s)
-
-
-                geometry_collection_offset = rh.read_data_offset(s)
-                number_of_geo_ptrs = rh.read_u16(s)
-                number_of_geometries = rh.read_u16(s)
-                vector_array_offset = rh.read_data_offset(s)
-                material_array_offset = rh.read_data_offset(s)
-                unk1 = rh.read_u16(s)
-                unk2 = rh.read_u16(s)
-                unk3 = rh.read_u16(s)
-                geometry_count = rh.read_u16(s)
-                model_padding = rh.read_u32(s)
-
-                print("\n🔷 Model Block Pt 1:")
-                print(f"  VTable:             0x{fuckboi:08X}")
-                print(f"  VTable:             0x{cumhead:08X}")
-                print(f"  VTable:             0x{bro:08X}")
-                print(f"  Do we got a VTable bruh?:             0x{bruh:08X}")
-
-                print("\n🔷 Model Block Pt 2:")
-                print(f"  Geometry Ptr:       0x{geometry_collection_offset:08X}")
-                print(f"  Number of Geometry Ptrs:       {number_of_geo_ptrs}")
-                print(f"  Number of Geometries:          {number_of_geometries}")
-                print(f"  Vector4 Array Ptr:  0x{vector_array_offset:08X}")
-                print(f"  Material Array Ptr: 0x{material_array_offset:08X}")
-                print(f"  Unknowns:           {unk1}, {unk2}, {unk3}")
-                print(f"  Geometry Count:     {geometry_count}")
-                print(f"  Padding:            0x{model_padding:08X}")
-
-
-            except Exception as e:
-                print(f"❌ FATAL ERROR during model section read: {e}")
-                print(f"🧠 Final stream offset: 0x{s.tell():08X}")
-                print(f"📏 Total data size: {len(cpu_data)} bytes")
-                return None
-
-
-
-            print("\n🔷 Model Block:")
-            print(f"  Geometry Ptr:       0x{geometry_collection_offset:08X}")
-            print(f"  Number of Geometry Ptrs:       {number_of_geo_ptrs}")
-            print(f"  Number of Geometries:          {number_of_geometries}")
-            print(f"  Vector4 Array Ptr:  0x{vector_array_offset:08X}")
-            print(f"  Material Array Ptr: 0x{material_array_offset:08X}")
-            print(f"  Unknowns:           {unk1}, {unk2}, {unk3}")
-            print(f"  Geometry Count:     {geometry_count}")
-            print(f"  Padding:            0x{model_padding:08X}")
-
-            fucker = geometry_collection_offset - adjusted_offset   # Ahhh fug :DDDD
-            s.seek(fucker)
-            faggot = rh.read_data_offset(s)
-            s.seek(faggot - adjusted_offset)
-
-            print("--------------------------------------------------")
-            print("\n ... READING GEOMETRY...")
-            print("--------------------------------------------------")
-            print("\n📏 Geometries:")
- 
-            geo_vtable = rh.read_u32(s)
-            unk1 = rh.read_u32(s)
-            unk2 = rh.read_u32(s)
-            vertex_buffer_ptr = rh.read_data_offset(s)
-            unk3 = rh.read_u32(s)
-            unk4 = rh.read_u32(s)
-            unk5 = rh.read_u32(s)
-            index_buffer_ptr = rh.read_data_offset(s)
-            unk6 = rh.read_u32(s)
-            unk7 = rh.read_u32(s)
-            unk8 = rh.read_u32(s)
-            index_count = rh.read_u32(s)
-            face_count = rh.read_u32(s)
-            vertex_count = rh.read_u16(s)
-            primitive_type = rh.read_u16(s)
-            unk9 = rh.read_u32(s)
-            vertex_stride = rh.read_u16(s)
-                        
-            vertex_data_length = vertex_count * vertex_stride
-            print(f"    Vertex Data Length: {vertex_data_length} bytes")
-
-            unk10 = rh.read_u16(s)
-            unk11 = rh.read_u32(s)
-            unk12 = rh.read_u32(s)
-            unk13 = rh.read_u32(s)
-            padding = rh.read_u32(s)
-
-            print(f"    VTable:          0x{geo_vtable:08X}")
-            print(f"    Vertex Buffer:   0x{vertex_buffer_ptr:08X}")
-            print(f"    Index Buffer:    0x{index_buffer_ptr:08X}")
-            print(f"    Index Count:     {index_count}")
-            print(f"    Face Count:      {face_count}")
-            print(f"    Vertex Count:    {vertex_count}")
-            print(f"    Primitive Type:  {primitive_type}")
-            print(f"    Vertex Stride:   {vertex_stride}")
-            print(f"    Padding:         0x{padding:08X}")
-
-            s.seek(vertex_buffer_ptr - adjusted_offset)
-
-            print("--------------------------------------------------")
-            print("\n ... READING VERTEX BUFFER...")
-            print("--------------------------------------------------")
-            vb_vtable = rh.read_u32(s)
-            vb_vert_count = rh.read_u16(s)
-            vb_unknown1 = rh.read_u16(s)
-            vb_data_offset1 = rh.read_data_offset(s)
-            vb_stride = rh.read_u32(s)
-            vb_decl_offset = rh.read_data_offset(s)
-            vb_unknown2 = rh.read_u32(s)
-            vb_data_offset2 = rh.read_data_offset(s)
-            vb_unknown3 = rh.read_u32(s)
-
-            print(f"    🔹 Vertex Buffer:")
-            print(f"      VTable:        0x{vb_vtable:08X}")
-            print(f"      Vertex Count:  {vb_vert_count}")
-            print(f"      Stride:        {vb_stride}")
-            print(f"      Data Offset 1: 0x{vb_data_offset1:08X}")
-            print(f"      Decl Offset:   0x{vb_decl_offset:08X}")
-            print(f"      Data Offset 2: 0x{vb_data_offset2:08X}")
-
-            s.seek(index_buffer_ptr - adjusted_offset)
-
-            print("--------------------------------------------------")
-            print("\n ... READING INDEX BUFFER...")
-            print("--------------------------------------------------")
-            ib_vtable = rh.read_u32(s)
-            ib_index_count = rh.read_u32(s)
-            ib_data_offset = rh.read_data_offset(s)
-            ib_unknown1 = rh.read_u32(s)
-
-            print(f"    🔸 Index Buffer:")
-            print(f"      VTable:        0x{ib_vtable:08X}")
-            print(f"      Index Count:   {ib_index_count}")
-            print(f"      Data Offset:   0x{ib_data_offset:08X}")
-            print(f"      Unknown 1:   0x{ib_unknown1:08X}")
-
-            s.seek(vb_decl_offset - adjusted_offset)
-
-            print("--------------------------------------------------")
-            print("\n ... READING VERTEX DECLARATION...")
-            print("--------------------------------------------------")
-            usage_flags = rh.read_u32(s)
-            stride = rh.read_u16(s)
-            decoder = rh.read_u8(s)
-            decl_type = rh.read_u8(s)
-            unk1 = rh.read_u32(s)
-            unk2 = rh.read_u32(s)
-
-            print(f"    📄 Vertex Declaration:")
-            print(f"      Usage Flags:   0x{usage_flags:08X}")
-            print(f"      Stride:        {stride}")
-            print(f"      Decoder:       {decoder}")
-            print(f"      Type:          {decl_type}")
-            print(f"      Unknown 1:     0x{unk1:08X}")
-            print(f"      Unknown 2:     0x{unk2:08X}")
-                        
-            print("--------------------------------------------------")
-            print("\n ... READING VERTEX DATA...")
-            print("--------------------------------------------------")
-            real_vtx_offset = vb_data_offset1
-            s.seek(real_vtx_offset - adjusted_offset)
-            data = memoryview(cpu_data)
-
-            verts = []
-                        
-            stride_map = {
-                28: rh.read_stride28,
-                36: rh.read_stride36,
-                44: rh.read_stride44,
-                52: rh.read_stride52,
-                60: rh.read_stride60,
-                68: rh.read_stride68,
-            }
-
-            stride_func = stride_map.get(stride)
-            if stride_func is None:
-                raise ValueError(f"Unsupported vertex stride: {stride}")
-
-            verts = []
-            vertex_data_start = real_vtx_offset - adjusted_offset + system_mem
-            vertex_buffer_slice = cpu_data[vertex_data_start : vertex_data_start + (vb_vert_count * stride)]
-            vert_stream = BytesIO(vertex_buffer_slice)
-
-            for v in range(vb_vert_count):
-                values = stride_func(vert_stream)
-                x, y, z = values[0], values[1], values[2]   # You can extend this unpacking later - though might do myself
-                verts.append((x, y, z))
-
-                # Optional: print debug info for each vertex, I suppose there's no way to enable/disable prints w/ a top comment
-                # Maybe a debug version?
-                print(f"  Vertex {v}: Pos=({x:.5f}, {y:.5f}, {z:.5f}) | Stride {stride} → {len(values)} components")
-                                
-            s.seek(index_buffer_ptr - adjusted_offset)
-
-            print("--------------------------------------------------")
-            print("\n ... READING INDEX DATA...")
-            print("--------------------------------------------------")
-            ib_vtable = rh.read_u32(s)               # 0x00
-            ib_index_count = rh.read_u32(s)          # 0x04   Indices Count
-            ib_data_offset = rh.read_data_offset(s)  # 0x08 Index Buffer Offset
-            ib_unknown1 = rh.read_u32(s)             # 0x0C   Unknown
-            ib_padding = s.read(0x30)             # 0x10 - 0x3F (padding)
-
-            print(f"    🔸 Full IndexBuffer Read:")
-            print(f"      VTable:       0x{ib_vtable:08X}")
-            print(f"      Index Count:  {ib_index_count}")
-            print(f"      Data Offset:  0x{ib_data_offset:08X}")
-            print(f"      Unknown 1:    0x{ib_unknown1:08X}")
-            print(f"      Padding:      {' '.join(f'{b:02X}' for b in ib_padding)}")
-
-            indices = []
-            index_data_offset = ib_data_offset - adjusted_offset + system_mem       # Still adding physical size
-            print(f"     New Data Offset:  0x{index_data_offset:08X}")
-            for tri_index in range(ib_index_count // 3):  # Tristrips
-                base = index_data_offset + (tri_index * 6)
-
-                offset_i0 = base + 0
-                offset_i1 = base + 2
-                offset_i2 = base + 4
-
-
-                print(f"🔍 Triangle {tri_index}: reading indices from offsets {offset_i0:#X}, {offset_i1:#X}, {offset_i2:#X}")
-
-                i0 = struct.unpack_from('<H', data, offset_i0)[0]
-                i1 = struct.unpack_from('<H', data, offset_i1)[0]
-                i2 = struct.unpack_from('<H', data, offset_i2)[0]
-                indices.append((i0, i1, i2))
-
-                print(f"    Indices = ({i0}, {i1}, {i2})")
-
-                            
-                object_vertices[current_object] = verts
-                object_indices[current_object] = indices
-
-
-            print(f"      ✅ Read {len(indices)} triangle faces from index data.")
-                        
-            for i, verts in enumerate(object_vertices):
-                if not verts:
-                    continue
-
-                base_name = os.path.splitext(name)[0]
-                mesh = bpy.data.meshes.new(f"{base_name}_Mesh_{i}")
-                obj = bpy.data.objects.new(f"{base_name}_Object_{i}", mesh)
-
-                bpy.context.collection.objects.link(obj)
-
-                tris = indices
-                mesh.from_pydata(verts, [], tris)
-                mesh.update()
-
-                print(f"🚀 Created {base_name}_Object_{i} with {len(verts)} vertices and {len(tris)} triangles.")
-            #######################################################                
-    except Exception as e:
-        print(f"❌ Failed to parse WDR: {e}")
-        return {'CANCELLED'}
-    #######################################################
+def merge_geometries(geometries):
+    # One vertex/triangle set for several geometries: every array is allocated once at its final
+    # size and filled slice by slice, each geometry's indices shifted past the vertices before it.
+    # Normals and the first UV channel are only merged when every geometry carries them.
+    geometries = [geometry for geometry in geometries if len(geometry.triangles)]
+    vertex_total = sum(geometry.vertex_data.count for geometry in geometries)
+    triangle_total = sum(len(geometry.triangles) for geometry in geometries)
+
+    positions = np.empty((vertex_total, 3), dtype=np.float32)
+    triangles = np.empty((triangle_total, 3), dtype=np.int64)
+    normals = np.empty((vertex_total, 3), dtype=np.float32) if geometries and all(geometry.vertex_data.normals is not None for geometry in geometries) else None
+    uvs = np.empty((vertex_total, 2), dtype=np.float32) if geometries and all(geometry.vertex_data.uvs for geometry in geometries) else None
+
+    vertex_start = 0
+    triangle_start = 0
+    for geometry in geometries:
+        vertex_data = geometry.vertex_data
+        vertex_end = vertex_start + vertex_data.count
+        triangle_end = triangle_start + len(geometry.triangles)
+
+        positions[vertex_start:vertex_end] = vertex_data.positions
+        np.add(geometry.triangles, vertex_start, out=triangles[triangle_start:triangle_end], casting='unsafe')
+        if normals is not None:
+            normals[vertex_start:vertex_end] = vertex_data.normals
+        if uvs is not None:
+            uvs[vertex_start:vertex_end] = vertex_data.uvs[0]
+
+        vertex_start = vertex_end
+        triangle_start = triangle_end
+
+    return positions, triangles, normals, uvs
+#######################################################
+def read_rsc_header_wdd(data):
+    header = read_rsc_header(data)
+    diag.info(
+        "📦 WDD RSC HEADER: FileType: 0x{:02X}, Version: {}, Flags: 0x{:08X}, SystemMem: {}, GraphicsMem: {}",
+        header['file_type'], header['version'], header['flags'], header['system_mem'], header['graphics_mem']
+    )
+    return header['system_mem']
@@ -23,7 +23,6 @@
 
 import io
 import os
-import bpy
 import zlib 
 import struct 
 
@@ -0,0 +1,327 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Random access into zlib streams (after Mark Adler's zran.c)
+#
+# RSC5 payloads are a single zlib stream, so reaching byte N normally means
+# inflating everything before it. A ZlibIndex records checkpoints while the
+# stream is inflated once: the compressed and uncompressed offsets of a deflate
+# block boundary, the bits of its first byte already consumed, and the 32 KiB of
+# output before it (the window later back-references can reach). Inflating from
+# any checkpoint then needs only the bytes from there on.
+#
+# The index is stored next to the resource as a sidecar:
+#
+#   0x00  char[4]  Magic          'RZIX'
+#   0x04  u32      Version        1
+#   0x08  u64      Source Size    Size of the indexed file
+#   0x10  u64      Source Mtime   st_mtime_ns of the indexed file
+#   0x18  u64      Total Out      Bytes the stream inflates to
+#   0x20  u32      Point Count
+#   0x24  ...      Points         u64 in, u64 out, u8 bits, u32 window size, zlib-compressed window
+#
+# Python's zlib module cannot resume at a bit offset (no inflatePrime), so the
+# system zlib is called through ctypes. Where it cannot be loaded, available()
+# is False and callers inflate the whole stream as before.
+
+import os
+import zlib
+import ctypes
+import ctypes.util
+import struct
+import numpy as np
+
+from bisect import bisect_right
+
+WINDOW_SIZE = 32768                 # Deflate's maximum back-reference distance
+CHECKPOINT_SPAN = 1 << 20           # Uncompressed bytes between checkpoints
+SIDECAR_EXTENSION = ".zidx"
+
+INDEX_MAGIC = b'RZIX'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<4sIQQQI')    # Magic, version, source size, source mtime, total out, point count
+POINT_HEADER = struct.Struct('<QQBI')       # In, out, bits, window size
+
+Z_OK = 0
+Z_STREAM_END = 1
+Z_NEED_DICT = 2
+Z_BUF_ERROR = -5
+Z_NO_FLUSH = 0
+Z_BLOCK = 5
+
+UINT_MAX = 0xFFFFFFFF
+
+
+#######################################################
+class ZlibIndexError(ValueError):
+    pass
+
+
+#######################################################
+class ZStream(ctypes.Structure):
+    # z_stream from zlib.h; uLong is a C long, so its size follows the platform
+    _fields_ = [
+        ('next_in', ctypes.c_void_p),
+        ('avail_in', ctypes.c_uint),
+        ('total_in', ctypes.c_ulong),
+        ('next_out', ctypes.c_void_p),
+        ('avail_out', ctypes.c_uint),
+        ('total_out', ctypes.c_ulong),
+        ('msg', ctypes.c_char_p),
+        ('state', ctypes.c_void_p),
+        ('zalloc', ctypes.c_void_p),
+        ('zfree', ctypes.c_void_p),
+        ('opaque', ctypes.c_void_p),
+        ('data_type', ctypes.c_int),
+        ('adler', ctypes.c_ulong),
+        ('reserved', ctypes.c_ulong),
+    ]
+
+
+_libz = None
+
+#######################################################
+def load_zlib():
+    # System zlib, or None when no shared library can be found (e.g. stock Windows Blender)
+    global _libz
+    if _libz is None:
+        _libz = False
+        for library_name in (ctypes.util.find_library('z'), ctypes.util.find_library('zlib1'), 'libz.so.1', 'libz.dylib', 'zlib1.dll'):
+            if not library_name:
+                continue
+            try:
+                library = ctypes.CDLL(library_name)
+                library.zlibVersion.restype = ctypes.c_char_p
+                library.inflateInit2_.argtypes = (ctypes.POINTER(ZStream), ctypes.c_int, ctypes.c_char_p, ctypes.c_int)
+                library.inflate.argtypes = (ctypes.POINTER(ZStream), ctypes.c_int)
+                library.inflateEnd.argtypes = (ctypes.POINTER(ZStream),)
+                library.inflatePrime.argtypes = (ctypes.POINTER(ZStream), ctypes.c_int, ctypes.c_int)
+                library.inflateSetDictionary.argtypes = (ctypes.POINTER(ZStream), ctypes.c_char_p, ctypes.c_uint)
+            except (OSError, AttributeError):
+                continue
+            _libz = library
+            break
+    return _libz or None
+#######################################################
+def available():
+    return load_zlib() is not None
+#######################################################
+def sidecar_path(filepath):
+    return filepath + SIDECAR_EXTENSION
+
+
+#######################################################
+class Checkpoint:
+    __slots__ = ('compressed_offset', 'offset', 'bits', 'window')
+
+    def __init__(self, compressed_offset, offset, bits, window):
+        self.compressed_offset = compressed_offset  # First whole input byte after the block boundary
+        self.offset = offset                        # Uncompressed offset of the boundary
+        self.bits = bits                            # Bits of the byte before compressed_offset still unread
+        self.window = window                        # Up to WINDOW_SIZE bytes of output before offset
+
+
+#######################################################
+class Inflater:
+    # One inflate pass over a ctypes z_stream; input/output are plain addresses
+    # into buffers the caller keeps alive for the duration.
+
+    def __init__(self, window_bits):
+        self.libz = load_zlib()
+        if self.libz is None:
+            raise ZlibIndexError("No system zlib library is available for random access inflation.")
+        self.stream = ZStream()
+        self.check(self.libz.inflateInit2_(ctypes.byref(self.stream), window_bits, self.libz.zlibVersion(), ctypes.sizeof(ZStream)))
+
+    def check(self, result):
+        if result < 0 and result != Z_BUF_ERROR:
+            message = self.stream.msg.decode('ascii', 'replace') if self.stream.msg else f"error {result}"
+            raise ZlibIndexError(f"Inflate failed: {message}")
+        if result == Z_NEED_DICT:
+            raise ZlibIndexError("Inflate needs a preset dictionary.")
+        return result
+
+    def inflate(self, flush):
+        return self.check(self.libz.inflate(ctypes.byref(self.stream), flush))
+
+    def close(self):
+        self.libz.inflateEnd(ctypes.byref(self.stream))
+
+
+#######################################################
+def buffer_pointer(buffer):
+    # (array keeping the buffer alive, address) for any buffer without copying it, read-only mmaps included
+    array = np.frombuffer(buffer, dtype=np.uint8)
+    return array, array.ctypes.data
+
+
+#######################################################
+class ZlibIndex:
+    def __init__(self, checkpoints, total_out, source_size=0, source_mtime=0):
+        self.checkpoints = checkpoints
+        self.offsets = [checkpoint.offset for checkpoint in checkpoints]
+        self.total_out = total_out
+        self.source_size = source_size
+        self.source_mtime = source_mtime
+
+    #######################################################
+    @classmethod
+    def build(cls, payload, output, span=CHECKPOINT_SPAN):
+        # Inflates the whole zlib stream in payload (any buffer) into output (bytearray sized for it),
+        # checkpointing every span bytes. The stream is inflated exactly once either way, so the
+        # index comes for free with the first full read.
+        if len(payload) > UINT_MAX or len(output) > UINT_MAX:
+            raise ZlibIndexError("Streams over 4 GiB are not indexed.")
+
+        payload_array, payload_address = buffer_pointer(payload)
+        output_array, output_address = buffer_pointer(output)
+
+        inflater = Inflater(zlib.MAX_WBITS)
+        stream = inflater.stream
+        stream.next_in = payload_address
+        stream.avail_in = len(payload)
+        stream.next_out = output_address
+        stream.avail_out = len(output)
+
+        checkpoints = []
+        last = 0
+        try:
+            while True:
+                # Z_BLOCK returns at every block boundary, where data_type reports the bit position
+                result = inflater.inflate(Z_BLOCK)
+                total_in = len(payload) - stream.avail_in
+                total_out = len(output) - stream.avail_out
+                if result == Z_STREAM_END:
+                    break
+                if result == Z_BUF_ERROR:
+                    # Output full: anything past the size the header promises is never addressed
+                    if stream.avail_out == 0:
+                        break
+                    raise ZlibIndexError("Compressed stream is truncated.")
+
+                at_boundary = stream.data_type & 128 and not stream.data_type & 64     # Not after the last block
+                if at_boundary and (total_out == 0 or total_out - last > span):
+                    window = bytes(output[max(0, total_out - WINDOW_SIZE):total_out])
+                    checkpoints.append(Checkpoint(total_in, total_out, stream.data_type & 7, window))
+                    last = total_out
+        finally:
+            inflater.close()
+
+        if not checkpoints or checkpoints[0].offset != 0:
+            raise ZlibIndexError("Stream has no usable block boundaries.")
+        return cls(checkpoints, total_out)
+
+    #######################################################
+    def segment_end(self, point_index):
+        return self.offsets[point_index + 1] if point_index + 1 < len(self.offsets) else self.total_out
+
+    def segments(self, offset, size):
+        # Checkpoint indices whose segments overlap [offset, offset + size)
+        end = min(offset + size, self.total_out)
+        if end <= offset:
+            return range(0)
+        return range(bisect_right(self.offsets, offset) - 1, bisect_right(self.offsets, end - 1))
+
+    def inflate_segments(self, payload, output, first, last):
+        # Fills output[offsets[first]:segment_end(last)] by inflating from checkpoint first.
+        # payload: the compressed stream (buffer), only the bytes those segments need are read.
+        checkpoint = self.checkpoints[first]
+        start = checkpoint.offset
+        stop = self.segment_end(last)
+        input_start = checkpoint.compressed_offset - (1 if checkpoint.bits else 0)
+        input_stop = self.checkpoints[last + 1].compressed_offset + 1 if last + 1 < len(self.checkpoints) else len(payload)
+        input_stop = min(input_stop, len(payload))
+        payload_array, payload_address = buffer_pointer(payload)
+        output_array, output_address = buffer_pointer(output)
+
+        inflater = Inflater(-zlib.MAX_WBITS)     # Raw deflate, resumed mid-stream
+        stream = inflater.stream
+        try:
+            if checkpoint.bits:
+                # The boundary falls inside this byte; its unread high bits go in first
+                inflater.check(inflater.libz.inflatePrime(ctypes.byref(stream), checkpoint.bits, int(payload_array[input_start]) >> (8 - checkpoint.bits)))
+            if checkpoint.window:
+                inflater.check(inflater.libz.inflateSetDictionary(ctypes.byref(stream), checkpoint.window, len(checkpoint.window)))
+
+            stream.next_in = payload_address + checkpoint.compressed_offset
+            stream.avail_in = input_stop - checkpoint.compressed_offset
+            stream.next_out = output_address + start
+            stream.avail_out = stop - start
+            while stream.avail_out:
+                result = inflater.inflate(Z_NO_FLUSH)
+                if result == Z_STREAM_END:
+                    break
+                if result == Z_BUF_ERROR:
+                    raise ZlibIndexError(f"Ran out of input inflating 0x{start:X}-0x{stop:X}.")
+        finally:
+            inflater.close()
+        return stop - start
+
+    #######################################################
+    def to_bytes(self):
+        parts = [INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.source_size, self.source_mtime, self.total_out, len(self.checkpoints))]
+        for checkpoint in self.checkpoints:
+            window = zlib.compress(checkpoint.window, 1)    # Windows are the bulk of the index; they shrink well
+            parts.append(POINT_HEADER.pack(checkpoint.compressed_offset, checkpoint.offset, checkpoint.bits, len(window)))
+            parts.append(window)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, source_size, source_mtime, total_out, count = INDEX_HEADER.unpack_from(data, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ZlibIndexError("Not a zlib index sidecar of this version.")
+
+        checkpoints = []
+        position = INDEX_HEADER.size
+        for _ in range(count):
+            compressed_offset, offset, bits, window_size = POINT_HEADER.unpack_from(data, position)
+            position += POINT_HEADER.size
+            window = zlib.decompress(data[position:position + window_size])
+            position += window_size
+            checkpoints.append(Checkpoint(compressed_offset, offset, bits, window))
+        return cls(checkpoints, total_out, source_size, source_mtime)
+
+    def save(self, filepath):
+        # Sidecar for filepath, stamped with its size and mtime so edits invalidate it
+        info = os.stat(filepath)
+        self.source_size = info.st_size
+        self.source_mtime = info.st_mtime_ns
+        temp_path = sidecar_path(filepath) + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(temp_path, sidecar_path(filepath))
+
+    @classmethod
+    def load(cls, filepath):
+        # Sidecar index for filepath, None when missing, stale or unreadable
+        path = sidecar_path(filepath)
+        try:
+            info = os.stat(filepath)
+            with open(path, 'rb') as f:
+                index = cls.from_bytes(f.read())
+        except (OSError, ValueError, struct.error, zlib.error):
+            return None
+        if (index.source_size, index.source_mtime) != (info.st_size, info.st_mtime_ns):
+            return None
+        return index
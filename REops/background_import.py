@@ -0,0 +1,148 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import time
+import bpy
+
+from bpy.props import BoolProperty
+
+from ..REutils.background_job import BackgroundJob
+from ..REutils.diagnostics import diagnostics as diag
+
+TIMER_INTERVAL = 0.02       # Seconds between modal ticks
+BUILD_SLICE = 0.05          # Seconds of mesh building per tick, so the UI keeps redrawing while objects appear
+PARSE_SHARE = 0.5           # Part of the progress bar that parsing fills, building fills the rest
+
+
+#######################################################
+class BackgroundImportMixin:
+    # Modal import for Operator subclasses. The operator calls self.run_import(context, read) from
+    # execute, where read(job) parses on a worker thread: it must not touch bpy, nor the operator's
+    # properties, so it only sees values execute already copied out. Then, on Blender's thread:
+    #   build_import(context, parsed)  - generator creating the objects, yielding (built, total) per object
+    #   finish_import(context, parsed) - reports the result and returns the operator's return set
+    # Scripted calls, redo and background Blender run the same steps synchronously.
+    import_kind = "file"
+
+    run_in_background: BoolProperty(
+        name="Import in Background",
+        description="Parse on a worker thread and build objects a few at a time, keeping Blender responsive. Esc cancels",
+        default=True
+    )
+
+    def run_import(self, context, read):
+        job = BackgroundJob(read)
+        if self.run_in_background and self.options.is_invoke and not self.options.is_repeat \
+                and context.window is not None and not bpy.app.background:
+            return self.start_import(context, job)
+
+        job.run()
+        if job.error is not None:
+            return self.fail_import(job.error)
+        for _ in self.build_import(context, job.result):
+            pass
+        return self.finish_import(context, job.result)
+
+    def fail_import(self, error):
+        diag.post_mortem(error)
+        self.report({'ERROR'}, f"Failed to parse {self.import_kind}: {error}")
+        return {'CANCELLED'}
+
+    #######################################################
+    def start_import(self, context, job):
+        self._job = job.start()
+        self._steps = None
+        self._built = 0
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(TIMER_INTERVAL, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        self.show_progress(context, "Parsing", 0, 0, 0.0)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            return self.cancel_import(context)
+        if event.type != 'TIMER' or event.timer is not self._timer:
+            return {'PASS_THROUGH'}
+
+        job = self._job
+        if self._steps is None:
+            if job.running:
+                self.show_progress(context, "Parsing", job.done, job.total, 0.0)
+                return {'PASS_THROUGH'}
+            if job.error is not None:
+                self.end_import(context)
+                return self.fail_import(job.error)
+            self._steps = self.build_import(context, job.result)
+
+        # At least one object per tick, then as many as fit in the slice
+        deadline = time.perf_counter() + BUILD_SLICE
+        try:
+            while True:
+                self._built, total = next(self._steps)
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            self.end_import(context)
+            return self.finish_import(context, job.result)
+        except Exception as e:
+            self.end_import(context)
+            diag.post_mortem(e)
+            self.report({'ERROR'}, f"Failed to build {self.import_kind} objects: {e}")
+            return {'CANCELLED'}
+
+        self.show_progress(context, "Building", self._built, total, PARSE_SHARE)
+        return {'PASS_THROUGH'}
+
+    def cancel_import(self, context):
+        self._job.cancel()      # A parse still running stops at its next progress report
+        self.end_import(context)
+        if self._steps is None:
+            self.report({'WARNING'}, "Import cancelled.")
+            return {'CANCELLED'}
+
+        # Objects already built stay, and finishing gives them an undo step of their own
+        self._steps.close()
+        self.report({'WARNING'}, f"Import cancelled, kept the {self._built} object(s) already built.")
+        return {'FINISHED'}
+
+    def cancel(self, context):
+        # Blender ending the modal operator itself, e.g. on loading another file
+        self._job.cancel()
+        self.end_import(context)
+
+    def end_import(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+
+    def show_progress(self, context, stage, done, total, start):
+        share = PARSE_SHARE if start == 0.0 else 1.0 - PARSE_SHARE
+        fraction = start + (share * done / total if total else 0.0)
+        context.window_manager.progress_update(int(100 * fraction))
+        if context.workspace is not None:
+            count = f" {done}/{total}" if total else "..."
+            context.workspace.status_text_set(f"{self.bl_label}: {stage}{count}  (Esc to cancel)")
@@ -0,0 +1,166 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import os
+import bpy
+
+from bpy.types import Operator
+from bpy.props import StringProperty, IntProperty, EnumProperty
+
+from ..REutils.catalogue import CATALOGUE_PATH, scan_catalogue, search_catalogue
+from ..REutils.diagnostics import diagnostics as diag
+from ..REutils.name_hash import load_name_table
+
+KIND_ITEMS = (
+    ('ALL', "All", "Every catalogued resource type"),
+    ('wdr', "Drawables", "Drawables (.wdr)"),
+    ('wdd', "Drawable Dictionaries", "Drawable dictionary entries (.wdd)"),
+    ('wbd', "Bounds Dictionaries", "Bounds dictionary entries (.wbd)"),
+)
+MAX_RESULTS = 40    # Rows the results popup lists
+
+
+#######################################################
+class BLENDR_OT_catalogue_scan(Operator):
+    """Catalogue every RAGE IV resource in a folder from its headers, for searching without importing"""
+    bl_idname = "blendr.catalogue_scan"
+    bl_label = "Scan Asset Catalogue"
+
+    directory: StringProperty(subtype='DIR_PATH')
+    jobs: IntProperty(
+        name="Worker Processes",
+        description="Processes reading headers in parallel. 0 uses every core",
+        default=0,
+        min=0
+    )
+    names_file: StringProperty(
+        name="Name List",
+        description="Text file of asset names or compiled .nametable, used to label entry hashes",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        log = io.StringIO()
+        try:
+            names = load_name_table(bpy.path.abspath(self.names_file)) if self.names_file else None
+            scanned, unchanged, removed = scan_catalogue(self.directory, CATALOGUE_PATH, self.jobs or None, names, log)
+        except Exception as e:
+            diag.post_mortem(e)
+            self.report({'ERROR'}, f"Catalogue scan failed: {e}")
+            return {'CANCELLED'}
+
+        diag.info("{}", log.getvalue().rstrip())
+        self.report({'INFO'}, f"Catalogued {scanned} file(s), {unchanged} unchanged, {removed} removed.")
+        return {'FINISHED'}
+
+
+#######################################################
+class BLENDR_OT_catalogue_search(Operator):
+    """Search the asset catalogue by file name, entry name or hash, and import a match"""
+    bl_idname = "blendr.catalogue_search"
+    bl_label = "Search Asset Catalogue"
+
+    query: StringProperty(
+        name="Search",
+        description="Part of a file or entry name, an entry name, or a 0x-prefixed hash",
+        default=""
+    )
+    kind: EnumProperty(name="Type", items=KIND_ITEMS, default='ALL')
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        if not os.path.isfile(CATALOGUE_PATH):
+            self.report({'WARNING'}, "The asset catalogue is empty; scan a folder first.")
+            return {'CANCELLED'}
+
+        try:
+            rows = search_catalogue(self.query.strip(), CATALOGUE_PATH, None if self.kind == 'ALL' else self.kind, MAX_RESULTS)
+        except Exception as e:
+            diag.post_mortem(e)
+            self.report({'ERROR'}, f"Catalogue search failed: {e}")
+            return {'CANCELLED'}
+
+        if not rows:
+            self.report({'INFO'}, f"Nothing in the catalogue matches '{self.query}'.")
+            return {'CANCELLED'}
+
+        def draw(menu, context):
+            for row in rows:
+                if row['entry_idx'] is None:
+                    text = f"{row['name']}  ({row['geometries'] or 0} geometries, {row['vertices'] or 0} vertices)"
+                    entry = ""
+                else:
+                    entry = f"0x{row['entry_hash']:08X}"
+                    text = f"{row['name']} #{row['entry_idx']}  {row['entry_name'] or entry}"
+                button = menu.layout.operator(BLENDR_OT_catalogue_import.bl_idname, text=text)
+                button.filepath = row['path']
+                button.entry = entry
+
+        context.window_manager.popup_menu(draw, title=f"{len(rows)} match(es) for '{self.query}'", icon='VIEWZOOM')
+        return {'FINISHED'}
+
+
+#######################################################
+class BLENDR_OT_catalogue_import(Operator):
+    """Import a catalogued file, or one entry of a dictionary"""
+    bl_idname = "blendr.catalogue_import"
+    bl_label = "Import Catalogued Asset"
+    bl_options = {'INTERNAL', 'UNDO'}
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    entry: StringProperty(default="")      # 0x hash of a dictionary entry; empty imports the whole file
+
+    def execute(self, context):
+        extension = os.path.splitext(self.filepath)[1].lower()
+        if extension == ".wdr":
+            return bpy.ops.import_scene.wdr_reader(filepath=self.filepath)
+        if extension == ".wdd":
+            return bpy.ops.import_scene.wdd(filepath=self.filepath, entry_filter=self.entry)
+
+        self.report({'WARNING'}, f"BlenDR cannot import {extension} files yet.")
+        return {'CANCELLED'}
+
+
+classes = (
+    BLENDR_OT_catalogue_scan,
+    BLENDR_OT_catalogue_search,
+    BLENDR_OT_catalogue_import,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
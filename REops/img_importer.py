@@ -0,0 +1,193 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import bpy
+
+from bpy.types import Operator
+from bpy_extras.io_utils import ImportHelper
+from bpy.props import StringProperty, BoolProperty, EnumProperty
+
+from ..RELib.IV.img import ImgArchive
+from ..RELib.IV.wdr import LOD_HIGH, read_drawable
+from ..RELib.IV.wdd import read_drawable_dictionary
+from ..REutils.diagnostics import diagnostics as diag
+from ..REutils.import_stats import ImportStats
+from ..REutils.name_hash import split_key_list
+from .wdr_importer import LOD_ITEMS, build_imported_drawable
+from .wdd_importer import WDDImporter
+
+IMPORTABLE_EXTENSIONS = (".wdr", ".wdd")
+
+_entry_items = {}       # Archive path -> enum items; Blender needs the strings kept alive while the popup is open
+
+
+#######################################################
+def import_img_entries(operator, context, filepath, patterns, lod=LOD_HIGH, share_meshes=True):
+    # Imports the drawables of an IMG archive whose names match patterns, straight out of the mapped archive
+    try:
+        archive = ImgArchive(filepath)
+    except (OSError, ValueError) as e:
+        operator.report({'ERROR'}, f"Cannot open {os.path.basename(filepath)}: {e}")
+        return {'CANCELLED'}
+
+    stats = ImportStats(filepath, "IMG")
+    failures = []
+    with archive:
+        entries = [entry for entry in archive.match(patterns) if entry.extension in IMPORTABLE_EXTENSIONS]
+        if not entries:
+            operator.report({'WARNING'}, f"No drawable in {archive.name} matches {', '.join(patterns)}.")
+            return {'CANCELLED'}
+
+        # One table for the whole archive, so props repeated across entries share a mesh; meshes
+        # of earlier imports are never reused, as they may have been edited since
+        shared_meshes = {} if share_meshes else None
+        for entry in entries:
+            try:
+                with stats.stage('inflate'):
+                    resource = archive.resource(entry)
+                stats.count('bytes_read', entry.size)
+                if resource.compressed:
+                    stats.count('bytes_decompressed', resource.inflated_bytes)
+                with resource:
+                    base_name = os.path.splitext(entry.name)[0]
+                    if entry.extension == ".wdr":
+                        drawable = read_drawable(resource, 0, entry.name, stats, lod)
+                        build_imported_drawable(context, drawable, base_name, stats, shared_meshes)
+                    else:
+                        dictionary = read_drawable_dictionary(resource, entry.name, stats, lod)
+                        WDDImporter(entry.name, lod, share_meshes, stats=stats).build(context, dictionary, shared_meshes)
+                        failures += [f"{entry.name} #{idx}: {error}" for idx, error in sorted(dictionary.errors.items())]
+            except Exception as e:
+                diag.post_mortem(e)
+                failures.append(f"{entry.name}: {e}")
+
+    stats.finish()
+    operator.report({'INFO'}, f"{len(entries)} entr{'y' if len(entries) == 1 else 'ies'} from {archive.name}. {stats.summary()}")
+    if failures:
+        operator.report({'WARNING'}, f"{len(failures)} could not be read: {'; '.join(failures[:5])}")
+    return {'FINISHED'}
+#######################################################
+def img_entry_items(self, context):
+    items = _entry_items.get(self.filepath)
+    if items is None:
+        try:
+            with ImgArchive(self.filepath) as archive:
+                items = [
+                    (entry.name, entry.name, f"{entry.size:,} bytes")
+                    for entry in archive.entries if entry.extension in IMPORTABLE_EXTENSIONS
+                ]
+        except (OSError, ValueError):
+            items = []
+        _entry_items[self.filepath] = items
+    return items
+
+
+#######################################################
+class IMPORT_OT_img_archive(Operator, ImportHelper):
+    """Import drawables straight out of a GTA IV IMG archive, without extracting them"""
+    bl_idname = "import_scene.rage_img"
+    bl_label = "Import from RAGE IV Image Archive (.img)"
+    bl_options = {'REGISTER', 'UNDO'}
+    filename_ext = ".img"
+    filter_glob: StringProperty(default="*.img", options={'HIDDEN'})
+    entry_filter: StringProperty(
+        name="Entries",
+        description="Entry names or wildcards separated by commas, e.g. lamppost*.wdr. Empty lists the archive's drawables to pick from",
+        default=""
+    )
+    lod: EnumProperty(
+        name="LOD",
+        description="Model collections to import; skipped LODs are not decoded",
+        items=LOD_ITEMS,
+        default=LOD_HIGH
+    )
+    share_meshes: BoolProperty(
+        name="Share Identical Meshes",
+        description="Link byte-identical geometry within this import to one mesh datablock. Meshes of earlier imports are never reused, as they may have been edited since",
+        default=True
+    )
+
+    def invoke(self, context, event):
+        # Given an archive already (e.g. from a script), go straight to picking from it
+        if self.filepath and not self.entry_filter and os.path.isfile(self.filepath):
+            return self.pick_entry()
+        return ImportHelper.invoke(self, context, event)
+
+    def execute(self, context):
+        patterns = split_key_list(self.entry_filter)
+        if patterns:
+            return import_img_entries(self, context, self.filepath, patterns, self.lod, self.share_meshes)
+
+        if self.options.is_invoke:
+            # Back from the file browser without a filter: the picker's own operator imports
+            return self.pick_entry()
+        self.report({'ERROR'}, "No entries given; set Entries to names or wildcards, e.g. *.wdr")
+        return {'CANCELLED'}
+
+    def pick_entry(self):
+        # Hands over to the search popup; this operator itself imports nothing, so it leaves no undo step
+        _entry_items.pop(self.filepath, None)      # The archive may have changed since it was last listed
+        bpy.ops.blendr.img_entry_search('INVOKE_DEFAULT', filepath=self.filepath, lod=self.lod, share_meshes=self.share_meshes)
+        return {'CANCELLED'}
+
+
+#######################################################
+class BLENDR_OT_img_entry_search(Operator):
+    """Pick one drawable of an IMG archive to import"""
+    bl_idname = "blendr.img_entry_search"
+    bl_label = "Import IMG Entry"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_property = "entry"
+
+    filepath: StringProperty(options={'HIDDEN'})
+    lod: EnumProperty(items=LOD_ITEMS, default=LOD_HIGH, options={'HIDDEN'})
+    share_meshes: BoolProperty(default=True, options={'HIDDEN'})
+    entry: EnumProperty(name="Entry", items=img_entry_items)
+
+    def invoke(self, context, event):
+        context.window_manager.invoke_search_popup(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        return import_img_entries(self, context, self.filepath, [self.entry], self.lod, self.share_meshes)
+
+
+classes = (
+    IMPORT_OT_img_archive,
+    BLENDR_OT_img_entry_search,
+)
+
+
+def menu_func_import(self, context):
+    self.layout.operator(IMPORT_OT_img_archive.bl_idname, text="RAGE IV Image Archive (.img)")
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
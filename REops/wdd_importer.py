@@ -21,81 +21,144 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import io
-import os
 import bpy
-import zlib
 
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
-from bpy.props import StringProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty
 
-from ..RELib.IV.wdd import (
-    read_wdd_header,
-    read_wdd_hashes,
-    read_wdd_wdr_offsets
-)
-
-from ..RELib.IV.wdr import read_wdr_dictionary, read_rsc_header_wdd
+from ..RELib.IV.wdr import LOD_HIGH
+from ..RELib.IV.wdd import read_wdd
+from ..REutils.mesh_builder import count_drawable_objects
+from ..REutils.import_stats import ImportStats
+from ..REutils.resource_cache import CACHE_DIR, CACHE_MAX_BYTES, get_resource_cache
+from ..REutils.name_hash import load_name_table, split_key_list
+from .wdr_importer import LOD_ITEMS, iter_imported_drawable, report_import_stats
+from .background_import import BackgroundImportMixin
 
 
 class WDDImporter:
-    def __init__(self, filepath):
+    def __init__(self, filepath, lod=LOD_HIGH, share_meshes=True, jobs=1, select=None, names=(), cache=None, lazy=False, stats=None):
         self.filepath = filepath
+        self.lod = lod
+        self.share_meshes = share_meshes
+        self.jobs = jobs
+        self.select = select        # Entry hashes/names to import, None for all
+        self.names = names          # Asset names that label matching entries
+        self.cache = cache          # ResourceCache to read through, None parses every time
+        self.lazy = lazy            # Inflate only what the selected entries need, via a .zidx sidecar
+        self.stats = stats if stats is not None else ImportStats(filepath, "WDD")
         self.hashes = []
         self.wdr_offsets = []
-
-    def load(self):
-        with open(self.filepath, 'rb') as s:
-            rsc_header = s.read(12)
-            raw_data = s.read()
-
-            try:
-                cpu_data = zlib.decompress(raw_data)
-                print("🟢 Decompression successful.")
-            except zlib.error:
-                print("⚪ File was not compressed - raw data used.")
-                cpu_data = raw_data
-
-            full_data = rsc_header + cpu_data
-            system_mem = read_rsc_header_wdd(full_data)
-
-            s = io.BytesIO(cpu_data)
-            header = read_wdd_header(s)
-
-            print(f"📦 WDD File: {self.filepath}")
-            print(f"  Hashes: {header['hashes_count']}, Pointers: {header['wdrs_count']}")
-            print(f"  Hash Offset: 0x{header['hashes_offset']:X}")
-            print(f"  Pointer Offset: 0x{header['wdrs_offset']:X}")
-
-            hash_offset = header['hashes_offset'] & 0x0FFFFFFF
-            ptr_offset  = header['wdrs_offset']   & 0x0FFFFFFF
-
-            self.hashes = read_wdd_hashes(s, hash_offset, header['hashes_count'], header['hashes_stride'])
-            self.wdr_offsets = read_wdd_wdr_offsets(s, ptr_offset, header['wdrs_count'])
-
-
-            for idx, raw_offset in enumerate(self.wdr_offsets):
-                adjusted_offset = raw_offset & 0x0FFFFFFF
-                print(f"\n🧩 WDR {idx} at 0x{raw_offset:X} (adjusted: 0x{adjusted_offset:X})")
-
-                wdr_data = cpu_data[adjusted_offset:]
-                wdr_name = f"{os.path.basename(self.filepath)}_wdr_{idx}"
-                read_wdr_dictionary(self, wdr_name, wdr_data, adjusted_offset, system_mem)
-
-                print(f"🔎 Begin reading embedded WDR {idx} at file offset 0x{adjusted_offset:X}")
-
-
-class IMPORT_OT_wdd_importer(Operator, ImportHelper):
+        self.errors = {}
+        self.unmatched = []
+
+    def load(self, context):
+        return self.build(context, self.read())
+
+    def read(self, progress=None):
+        # bpy-free, so it may run on a worker thread; entries may also be parsed in worker processes
+        read = self.cache.read_wdd if self.cache is not None else read_wdd
+        return read(self.filepath, self.stats, self.lod, self.jobs, self.select, self.names, self.lazy, progress)
+
+    def build(self, context, dictionary, shared_meshes=None):
+        # Objects for every parsed entry of an already read DrawableDictionary
+        for _ in self.build_steps(context, dictionary, shared_meshes):
+            pass
+        return dictionary
+
+    def build_steps(self, context, dictionary, shared_meshes=None):
+        # build one object at a time, yielding (objects built, objects to build); Blender's thread only
+        self.hashes = dictionary.hashes
+        self.wdr_offsets = dictionary.wdr_offsets
+        self.errors = dictionary.errors
+        self.unmatched = dictionary.unmatched
+
+        # One table for the whole dictionary, so repeated props across entries share a mesh
+        if shared_meshes is None and self.share_meshes:
+            shared_meshes = {}
+
+        drawables = [drawable for drawable in dictionary.drawables if drawable is not None]
+        total = sum(count_drawable_objects(drawable) for drawable in drawables)
+        built = 0
+        for drawable in drawables:
+            for _ in iter_imported_drawable(context, drawable, drawable.name, self.stats, shared_meshes):
+                built += 1
+                yield built, total
+
+
+class IMPORT_OT_wdd_importer(BackgroundImportMixin, Operator, ImportHelper):
     """Import Windows Drawable Dictionary WDD (.wdd)"""
     bl_idname = "import_scene.wdd"
     bl_label = "Import RAGE IV Drawable Dictionary (.wdd)"
     filename_ext = ".wdd"
+    import_kind = "WDD"
     filter_glob: StringProperty(default="*.wdd", options={'HIDDEN'})
+    lod: EnumProperty(
+        name="LOD",
+        description="Model collections to import; skipped LODs are not decoded",
+        items=LOD_ITEMS,
+        default=LOD_HIGH
+    )
+    jobs: IntProperty(
+        name="Worker Processes",
+        description="Processes parsing dictionary entries in parallel, used only for dictionaries holding hundreds of MiB. 0 uses every core, 1 parses in Blender's own process",
+        default=1,
+        min=0
+    )
+    entry_filter: StringProperty(
+        name="Entries",
+        description="Names or 0x-prefixed hashes of the entries to import, separated by commas. Empty imports every entry",
+        default=""
+    )
+    names_file: StringProperty(
+        name="Name List",
+        description="Text file of asset names, one per line, or a compiled .nametable; entries whose hash matches a name are named after it",
+        default="",
+        subtype='FILE_PATH'
+    )
+    use_inflate_index: BoolProperty(
+        name="Random Access Index",
+        description="Keep a .zidx index of inflate checkpoints next to the dictionary, so later imports of a few entries inflate only those. Built by the first import",
+        default=False
+    )
+    share_meshes: BoolProperty(
+        name="Share Identical Meshes",
+        description="Link byte-identical geometry within this import to one mesh datablock. Meshes of earlier imports are never reused, as they may have been edited since",
+        default=True
+    )
+    use_cache: BoolProperty(
+        name="Use Parse Cache",
+        description=f"Reuse the parsed geometry of files imported before, and keep this one for next time. Stored in {CACHE_DIR}, up to {CACHE_MAX_BYTES >> 30} GiB",
+        default=False
+    )
+    write_stats_json: BoolProperty(
+        name="Write Import Stats",
+        description="Save stage timings and counters as JSON next to the imported file",
+        default=False
+    )
 
     def execute(self, context):
-        importer = WDDImporter(self.filepath)
-        importer.load()
+        try:
+            names = load_name_table(bpy.path.abspath(self.names_file)) if self.names_file else ()
+            select = split_key_list(self.entry_filter) or None
+            cache = get_resource_cache() if self.use_cache else None
+        except Exception as e:
+            return self.fail_import(e)
+
+        self._importer = importer = WDDImporter(self.filepath, self.lod, self.share_meshes, self.jobs, select, names, cache, self.use_inflate_index)
+        return self.run_import(context, lambda job: importer.read(job.report))
+
+    def build_import(self, context, dictionary):
+        return self._importer.build_steps(context, dictionary)
+
+    def finish_import(self, context, dictionary):
+        importer = self._importer
+        if importer.errors:
+            self.report({'WARNING'}, f"{len(importer.errors)} of {len(importer.wdr_offsets)} drawables could not be read.")
+        if importer.unmatched:
+            self.report({'WARNING'}, f"No entry matches: {', '.join(str(key) for key in importer.unmatched)}")
+        report_import_stats(self, importer.stats)
         return {'FINISHED'}
 
 
@@ -21,9 +21,113 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
 import bpy
 
-from ..RELib.IV.wdr import IMPORT_OT_wdr_reader
+from bpy.types import Operator
+from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy_extras.io_utils import ImportHelper
+
+from ..RELib.IV.wdr import LOD_HIGH, LOD_LOW, LOD_ALL, read_wdr
+from ..REutils.mesh_builder import iter_drawable_objects, count_drawable_objects
+from ..REutils.diagnostics import diagnostics as diag
+from ..REutils.import_stats import ImportStats
+from ..REutils.resource_cache import CACHE_DIR, CACHE_MAX_BYTES, get_resource_cache
+from .background_import import BackgroundImportMixin
+
+LOD_ITEMS = (
+    (LOD_HIGH, "High", "Import the highest detail models only"),
+    (LOD_LOW, "Low", "Import the lowest detail models present, or high when the drawable has no LODs"),
+    (LOD_ALL, "All", "Import every LOD present, each object tagged with its LOD"),
+)
+
+
+#######################################################
+class IMPORT_OT_wdr_reader(BackgroundImportMixin, Operator, ImportHelper):
+    bl_idname = "import_scene.wdr_reader"
+    bl_label = "Import RAGE IV Drawable (.wdr)"
+    bl_options = {'REGISTER', 'UNDO'}
+    filename_ext = ".wdr"
+    import_kind = "WDR"
+    #######################################################
+    filter_glob: StringProperty(default="*.wdr", options={'HIDDEN'})
+    lod: EnumProperty(
+        name="LOD",
+        description="Model collections to import; skipped LODs are not decoded",
+        items=LOD_ITEMS,
+        default=LOD_HIGH
+    )
+    share_meshes: BoolProperty(
+        name="Share Identical Meshes",
+        description="Link byte-identical geometry within this import to one mesh datablock. Meshes of earlier imports are never reused, as they may have been edited since",
+        default=True
+    )
+    use_cache: BoolProperty(
+        name="Use Parse Cache",
+        description=f"Reuse the parsed geometry of files imported before, and keep this one for next time. Stored in {CACHE_DIR}, up to {CACHE_MAX_BYTES >> 30} GiB",
+        default=False
+    )
+    write_stats_json: BoolProperty(
+        name="Write Import Stats",
+        description="Save stage timings and counters as JSON next to the imported file",
+        default=False
+    )
+
+    def execute(self, context):
+        self._stats = stats = ImportStats(self.filepath, "WDR")
+        filepath, lod, use_cache = self.filepath, self.lod, self.use_cache
+
+        def read(job):
+            # job.report doubles as the cancel check, between models
+            if use_cache:
+                return get_resource_cache().read_wdr(filepath, stats, lod, job.report)
+            return read_wdr(filepath, stats, lod, job.report)
+
+        return self.run_import(context, read)
+
+    def build_import(self, context, drawable):
+        base_name = os.path.splitext(os.path.basename(self.filepath))[0]
+        shared_meshes = {} if self.share_meshes else None
+        total = count_drawable_objects(drawable)
+        for built, _ in enumerate(iter_imported_drawable(context, drawable, base_name, self._stats, shared_meshes), 1):
+            yield built, total
+
+    def finish_import(self, context, drawable):
+        report_import_stats(self, self._stats)
+        return {'FINISHED'}
+
+
+def build_imported_drawable(context, drawable, base_name, stats, shared_meshes=None):
+    # Objects for one parsed drawable in the active collection, counted into stats
+    return list(iter_imported_drawable(context, drawable, base_name, stats, shared_meshes))
+
+def iter_imported_drawable(context, drawable, base_name, stats, shared_meshes=None):
+    # build_imported_drawable one object at a time; stopping early still counts what was built
+    meshes_before = len(shared_meshes) if shared_meshes is not None else 0
+    objects = iter_drawable_objects(drawable, base_name, context.collection, shared_meshes)
+    built = 0
+    try:
+        while True:
+            with stats.stage('mesh_build'):
+                obj = next(objects, None)
+            if obj is None:
+                break
+            built += 1
+            stats.count('objects_created')
+            diag.info("🚀 Created {} with {} vertices.", obj.name, len(obj.data.vertices))
+            yield obj
+    finally:
+        stats.count('meshes_created', len(shared_meshes) - meshes_before if shared_meshes is not None else built)
+
+
+def report_import_stats(operator, stats):
+    stats.finish()
+    operator.report({'INFO'}, stats.summary())
+    if operator.write_stats_json:
+        try:
+            diag.info("📊 Import stats written to {}", stats.write_json())
+        except OSError as e:
+            operator.report({'WARNING'}, f"Could not write import stats: {e}")
 
 
 def menu_func_import(self, context):
@@ -0,0 +1,82 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+#######################################################
+class BackgroundJob:
+    # Runs target(job) on a worker thread and keeps its result for Blender's thread to pick up.
+    # target must not touch bpy; it calls job.report(done, total) as it goes, which is also
+    # where a cancelled job stops, by raising ImportCancelled.
+    __slots__ = ("target", "thread", "result", "error", "done", "total", "_cancelled")
+
+    def __init__(self, target):
+        self.target = target
+        self.thread = None
+        self.result = None
+        self.error = None
+        self.done = 0
+        self.total = 0
+        self._cancelled = threading.Event()
+
+    def start(self):
+        # Daemon thread, so a job abandoned by a cancelled import never holds Blender open on exit
+        self.thread = threading.Thread(target=self.run, name="BlenDR import", daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        # Also usable in the caller's thread, which is how the synchronous imports run the same code
+        try:
+            self.result = self.target(self)
+        except ImportCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        return self.result
+
+    def report(self, done, total):
+        if self._cancelled.is_set():
+            raise ImportCancelled()
+        self.done = done
+        self.total = total
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 0.0
@@ -0,0 +1,180 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Headless batch converter: RAGE IV drawables (.wdr / .wdd) -> OpenIV openFormats (.odr + .mesh)
+#
+# Runs without Blender. Files are parsed across a process pool, one file per task,
+# and every drawable is written as an .odr plus one <name>_<lod>.mesh per converted LOD
+# (all of them by default, see --lod), each referenced from the .odr in the layout
+# ImportOpenIVFormats reads back. The source tree layout is mirrored under the output directory.
+#
+#   python -m BlenDR.REutils.batch_convert <input dir or file> <output dir> [--jobs N] [--lod HIGH|LOW|ALL] [--report failures.txt]
+
+import os
+import sys
+import time
+import argparse
+import traceback
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ..RELib.IV.wdr import LOD_HIGH, LOD_LOW, LOD_ALL, read_wdr, merge_geometries
+from ..RELib.IV.wdd import read_wdd
+from ..oFLib.mesh_iv import write_mesh_file
+from ..oFLib.odr_iv import write_odr_file
+
+DRAWABLE_EXTENSIONS = (".wdr", ".wdd")
+
+#######################################################
+def find_drawables(source):
+    if os.path.isfile(source):
+        return [os.path.abspath(source)]
+
+    found = []
+    for directory, _, filenames in os.walk(source):
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() in DRAWABLE_EXTENSIONS:
+                found.append(os.path.join(directory, filename))
+    found.sort()
+    return found
+#######################################################
+def convert_drawable(drawable, output_dir, base_name):
+    # One .mesh per parsed LOD holding every geometry of its models, referenced from one .odr
+    lods = {}
+    written = []
+    for lod in drawable.lods:
+        positions, triangles, normals, uvs = merge_geometries(drawable.geometries(lod))
+        if not len(triangles):
+            continue
+
+        mesh_filename = f"{base_name}_{lod}.mesh"
+        write_mesh_file(os.path.join(output_dir, mesh_filename), positions, triangles, normals, uvs)
+        lods[lod] = {"mesh_file": mesh_filename, "distance": None}
+        written.append(mesh_filename)
+
+    if not lods:
+        return []
+
+    odr_filename = f"{base_name}.odr"
+
+    bounds_min = drawable.bounds_min
+    bounds_max = drawable.bounds_max
+    write_odr_file(os.path.join(output_dir, odr_filename), {
+        "version": None,
+        "shaders": [],      # Shader groups are not parsed yet
+        "lods": lods,
+        "bounding_box": {"min": bounds_min, "max": bounds_max},
+        "center": drawable.center,
+        "radius": float(np.linalg.norm(np.subtract(bounds_max, bounds_min)) / 2),
+    })
+
+    return [odr_filename] + written
+#######################################################
+def convert_file(filepath, output_dir, lod=LOD_ALL):
+    # Worker entry point; never raises, so one bad file cannot take the pool down
+    started = time.perf_counter()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(filepath))[0]
+        written = []
+        errors = []
+
+        if filepath.lower().endswith(".wdd"):
+            dictionary = read_wdd(filepath, lod=lod)
+            for idx, drawable in enumerate(dictionary.drawables):
+                if drawable is not None:
+                    written += convert_drawable(drawable, output_dir, f"{base_name}_wdr_{idx}")
+            errors = [f"entry {idx}: {message}" for idx, message in sorted(dictionary.errors.items())]
+        else:
+            written = convert_drawable(read_wdr(filepath, lod=lod), output_dir, base_name)
+
+        return filepath, written, errors, time.perf_counter() - started
+
+    except Exception as e:
+        return filepath, [], [f"{type(e).__name__}: {e}", traceback.format_exc()], time.perf_counter() - started
+#######################################################
+def convert_tree(source, destination, jobs=None, report_path=None, stream=sys.stdout, lod=LOD_ALL):
+    filepaths = find_drawables(source)
+    source_root = source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source))
+    total = len(filepaths)
+    started = time.perf_counter()
+
+    converted = 0
+    files_written = 0
+    failures = []
+
+    print(f"📦 Converting {total} drawable file(s) from {source} with {jobs or os.cpu_count()} worker(s)", file=stream)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(convert_file, filepath, os.path.join(destination, os.path.relpath(os.path.dirname(filepath), source_root)), lod)
+            for filepath in filepaths
+        ]
+
+        for done, future in enumerate(as_completed(futures), 1):
+            filepath, written, errors, elapsed = future.result()
+            files_written += len(written)
+            if written:
+                converted += 1
+            if errors:
+                failures.append((filepath, errors))
+
+            status = "❌" if errors and not written else "⚠️" if errors else "✅"
+            print(f"[{done}/{total}] {status} {os.path.relpath(filepath, source_root)} ({elapsed * 1000:.0f} ms)", file=stream)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n🚀 {converted}/{total} file(s) converted, {files_written} openFormat file(s) written in {elapsed:.1f} s", file=stream)
+
+    if failures:
+        print(f"❌ {len(failures)} file(s) failed:", file=stream)
+        for filepath, errors in failures:
+            print(f"  {filepath}: {errors[0]}", file=stream)
+
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8') as report:
+                for filepath, errors in failures:
+                    report.write(f"{filepath}\n")
+                    for error in errors:
+                        for line in error.rstrip().splitlines():
+                            report.write(f"    {line}\n")
+                    report.write("\n")
+            print(f"📝 Failure report written to {report_path}", file=stream)
+
+    return converted, failures
+#######################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert RAGE IV drawables (.wdr/.wdd) to OpenIV openFormats (.odr/.mesh).")
+    parser.add_argument("source", help="Drawable file, or directory searched recursively")
+    parser.add_argument("destination", help="Output directory; the source tree layout is mirrored here")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: every core)")
+    parser.add_argument("--report", default=None, help="Write the full per-file failure report to this file")
+    parser.add_argument("--lod", default=LOD_ALL, type=str.upper, choices=(LOD_HIGH, LOD_LOW, LOD_ALL), help="LODs to convert (default: all)")
+    args = parser.parse_args(argv)
+
+    _, failures = convert_tree(args.source, args.destination, args.jobs, args.report, lod=args.lod)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Parser benchmark over synthetic RSC5 drawables
+#
+# Generates a fixed matrix of .wdr/.wdd cases in memory (rsc_generator), times each
+# parse stage best-of-N, and compares against a stored JSON baseline: by default
+# benchmark_baseline.json next to this file, recorded from the cases below.
+# Runs headless; Blender is not needed.
+#
+#   python -m BlenDR.REutils.benchmark --fail-on-regression
+#   python -m BlenDR.REutils.benchmark --baseline other.json
+#
+# Timings are machine-specific: regenerate the stored baseline on the machine that
+# runs the comparison (and whenever BENCHMARK_CASES changes) with
+#
+#   python -m BlenDR.REutils.benchmark --save-baseline
+#
+# Stages:
+#   inflate   RSC header + zlib inflate into segment views
+#   parse     full structure walk + vertex/index decoding (read_drawable / read_drawable_dictionary)
+#   vertices  vertex buffer decoding alone
+#   indices   index buffer decoding alone
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+from ..RELib.IV.rsc import RSCResource
+from ..RELib.IV.wdr import read_drawable
+from ..RELib.IV.wdd import read_drawable_dictionary
+from ..RELib.IV.vertex import get_vertex_decoder
+from ..RELib.IV.indices import decode_index_buffer
+from .rsc_generator import build_wdr, build_wdd
+
+# name -> (kind, generator keyword arguments)
+BENCHMARK_CASES = {
+    'wdr_small_36':       ('wdr', dict(geometry_count=1, vertex_count=1024, stride=36)),
+    'wdr_city_block_52':  ('wdr', dict(geometry_count=16, vertex_count=60000, stride=52)),
+    'wdr_skinned_68':     ('wdr', dict(geometry_count=4, vertex_count=20000, stride=68)),
+    'wdr_raw_44':         ('wdr', dict(geometry_count=4, vertex_count=20000, stride=44, compress=False)),
+    'wdd_props_28':       ('wdd', dict(entry_count=64, geometry_count=2, vertex_count=2000, stride=28)),
+}
+
+STAGES = ('inflate', 'parse', 'vertices', 'indices')
+
+DEFAULT_REPEATS = 5
+DEFAULT_TOLERANCE = 0.10    # Slower than baseline by more than this fraction counts as a regression
+MIN_SIGNIFICANT_SECONDS = 0.001     # Stages faster than this are timer noise and never flagged
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+#######################################################
+def best_of(repeats, function):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+#######################################################
+def iter_geometries(parsed):
+    drawables = [drawable for drawable in parsed.drawables if drawable is not None] if hasattr(parsed, 'drawables') else [parsed]
+    for drawable in drawables:
+        yield from drawable.geometries()
+#######################################################
+def benchmark_resource(kind, data, repeats=DEFAULT_REPEATS):
+    def inflate():
+        RSCResource.from_buffer(data).close()
+
+    def parse():
+        with RSCResource.from_buffer(data) as resource:
+            if kind == 'wdd':
+                read_drawable_dictionary(resource)
+            else:
+                read_drawable(resource)
+
+    timings = {
+        'inflate': best_of(repeats, inflate),
+        'parse': best_of(repeats, parse),
+    }
+
+    with RSCResource.from_buffer(data) as resource:
+        parsed = read_drawable_dictionary(resource) if kind == 'wdd' else read_drawable(resource)
+        geometries = list(iter_geometries(parsed))
+
+        vertex_jobs = []
+        index_jobs = []
+        for geometry in geometries:
+            vertex_buffer = geometry.vertex_buffer
+            declaration = geometry.declaration
+            vertex_decoder = get_vertex_decoder(declaration.usage_flags, declaration.stride, declaration.decl_type)
+            vertex_jobs.append((vertex_decoder, resource.block(vertex_buffer.data_ptr1, vertex_buffer.vertex_count * declaration.stride), vertex_buffer.vertex_count))
+
+            index_count = geometry.index_buffer.index_count
+            index_jobs.append((resource.block(geometry.index_buffer.data_ptr, index_count * geometry.index_size), index_count, geometry.record.primitive_type))
+
+        timings['vertices'] = best_of(repeats, lambda: [decoder.decode(block, count) for decoder, block, count in vertex_jobs])
+        timings['indices'] = best_of(repeats, lambda: [decode_index_buffer(*job) for job in index_jobs])
+
+        vertex_count = sum(geometry.vertex_data.count for geometry in geometries)
+        triangle_count = sum(len(geometry.triangles) for geometry in geometries)
+
+    return {
+        'bytes': len(data),
+        'geometries': len(geometries),
+        'vertices': vertex_count,
+        'triangles': triangle_count,
+        'seconds': timings,
+    }
+#######################################################
+def run_benchmarks(case_names=None, repeats=DEFAULT_REPEATS, extra_files=(), stream=sys.stdout):
+    results = {}
+
+    for name in case_names or BENCHMARK_CASES:
+        kind, arguments = BENCHMARK_CASES[name]
+        data = build_wdd(**arguments) if kind == 'wdd' else build_wdr(**arguments)
+        results[name] = benchmark_resource(kind, data, repeats)
+        print_result(name, results[name], stream)
+
+    for filepath in extra_files:
+        kind = 'wdd' if filepath.lower().endswith('.wdd') else 'wdr'
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        name = os.path.basename(filepath)
+        results[name] = benchmark_resource(kind, data, repeats)
+        print_result(name, results[name], stream)
+
+    return results
+#######################################################
+def print_result(name, result, stream=sys.stdout):
+    stages = '  '.join(f"{stage} {result['seconds'][stage] * 1000:8.2f} ms" for stage in STAGES)
+    print(f"{name:<22} {result['vertices']:>9} verts {result['triangles']:>9} tris  {stages}", file=stream)
+#######################################################
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE, stream=sys.stdout):
+    # Returns the (case, stage, ratio) triples slower than the baseline by more than tolerance
+    regressions = []
+    baseline_results = baseline.get('results', {})
+
+    print("\n📊 Compared with baseline (current / baseline):", file=stream)
+    for name, result in results.items():
+        base = baseline_results.get(name)
+        if base is None:
+            print(f"{name:<22} (no baseline)", file=stream)
+            continue
+
+        cells = []
+        for stage in STAGES:
+            current = result['seconds'][stage]
+            previous = base['seconds'].get(stage)
+            if not previous:
+                cells.append(f"{stage}    n/a")
+                continue
+
+            ratio = current / previous
+            significant = max(current, previous) >= MIN_SIGNIFICANT_SECONDS
+            regressed = significant and ratio > 1 + tolerance
+            marker = "❌" if regressed else "✅" if significant and ratio < 1 - tolerance else "  "
+            if regressed:
+                regressions.append((name, stage, ratio))
+            cells.append(f"{stage} {ratio:5.2f}x{marker}")
+        print(f"{name:<22} {'  '.join(cells)}", file=stream)
+
+    return regressions
+#######################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the RAGE IV drawable parser on synthetic RSC5 files.")
+    parser.add_argument("--case", action="append", choices=sorted(BENCHMARK_CASES), help="Run only these cases (repeatable)")
+    parser.add_argument("--file", action="append", default=[], help="Also benchmark this real .wdr/.wdd (repeatable)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per stage; the best is kept")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Compare against this baseline JSON (default: the stored benchmark_baseline.json)")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_PATH, help="Write the results to this baseline JSON (default: replace the stored one)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown fraction before a stage counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 when any stage regressed")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.case, args.repeats, args.file)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'repeats': args.repeats,
+                'results': results,
+            }, f, indent=2)
+        print(f"\n📝 Baseline written to {args.save_baseline}")
+
+    if args.save_baseline and os.path.abspath(args.save_baseline) == os.path.abspath(args.baseline):
+        return 0    # Just recorded; nothing to compare against
+    if not os.path.isfile(args.baseline):
+        print(f"\n⚠️ No baseline at {args.baseline}; record one with --save-baseline")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+        if args.fail_on_regression:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Header-only asset catalogue for RAGE IV resources
+#
+# Walks a folder and records what every .wdr/.wdd/.wbd (and the RSC header of
+# any other .w?? resource) holds, without importing it: RSC version and segment
+# sizes, LOD/model/geometry/vertex/triangle counts, bounds and dictionary entry
+# hashes. Only the system segment is inflated (RSCResource.open_system), so the
+# vertex and index data that make up most of a file are never decompressed.
+#
+# Results go into a SQLite database. Rescans skip files whose size and mtime are
+# unchanged and drop rows of files that disappeared.
+#
+#   python -m BlenDR.REutils.catalogue scan <folder> [--db catalogue.sqlite] [--jobs N] [--names names.txt]
+#   python -m BlenDR.REutils.catalogue search <text> [--db catalogue.sqlite] [--kind wdd]
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+from concurrent.futures import ProcessPoolExecutor
+
+from ..RELib.IV.rsc import RSCResource, ResourceStream, read_rsc_header, RSC_HEADER_SIZE
+from ..RELib.IV.layouts import WDR_HEADER, MODEL_COLLECTION, MODEL, GEOMETRY, INDEX_BUFFER, read_pointer_array
+from ..RELib.IV.indices import PRIMITIVE_TRIANGLE_STRIP
+from ..RELib.IV.wdr import LOD_ALL, select_lod_pointers
+from ..RELib.IV.wdd import read_wdd_header, read_wdd_hashes, read_wdd_wdr_offsets
+from ..RELib.IV.wbd import WBDImporter
+from .name_hash import load_name_table, parse_hash_key
+from .resource_cache import CACHE_DIR
+
+CATALOGUE_PATH = os.path.join(CACHE_DIR, "catalogue.sqlite")
+CATALOGUE_VERSION = 1           # user_version of the schema below; older databases are rebuilt
+RESOURCE_EXTENSIONS = (".wdr", ".wdd", ".wbd", ".wbn", ".wtd", ".wft", ".wad")
+COMMIT_INTERVAL = 500           # Files per transaction while scanning
+
+BOUNDS_COLUMNS = ('min_x', 'min_y', 'min_z', 'max_x', 'max_y', 'max_z')
+COUNT_COLUMNS = ('lods', 'models', 'geometries', 'vertices', 'triangles')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    file_type INTEGER,
+    rsc_version INTEGER,
+    flags INTEGER,
+    system_mem INTEGER,
+    graphics_mem INTEGER,
+    entry_count INTEGER,
+    {', '.join(f'{column} INTEGER' for column in COUNT_COLUMNS)},
+    {', '.join(f'{column} REAL' for column in BOUNDS_COLUMNS)},
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    name TEXT,
+    {', '.join(f'{column} INTEGER' for column in COUNT_COLUMNS)},
+    {', '.join(f'{column} REAL' for column in BOUNDS_COLUMNS)},
+    PRIMARY KEY (file_id, idx)
+);
+CREATE INDEX IF NOT EXISTS files_name ON files(name);
+CREATE INDEX IF NOT EXISTS entries_hash ON entries(hash);
+CREATE INDEX IF NOT EXISTS entries_name ON entries(name);
+"""
+
+
+#######################################################
+def open_catalogue(database=CATALOGUE_PATH):
+    if os.path.dirname(database):
+        os.makedirs(os.path.dirname(database), exist_ok=True)
+    connection = sqlite3.connect(database)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("PRAGMA journal_mode = WAL")
+    if connection.execute("PRAGMA user_version").fetchone()[0] != CATALOGUE_VERSION:
+        connection.executescript("DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS files;")
+        connection.execute(f"PRAGMA user_version = {CATALOGUE_VERSION}")
+    connection.executescript(SCHEMA)
+    return connection
+#######################################################
+def find_resources(source):
+    if os.path.isfile(source):
+        return [os.path.abspath(source)]
+
+    found = []
+    for directory, _, filenames in os.walk(source):
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() in RESOURCE_EXTENSIONS:
+                found.append(os.path.abspath(os.path.join(directory, filename)))
+    found.sort()
+    return found
+
+
+#######################################################
+def describe_drawable(resource, header_offset):
+    # Counts and bounds of one drawable from its structures alone. Triangles are
+    # index count / 3 for lists and an upper bound (degenerates included) for strips.
+    header = WDR_HEADER.unpack_from(resource.data, header_offset)
+    lods = select_lod_pointers(header, LOD_ALL)
+    counts = dict.fromkeys(COUNT_COLUMNS, 0)
+    counts['lods'] = len(lods)
+
+    for lod_name, model_collection_ptr in lods[:1]:     # Totals describe the high LOD, what imports default to
+        model_collection = MODEL_COLLECTION.read(resource, model_collection_ptr)
+        for model_ptr in read_pointer_array(resource, model_collection.model_array_ptr, model_collection.model_count):
+            model = MODEL.read(resource, model_ptr)
+            counts['models'] += 1
+            for geometry_ptr in read_pointer_array(resource, model.geometry_collection_ptr, model.number_of_geometries):
+                geometry = GEOMETRY.read(resource, geometry_ptr)
+                index_count = INDEX_BUFFER.read(resource, geometry.index_buffer_ptr).index_count
+                counts['geometries'] += 1
+                counts['vertices'] += geometry.vertex_count
+                counts['triangles'] += max(index_count - 2, 0) if geometry.primitive_type == PRIMITIVE_TRIANGLE_STRIP else index_count // 3
+
+    bounds = dict(zip(BOUNDS_COLUMNS, (header.min_x, header.min_y, header.min_z, header.max_x, header.max_y, header.max_z)))
+    return {**counts, **bounds}
+#######################################################
+def describe_file(filepath):
+    # Worker entry point: (file row, [entry rows]) for one resource; never raises
+    info = os.stat(filepath)
+    kind = os.path.splitext(filepath)[1].lower().lstrip('.')
+    row = {'path': filepath, 'name': os.path.basename(filepath), 'kind': kind, 'size': info.st_size, 'mtime_ns': info.st_mtime_ns}
+    entries = []
+
+    try:
+        if kind not in ("wdr", "wdd", "wbd"):
+            with open(filepath, 'rb') as f:
+                header = read_rsc_header(f.read(RSC_HEADER_SIZE))
+            row.update(file_type=header['file_type'], rsc_version=header['version'], flags=header['flags'],
+                       system_mem=header['system_mem'], graphics_mem=header['graphics_mem'])
+            return row, entries
+
+        with RSCResource.open_system(filepath) as resource:
+            row.update(file_type=resource.file_type, rsc_version=resource.version, flags=resource.flags,
+                       system_mem=resource.system_size, graphics_mem=resource.graphics_size)
+
+            if kind == "wdr":
+                row.update(describe_drawable(resource, 0))
+
+            elif kind == "wdd":
+                s = resource.stream()
+                header = read_wdd_header(s)
+                hashes = read_wdd_hashes(s, resource.resolve_offset(header['hashes_offset'], 4 * header['hashes_count']), header['hashes_count'], header['hashes_stride'])
+                offsets = read_wdd_wdr_offsets(s, resource.resolve_offset(header['wdrs_offset'], 4 * header['wdrs_count']), header['wdrs_count'])
+                row['entry_count'] = len(offsets)
+                for column in COUNT_COLUMNS:
+                    row[column] = 0
+                for idx, raw_offset in enumerate(offsets):
+                    entry = {'idx': idx, 'hash': hashes[idx] if idx < len(hashes) else 0}
+                    try:
+                        entry.update(describe_drawable(resource, resource.resolve_offset(raw_offset, WDR_HEADER.size)))
+                    except Exception:
+                        pass    # A broken entry is still listed by hash
+                    for column in COUNT_COLUMNS[1:]:
+                        row[column] += entry.get(column, 0)
+                    row['lods'] = max(row['lods'], entry.get('lods', 0))
+                    entries.append(entry)
+
+            else:
+                bounds = WBDImporter(filepath)
+                bounds.read_header(ResourceStream(resource.system), verbose=False)
+                row['entry_count'] = len(bounds.hashes)
+                entries = [{'idx': idx, 'hash': bounds_hash} for idx, bounds_hash in enumerate(bounds.hashes)]
+
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+
+    return row, entries
+
+
+#######################################################
+def scan_catalogue(source, database=CATALOGUE_PATH, jobs=1, names=None, stream=sys.stdout):
+    # Incremental: unchanged files (same size and mtime) are skipped, vanished ones removed.
+    # names: optional NameTable that labels entry hashes. Returns (scanned, skipped, removed).
+    started = time.perf_counter()
+    filepaths = find_resources(source)
+    connection = open_catalogue(database)
+
+    # Exact prefix match: LIKE would treat _ and % in the root as wildcards and ignore case,
+    # and rows of other folders matched here would be deleted below as removed files
+    root = os.path.abspath(source)
+    prefix = os.path.join(root, '')
+    known = {
+        row['path']: (row['id'], row['size'], row['mtime_ns'])
+        for row in connection.execute(
+            "SELECT id, path, size, mtime_ns FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+            (root, len(prefix), prefix)
+        )
+    }
+
+    pending = []
+    for filepath in filepaths:
+        previous = known.pop(filepath, None)
+        info = os.stat(filepath)
+        if previous is None or previous[1:] != (info.st_size, info.st_mtime_ns):
+            pending.append(filepath)
+
+    with connection:
+        connection.executemany("DELETE FROM files WHERE id = ?", [(file_id,) for file_id, _, _ in known.values()])
+
+    print(f"📦 Cataloguing {len(pending)} changed file(s) of {len(filepaths)} under {source}", file=stream)
+
+    if jobs != 1 and len(pending) > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(describe_file, pending, chunksize=64)
+    else:
+        executor = None
+        results = map(describe_file, pending)
+
+    failed = 0
+    try:
+        for done, (row, entries) in enumerate(results, 1):
+            failed += 'error' in row
+            store_file(connection, row, entries, names)
+            if done % COMMIT_INTERVAL == 0:
+                connection.commit()
+                print(f"  [{done}/{len(pending)}]", file=stream)
+        connection.commit()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        connection.close()
+
+    print(f"🚀 Catalogued {len(pending)} file(s), {len(filepaths) - len(pending)} unchanged, {len(known)} removed, {failed} unreadable in {time.perf_counter() - started:.1f} s", file=stream)
+    return len(pending), len(filepaths) - len(pending), len(known)
+#######################################################
+def store_file(connection, row, entries, names=None):
+    connection.execute("DELETE FROM files WHERE path = ?", (row['path'],))     # Cascades to its entries
+    columns = list(row)
+    cursor = connection.execute(f"INSERT INTO files ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", [row[column] for column in columns])
+    if not entries:
+        return
+
+    entry_names = names.lookup_many([entry['hash'] for entry in entries]) if names is not None else [None] * len(entries)
+    entry_columns = ('file_id', 'idx', 'hash', 'name') + COUNT_COLUMNS + BOUNDS_COLUMNS
+    connection.executemany(
+        f"INSERT INTO entries ({', '.join(entry_columns)}) VALUES ({', '.join('?' * len(entry_columns))})",
+        [(cursor.lastrowid, entry['idx'], entry['hash'], name, *(entry.get(column) for column in COUNT_COLUMNS + BOUNDS_COLUMNS))
+         for entry, name in zip(entries, entry_names)]
+    )
+#######################################################
+def search_catalogue(text, database=CATALOGUE_PATH, kind=None, limit=200):
+    # Files whose name contains text, plus dictionary/bounds entries whose name contains it or
+    # whose hash equals it (a 0x hash or a name hashed with joaat). Rows are dicts; entry rows
+    # carry 'entry_idx', 'entry_hash' and 'entry_name', file rows None for those.
+    connection = open_catalogue(database)
+    try:
+        pattern = f"%{text}%"
+        kind_filter = "AND files.kind = ?" if kind else ""
+        kind_args = (kind,) if kind else ()
+        try:
+            text_hash = parse_hash_key(text) if text else None
+        except ValueError:
+            text_hash = None    # '0x' followed by something that is not hex
+
+        rows = connection.execute(
+            f"""SELECT files.*, NULL AS entry_idx, NULL AS entry_hash, NULL AS entry_name FROM files
+                WHERE files.name LIKE ? {kind_filter}
+                UNION ALL
+                SELECT files.*, entries.idx, entries.hash, entries.name FROM entries JOIN files ON files.id = entries.file_id
+                WHERE (entries.name LIKE ? OR entries.hash = ?) {kind_filter}
+                ORDER BY name, entry_idx LIMIT ?""",
+            (pattern, *kind_args, pattern, text_hash, *kind_args, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        connection.close()
+#######################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catalogue RAGE IV resources from their headers and search the catalogue.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = commands.add_parser("scan", help="Scan a folder (or file) into the catalogue")
+    scan_parser.add_argument("source")
+    scan_parser.add_argument("--jobs", type=int, default=1, help="Worker processes, 0 for every core")
+    scan_parser.add_argument("--names", default=None, help="Name list or .nametable to label entry hashes with")
+
+    search_parser = commands.add_parser("search", help="Find files and entries by name or hash")
+    search_parser.add_argument("text")
+    search_parser.add_argument("--kind", default=None, help="Only this extension, e.g. wdd")
+    search_parser.add_argument("--limit", type=int, default=50)
+
+    for command_parser in (scan_parser, search_parser):
+        command_parser.add_argument("--db", default=CATALOGUE_PATH, help=f"Catalogue database (default {CATALOGUE_PATH})")
+    args = parser.parse_args(argv)
+
+    if args.command == "scan":
+        names = load_name_table(args.names) if args.names else None
+        scan_catalogue(args.source, args.db, args.jobs or None, names)
+        return 0
+
+    for row in search_catalogue(args.text, args.db, args.kind, args.limit):
+        if row['entry_idx'] is None:
+            print(f"{row['path']}  [{row['kind']} v{row['rsc_version']}] {row['geometries'] or 0} geometries, {row['vertices'] or 0} vertices")
+        else:
+            print(f"{row['path']} #{row['entry_idx']}  0x{row['entry_hash']:08X} {row['entry_name'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
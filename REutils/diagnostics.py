@@ -0,0 +1,164 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Levelled diagnostics channel for the RAGE parsers
+#
+# Off by default: messages are format strings plus arguments and are only
+# formatted when their level is enabled, so a production import pays one integer
+# compare per call. Every structure read is still remembered in a small ring
+# buffer, which is dumped when a parse fails. An annotated offset map of every
+# structure read can optionally be appended to a file.
+#
+# Levels can also be set before Blender starts:
+#   BLENDR_LOG_LEVEL=info|debug|trace
+#   BLENDR_OFFSET_MAP=/path/to/offsets.txt
+
+import os
+
+from collections import deque
+
+QUIET = 0       # Errors only
+INFO = 1        # One line per file / drawable
+DEBUG = 2       # Every structure read, field by field
+TRACE = 3       # Padding and reserved byte dumps
+
+LEVEL_NAMES = {
+    'quiet': QUIET,
+    'off': QUIET,
+    'info': INFO,
+    'debug': DEBUG,
+    'trace': TRACE,
+}
+
+HISTORY_SIZE = 32
+
+SEPARATOR = "--------------------------------------------------"
+
+POINTER_FIELDS = ('vtable', 'padding')    # Shown in hex alongside every *_ptr field
+
+#######################################################
+class Diagnostics:
+    def __init__(self, level=QUIET, history_size=HISTORY_SIZE, offset_map_path=None):
+        self.level = level
+        self.history = deque(maxlen=history_size)   # (pointer, size, record, name, args), newest last
+        self.offset_map_path = offset_map_path
+        self.offset_map = []
+
+    @classmethod
+    def from_environment(cls):
+        level = LEVEL_NAMES.get(os.environ.get('BLENDR_LOG_LEVEL', '').strip().lower(), QUIET)
+        return cls(level, offset_map_path=os.environ.get('BLENDR_OFFSET_MAP') or None)
+
+    def configure(self, level=None, offset_map_path=None):
+        if level is not None:
+            self.level = LEVEL_NAMES.get(level, QUIET) if isinstance(level, str) else level
+        if offset_map_path is not None:
+            self.offset_map_path = offset_map_path or None
+
+    def reset(self):
+        # Start of a new file; reads from the previous one are no longer relevant
+        self.history.clear()
+        self.offset_map.clear()
+
+    def enabled(self, level):
+        return level <= self.level
+
+    def log(self, level, message, *args):
+        if level <= self.level:
+            print(message.format(*args) if args else message)
+
+    def info(self, message, *args):
+        if INFO <= self.level:
+            print(message.format(*args) if args else message)
+
+    def debug(self, message, *args):
+        if DEBUG <= self.level:
+            print(message.format(*args) if args else message)
+
+    def trace(self, message, *args):
+        if TRACE <= self.level:
+            print(message.format(*args) if args else message)
+
+    def error(self, message, *args):
+        print(message.format(*args) if args else message)
+
+    def section(self, title, *args):
+        if DEBUG <= self.level:
+            print(f"{SEPARATOR}\n\n ... {format_message(title, args)} ...\n{SEPARATOR}")
+
+    def structure(self, pointer, size, record, name, *args):
+        # Called for every block read; recording is a tuple append, printing only happens at DEBUG.
+        # name is a format string like any message, kept unformatted until something shows it
+        self.history.append((pointer, size, record, name, args))
+        if self.offset_map_path is not None:
+            self.offset_map.append((pointer, size, name, args))
+        if DEBUG <= self.level:
+            print(format_structure(format_message(name, args), pointer, record, self.level >= TRACE))
+
+    def post_mortem(self, error):
+        # Recent structure reads leading up to a failure, oldest first
+        self.error(f"❌ {error}")
+        if not self.history:
+            return
+        self.error(f"🧠 Last {len(self.history)} structure reads:")
+        for pointer, size, record, name, args in self.history:
+            self.error("  0x{:08X}  +0x{:04X}  {}", pointer, size, format_message(name, args))
+        if self.level < DEBUG:
+            # Fields of the last structure were never printed; show them now
+            pointer, size, record, name, args = self.history[-1]
+            self.error(format_structure(format_message(name, args), pointer, record, True))
+
+    def flush_offset_map(self, source_name):
+        if self.offset_map_path is None or not self.offset_map:
+            self.offset_map.clear()
+            return
+
+        with open(self.offset_map_path, 'a', encoding='utf-8') as f:
+            f.write(f"# {source_name}\n")
+            for pointer, size, name, args in sorted(self.offset_map, key=lambda entry: entry[:2]):
+                segment = "system" if pointer >> 28 == 0x5 else "graphics" if pointer >> 28 == 0x6 else "data"
+                f.write(f"0x{pointer:08X}  {segment:<8}  +0x{pointer & 0x0FFFFFFF:08X}  0x{size:06X} bytes  {format_message(name, args)}\n")
+            f.write("\n")
+        self.offset_map.clear()
+
+
+#######################################################
+def format_message(message, args):
+    return message.format(*args) if args else message
+
+def format_structure(name, pointer, record, include_padding=False):
+    lines = [f"  {name} @ 0x{pointer:08X}"]
+    if record is None:      # Raw vertex/index data, nothing to break down
+        return lines[0]
+    for field_name, value in record._asdict().items():
+        if isinstance(value, bytes):
+            if not include_padding:
+                continue
+            value = ' '.join(f'{b:02X}' for b in value)
+        elif isinstance(value, int) and (field_name.endswith('_ptr') or field_name.startswith('data_ptr') or field_name in POINTER_FIELDS):
+            value = f"0x{value:08X}"
+        lines.append(f"    {field_name:<24}{value}")
+    return '\n'.join(lines)
+
+
+diagnostics = Diagnostics.from_environment()
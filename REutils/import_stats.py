@@ -0,0 +1,138 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Per-stage import timing and counters
+#
+# Parsers and operators wrap each stage in stats.stage(name) and bump counters
+# with stats.count(name, amount). Stages are accumulated, so a stage entered once
+# per geometry adds up across the file. Parsers default to NULL_STATS, which
+# records nothing.
+
+import os
+import json
+import time
+
+from contextlib import contextmanager, nullcontext
+
+# Stages in report order
+STAGE_ORDER = ('cache_lookup', 'inflate', 'structures', 'parallel_parse', 'content_hash', 'vertex_decode', 'index_decode', 'text_parse', 'cache_store', 'mesh_build')
+
+#######################################################
+class ImportStats:
+    def __init__(self, source_path="", importer=""):
+        self.source_path = source_path
+        self.importer = importer
+        self.stages = {}        # Stage name -> accumulated seconds
+        self.counters = {}      # Counter name -> total
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, stages, counters):
+        # Folds in stages/counters recorded elsewhere, e.g. by worker processes
+        for name, seconds in stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for name, amount in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        return self
+
+    @property
+    def total_seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def rate(self, counter):
+        # Items per second over the whole import
+        total = self.total_seconds
+        return self.counters.get(counter, 0) / total if total > 0 else 0.0
+
+    def ordered_stages(self):
+        names = [name for name in STAGE_ORDER if name in self.stages]
+        names += sorted(name for name in self.stages if name not in STAGE_ORDER)
+        return [(name, self.stages[name]) for name in names]
+
+    def summary(self):
+        stages = ', '.join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.ordered_stages())
+        parts = [f"{self.importer} {os.path.basename(self.source_path)}: {self.total_seconds * 1000:.1f} ms ({stages})"]
+
+        if self.counters.get('bytes_decompressed'):
+            parts.append(f"{self.counters['bytes_decompressed'] / (1024 * 1024):.2f} MiB inflated")
+        if self.counters.get('vertices'):
+            parts.append(f"{self.counters['vertices']} verts ({self.rate('vertices'):,.0f}/s)")
+        if self.counters.get('triangles'):
+            parts.append(f"{self.counters['triangles']} tris ({self.rate('triangles'):,.0f}/s)")
+        objects = self.counters.get('objects_created', 0)
+        meshes = self.counters.get('meshes_created', objects)
+        parts.append(f"{objects} object(s)" if meshes == objects else f"{objects} object(s), {meshes} new mesh(es)")
+
+        return " | ".join(parts)
+
+    def as_dict(self):
+        return {
+            'importer': self.importer,
+            'source': self.source_path,
+            'total_seconds': self.total_seconds,
+            'stages': dict(self.ordered_stages()),
+            'counters': dict(self.counters),
+            'rates': {
+                'vertices_per_second': self.rate('vertices'),
+                'triangles_per_second': self.rate('triangles'),
+            },
+        }
+
+    def write_json(self, filepath=None):
+        # Defaults to <source>.import_stats.json beside the imported file
+        filepath = filepath or f"{self.source_path}.import_stats.json"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+        return filepath
+
+
+#######################################################
+class NullImportStats:
+    # Stand-in when nobody is measuring: every call is a no-op
+    _stage = nullcontext()
+
+    def stage(self, name):
+        return self._stage
+
+    def count(self, name, amount=1):
+        pass
+
+    def merge(self, stages, counters):
+        pass
+
+
+NULL_STATS = NullImportStats()
@@ -0,0 +1,157 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Shared Blender mesh construction for every importer
+#
+# Positions and indices go in as NumPy arrays and are written straight into the
+# mesh with foreach_set, so no per-vertex/per-face Python tuples are ever built.
+
+import bpy
+import numpy as np
+
+CONTENT_HASH_PROPERTY = "blendr_content_hash"   # Mesh custom property holding RELib.IV.wdr content hashes
+
+#######################################################
+def build_mesh(name, positions, triangles=None, edges=None):
+    positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+
+    if edges is not None and len(edges):
+        edges = np.ascontiguousarray(edges, dtype=np.int32).reshape(-1, 2)
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.ravel())
+
+    has_faces = triangles is not None and len(triangles) > 0
+    if has_faces:
+        fill_triangles(mesh, triangles)
+
+    mesh.update(calc_edges=has_faces)
+    return mesh
+#######################################################
+def fill_triangles(mesh, triangles):
+    triangles = np.ascontiguousarray(triangles, dtype=np.int32).reshape(-1, 3)
+    face_count = len(triangles)
+    loop_count = face_count * 3
+
+    mesh.loops.add(loop_count)
+    mesh.loops.foreach_set("vertex_index", triangles.ravel())
+
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, loop_count, 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # Older builds do not derive the loop count from loop_start
+        mesh.polygons.foreach_set("loop_total", np.full(face_count, 3, dtype=np.int32))
+#######################################################
+def write_vertex_attributes(mesh, vertex_data, triangles):
+    # Everything beyond positions the vertex layout carries; attributes that are None are skipped
+    if vertex_data.normals is not None:
+        write_normals(mesh, vertex_data.normals)
+
+    for channel, uvs in enumerate(vertex_data.uvs):
+        write_uv_layer(mesh, "UVMap" if channel == 0 else f"UVMap.{channel:03d}", uvs, triangles)
+
+    if vertex_data.colors is not None:
+        write_color_attribute(mesh, "Color", vertex_data.colors)
+    if vertex_data.specular is not None:
+        write_color_attribute(mesh, "Specular", vertex_data.specular)
+
+    if vertex_data.tangents is not None:
+        write_tangents(mesh, vertex_data.tangents)
+#######################################################
+def write_normals(mesh, normals):
+    normals = np.ascontiguousarray(normals, dtype=np.float32).reshape(-1, 3)
+
+    # Custom normals are only honoured on smooth faces
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+    if bpy.app.version < (4, 1, 0):
+        mesh.use_auto_smooth = True
+    mesh.normals_split_custom_set_from_vertices(normals)
+#######################################################
+def write_uv_layer(mesh, name, uvs, triangles):
+    triangles = np.ascontiguousarray(triangles, dtype=np.int32).reshape(-1)
+
+    # UVs live on loops: gather per corner through the triangle indices, and flip V (D3D origin is top-left)
+    loop_uvs = np.asarray(uvs, dtype=np.float32)[triangles]
+    loop_uvs[:, 1] = 1.0 - loop_uvs[:, 1]
+
+    uv_layer = mesh.uv_layers.new(name=name)
+    uv_layer.data.foreach_set("uv", loop_uvs.ravel())
+#######################################################
+def write_color_attribute(mesh, name, colors):
+    colors = np.asarray(colors, dtype=np.float32).reshape(-1) / 255.0
+
+    if bpy.app.version < (3, 2, 0):
+        # No color attributes yet; fall back to a per-loop vertex color layer
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)
+        loop_colors = colors.reshape(-1, 4)[loop_vertices]
+        color_layer = mesh.vertex_colors.new(name=name)
+        color_layer.data.foreach_set("color", loop_colors.ravel())
+        return
+
+    # Bytes are stored as sRGB, so write them through color_srgb where it exists
+    color_attribute = mesh.color_attributes.new(name, 'BYTE_COLOR', 'POINT')
+    color_attribute.data.foreach_set("color_srgb" if bpy.app.version >= (3, 4, 0) else "color", colors)
+#######################################################
+def write_tangents(mesh, tangents):
+    tangents = np.asarray(tangents, dtype=np.float32).reshape(-1, 4)
+
+    tangent_attribute = mesh.attributes.new("Tangent", 'FLOAT_VECTOR', 'POINT')
+    tangent_attribute.data.foreach_set("vector", np.ascontiguousarray(tangents[:, :3]).ravel())
+
+    # W holds the bitangent sign
+    sign_attribute = mesh.attributes.new("TangentSign", 'FLOAT', 'POINT')
+    sign_attribute.data.foreach_set("value", np.ascontiguousarray(tangents[:, 3]))
+#######################################################
+def iter_drawable_objects(drawable, base_name, collection, shared_meshes=None):
+    # One object per geometry of every model of a parsed RELib.IV.wdr.Drawable, each mesh built once,
+    # yielded as it is made so imports can build between UI redraws.
+    # Numbering runs across the models of a LOD so geometries of different models never share a name;
+    # LODs below high carry their name, e.g. <base>_low_Object_0.
+    # With a shared_meshes dict (content hash -> mesh), byte-identical geometry links one mesh datablock.
+    for lod in drawable.lods:
+        prefix = base_name if lod == "high" else f"{base_name}_{lod}"
+        for number, geometry in enumerate(drawable.geometries(lod)):
+            if not len(geometry.triangles):
+                continue
+
+            mesh = shared_meshes.get(geometry.content_hash) if shared_meshes is not None else None
+            if mesh is None:
+                vertex_data = geometry.vertex_data
+                mesh = build_mesh(f"{prefix}_Mesh_{number}", vertex_data.positions, geometry.triangles)
+                write_vertex_attributes(mesh, vertex_data, geometry.triangles)     # Normals, UVs, colours and tangents in bulk
+                mesh[CONTENT_HASH_PROPERTY] = geometry.content_hash
+                if shared_meshes is not None:
+                    shared_meshes[geometry.content_hash] = mesh
+
+            obj = bpy.data.objects.new(f"{prefix}_Object_{number}", mesh)
+            obj["openiv_lod"] = lod     # Same tag as the openFormat importer
+            collection.objects.link(obj)
+            yield obj
+
+def count_drawable_objects(drawable):
+    # Objects iter_drawable_objects makes for a drawable, without building them
+    return sum(1 for lod in drawable.lods for geometry in drawable.geometries(lod) if len(geometry.triangles))
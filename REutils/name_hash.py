@@ -0,0 +1,308 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Jenkins one-at-a-time ("joaat") name hashing as RAGE uses it
+#
+# Asset names are hashed case-insensitively: the lowercased name's bytes go
+# through Jenkins' one-at-a-time hash, giving the 32-bit keys found in dictionary
+# hash tables (WDD entries, WBD bounds, ...).
+#
+# Reverse lookups go through a NameTable: the hashes of a name list sorted into
+# one compact file that is mmapped and binary searched, so a 500k name dictionary
+# opens instantly instead of being re-hashed on every import.
+#
+# Name table layout on disk (little endian):
+#   0x00  char[4]  Magic         'JNHT'
+#   0x04  u32      Version       1
+#   0x08  u32      Count         Unique hashes
+#   0x0C  u32      Blob Size     Bytes of UTF-8 name data
+#   0x10  u32[Count]             Hashes, ascending
+#   ....  u32[Count + 1]         Name offsets into the blob
+#   ....  char[Blob Size]        Names, back to back
+#
+#   python -m BlenDR.REutils.name_hash compile <names.txt> [<table>]
+#   python -m BlenDR.REutils.name_hash lookup <names.txt or table> <hash or name> ...
+
+import os
+import sys
+import mmap
+import struct
+import argparse
+import numpy as np
+
+MASK_32 = 0xFFFFFFFF
+
+NAME_TABLE_MAGIC = b'JNHT'
+NAME_TABLE_VERSION = 1
+NAME_TABLE_HEADER = struct.Struct('<4sIII')     # Magic, version, count, blob size
+NAME_TABLE_EXTENSION = ".nametable"             # Compiled sidecar written next to a name list
+
+_open_tables = {}       # Absolute path -> (mtime_ns, size, NameTable), shared by every importer
+
+#######################################################
+def joaat(name):
+    value = 0
+    for byte in name.lower().encode('utf-8'):
+        value = (value + byte) & MASK_32
+        value = (value + (value << 10)) & MASK_32
+        value ^= value >> 6
+    value = (value + (value << 3)) & MASK_32
+    value ^= value >> 11
+    value = (value + (value << 15)) & MASK_32
+    return value
+#######################################################
+def joaat_many(names):
+    # Vectorised joaat over a whole name list -> uint32 array, one hash per name.
+    # Names are sorted longest first so each byte column only touches the
+    # names that are still running, a contiguous prefix of the sorted order.
+    encoded = [name.lower().encode('utf-8') for name in names]
+    count = len(encoded)
+    if count == 0:
+        return np.zeros(0, dtype=np.uint32)
+
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=count)
+    order = np.argsort(-lengths, kind='stable')
+    sorted_lengths = lengths[order]
+    starts = np.zeros(count, dtype=np.int64)
+    np.cumsum(sorted_lengths[:-1], out=starts[1:])
+    blob = np.frombuffer(b''.join([encoded[idx] for idx in order]), dtype=np.uint8)
+
+    values = np.zeros(count, dtype=np.uint32)
+    descending = -sorted_lengths
+    for column in range(int(sorted_lengths[0])):
+        running = int(np.searchsorted(descending, -column, side='left'))    # Names longer than column
+        value = values[:running]
+        value += blob[starts[:running] + column]
+        value += value << np.uint32(10)
+        value ^= value >> np.uint32(6)
+
+    values += values << np.uint32(3)
+    values ^= values >> np.uint32(11)
+    values += values << np.uint32(15)
+
+    hashes = np.empty(count, dtype=np.uint32)
+    hashes[order] = values
+    return hashes
+#######################################################
+def parse_hash_key(key):
+    # Entry selector -> 32-bit hash: ints pass through, '0x'-prefixed text is a literal hash, anything else is a name
+    if isinstance(key, int):
+        return key & MASK_32
+    key = key.strip()
+    if key.lower().startswith('0x'):
+        return int(key, 16) & MASK_32
+    return joaat(key)
+#######################################################
+def split_key_list(text):
+    # Comma/whitespace separated selector text from an operator field
+    return [key for key in text.replace(',', ' ').split() if key]
+#######################################################
+def read_name_list(filepath):
+    # One asset name per line; blank lines and '#' comments are skipped
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+#######################################################
+def build_name_table(names):
+    # Name list -> name table bytes. Duplicate hashes keep the first name listed
+    names = list(names)
+    hashes = joaat_many(names)
+    order = np.argsort(hashes, kind='stable')
+    sorted_hashes = hashes[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_hashes[1:] != sorted_hashes[:-1]
+    order = order[first]
+
+    encoded = [names[idx].encode('utf-8') for idx in order]
+    offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    offsets[1:] = np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+    blob = b''.join(encoded)
+
+    return b''.join((
+        NAME_TABLE_HEADER.pack(NAME_TABLE_MAGIC, NAME_TABLE_VERSION, len(encoded), len(blob)),
+        sorted_hashes[first].astype('<u4').tobytes(),
+        offsets.tobytes(),
+        blob,
+    ))
+#######################################################
+def write_name_table(names, filepath):
+    data = build_name_table(names)
+    temp_path = filepath + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, filepath)     # Readers never see a half written table
+    return filepath
+#######################################################
+def is_name_table(filepath):
+    with open(filepath, 'rb') as f:
+        return f.read(len(NAME_TABLE_MAGIC)) == NAME_TABLE_MAGIC
+
+
+#######################################################
+class NameTable:
+    # Sorted hash -> name table over a buffer (usually an mmap). Lookups binary
+    # search the hash column; names are decoded only when asked for.
+
+    def __init__(self, buffer, name="", mapped_file=None):
+        self.name = name
+        self._mapped_file = mapped_file
+
+        magic, version, count, blob_size = NAME_TABLE_HEADER.unpack_from(buffer, 0)
+        if magic != NAME_TABLE_MAGIC:
+            raise ValueError(f"{name or 'Buffer'} is not a name table.")
+        if version != NAME_TABLE_VERSION:
+            raise ValueError(f"Name table {name} is version {version}, expected {NAME_TABLE_VERSION}.")
+
+        hashes_start = NAME_TABLE_HEADER.size
+        offsets_start = hashes_start + 4 * count
+        blob_start = offsets_start + 4 * (count + 1)
+        if len(buffer) < blob_start + blob_size:
+            raise ValueError(f"Name table {name} is truncated.")
+
+        self.hashes = np.frombuffer(buffer, dtype='<u4', count=count, offset=hashes_start)
+        self.offsets = np.frombuffer(buffer, dtype='<u4', count=count + 1, offset=offsets_start)
+        self.blob = memoryview(buffer)[blob_start:blob_start + blob_size]
+
+    @classmethod
+    def open(cls, filepath):
+        with open(filepath, 'rb') as f:
+            mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            return cls(mapped_file, os.path.basename(filepath), mapped_file)
+        except Exception:
+            mapped_file.close()
+            raise
+
+    @classmethod
+    def from_names(cls, names, name=""):
+        return cls(build_name_table(names), name)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __contains__(self, value):
+        return self.index_of(value) is not None
+
+    def index_of(self, value):
+        value = np.uint32(value & MASK_32)     # A Python int would promote (copy) the whole column
+        idx = int(np.searchsorted(self.hashes, value))
+        if idx < len(self.hashes) and self.hashes[idx] == value:
+            return idx
+        return None
+
+    def name_at(self, idx):
+        return str(self.blob[self.offsets[idx]:self.offsets[idx + 1]], 'utf-8', 'replace')
+
+    def lookup(self, value, default=None):
+        idx = self.index_of(value)
+        return default if idx is None else self.name_at(idx)
+
+    def lookup_many(self, values, default=None):
+        # One searchsorted for the whole batch; unknown hashes map to default
+        values = np.asarray(values, dtype=np.uint32)
+        indices = np.minimum(np.searchsorted(self.hashes, values), max(len(self.hashes) - 1, 0))
+        found = self.hashes[indices] == values if len(self.hashes) else np.zeros(len(values), dtype=bool)
+        return [self.name_at(idx) if hit else default for idx, hit in zip(indices.tolist(), found.tolist())]
+
+    def close(self):
+        # numpy views keep the mapping alive until they are collected
+        self.hashes = self.offsets = None
+        self.blob.release()
+        if self._mapped_file is not None:
+            try:
+                self._mapped_file.close()
+            except BufferError:
+                pass
+            self._mapped_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+#######################################################
+def compiled_table_path(filepath):
+    return filepath + NAME_TABLE_EXTENSION
+#######################################################
+def compile_name_list(filepath, table_path=None):
+    # Hashes a text name list into a table next to it, skipped while the table is newer than the list
+    table_path = table_path or compiled_table_path(filepath)
+    if os.path.isfile(table_path) and os.path.getmtime(table_path) >= os.path.getmtime(filepath):
+        return table_path
+    return write_name_table(read_name_list(filepath), table_path)
+#######################################################
+def load_name_table(filepath):
+    # Name list or compiled table -> NameTable, opened once per process and shared by every importer.
+    # A text list is compiled on first use; where its folder is read-only the table is built in memory.
+    filepath = os.path.abspath(filepath)
+    info = os.stat(filepath)
+    cached = _open_tables.get(filepath)
+    if cached is not None:
+        if cached[:2] == (info.st_mtime_ns, info.st_size):
+            return cached[2]
+        cached[2].close()       # The file changed; drop the stale table's mapping before replacing it
+        del _open_tables[filepath]
+
+    if is_name_table(filepath):
+        table = NameTable.open(filepath)
+    else:
+        try:
+            table = NameTable.open(compile_name_list(filepath))
+        except OSError:
+            table = NameTable.from_names(read_name_list(filepath), os.path.basename(filepath))
+
+    _open_tables[filepath] = (info.st_mtime_ns, info.st_size, table)
+    return table
+#######################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile and query joaat name hash tables.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser("compile", help="Hash a name list (one name per line) into a name table")
+    compile_parser.add_argument("names", help="Text file of names")
+    compile_parser.add_argument("output", nargs="?", default=None, help=f"Table path, defaults to <names>{NAME_TABLE_EXTENSION}")
+
+    lookup_parser = commands.add_parser("lookup", help="Resolve hashes to names, or names to hashes")
+    lookup_parser.add_argument("table", help="Name table or name list")
+    lookup_parser.add_argument("keys", nargs="+", help="0x-prefixed hashes or names")
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        output = args.output or compiled_table_path(args.names)
+        write_name_table(read_name_list(args.names), output)
+        with NameTable.open(output) as table:
+            print(f"📦 Wrote {output} ({len(table)} names)")
+        return 0
+
+    table = load_name_table(args.table)
+    for key in args.keys:
+        value = parse_hash_key(key)
+        print(f"0x{value:08X}  {table.lookup(value, '<unknown>')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Persistent cache of parsed RAGE IV drawables
+#
+# A parsed .wdr/.wdd is stored under a key made of the file's content hash, the
+# LOD selection and RELib.IV.wdr.PARSER_VERSION, so edited files and parser
+# changes never hit a stale entry. Each entry is a directory holding:
+#
+#   meta.json     Drawable structure: block records, counts, names, array references
+#   arrays.bin    Every decoded vertex/index array back to back, 64-byte aligned
+#
+# On a hit arrays.bin is memory-mapped and the arrays are read-only views into it,
+# so re-importing a file skips inflating and decoding entirely. Entries are evicted
+# least recently used first once the directory grows past its size cap.
+#
+#   python -m BlenDR.REutils.resource_cache [--dir DIR] info|clear
+
+import os
+import sys
+import json
+import mmap
+import shutil
+import hashlib
+import argparse
+import numpy as np
+
+from ..RELib.IV.layouts import make_record
+from ..RELib.IV.vertex import VertexData
+from ..RELib.IV.wdr import LOD_HIGH, PARSER_VERSION, Drawable, DrawableModel, DrawableGeometry, read_wdr
+from ..RELib.IV.wdd import DrawableDictionary, read_wdd
+from .diagnostics import diagnostics as diag
+from .import_stats import NULL_STATS
+
+CACHE_FORMAT = 1                    # Bump when the entry layout below changes
+CACHE_DIR = os.environ.get("BLENDR_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "blendr")
+CACHE_MAX_BYTES = 2 << 30           # 2 GiB
+ARRAY_ALIGNMENT = 64
+
+META_FILE = "meta.json"
+ARRAYS_FILE = "arrays.bin"
+
+# VertexData attributes holding one array (or None); uvs is a list and handled on its own
+VERTEX_ARRAYS = ('positions', 'normals', 'colors', 'specular', 'blend_weights', 'blend_indices', 'tangents', 'binormals')
+
+_default_cache = None
+
+
+#######################################################
+def get_resource_cache():
+    # One cache per process, shared by every importer
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResourceCache()
+    return _default_cache
+#######################################################
+def hash_file(filepath):
+    content = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                content.update(mapped_file)
+    return content.hexdigest()
+#######################################################
+def encode_value(value):
+    # JSON has no bytes; padding/reserved fields round-trip as hex
+    return {'hex': value.hex()} if isinstance(value, bytes) else value
+#######################################################
+def decode_value(value):
+    return bytes.fromhex(value['hex']) if isinstance(value, dict) else value
+#######################################################
+def encode_record(record):
+    # BlockLayout records are namedtuples named after their layout
+    return {'layout': type(record).__name__, 'values': [encode_value(value) for value in record]}
+#######################################################
+def decode_record(data):
+    return make_record(data['layout'], [decode_value(value) for value in data['values']])
+
+
+#######################################################
+class ArrayWriter:
+    # Appends arrays to arrays.bin and hands back their index in the entry's array table.
+    # Arrays shared between geometries (deduplicated buffers) are written once.
+
+    def __init__(self, f):
+        self.f = f
+        self.specs = []
+        self._written = {}      # id(array) -> index
+        self._arrays = []       # Held so ids stay unique until the entry is written
+
+    def add(self, array):
+        if array is None:
+            return None
+        index = self._written.get(id(array))
+        if index is not None:
+            return index
+
+        offset = -(-self.f.tell() // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+        self.f.write(bytes(offset - self.f.tell()))
+        self.f.write(np.ascontiguousarray(array).data)
+
+        index = len(self.specs)
+        self.specs.append({'offset': offset, 'dtype': np.lib.format.dtype_to_descr(array.dtype), 'shape': list(array.shape)})
+        self._written[id(array)] = index
+        self._arrays.append(array)
+        return index
+
+
+#######################################################
+class ResourceCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._digests = {}      # (path, size, mtime) -> content hash, skips rehashing unchanged files
+
+    def entry_path(self, filepath, kind, lod):
+        info = os.stat(filepath)
+        source = (os.path.abspath(filepath), info.st_size, info.st_mtime_ns)
+        digest = self._digests.get(source)
+        if digest is None:
+            digest = self._digests[source] = hash_file(filepath)
+        return os.path.join(self.directory, f"{digest}-{kind}-{lod.lower()}-p{PARSER_VERSION}-f{CACHE_FORMAT}")
+
+    #######################################################
+    def read_wdr(self, filepath, stats=NULL_STATS, lod=LOD_HIGH, progress=None):
+        # Same result as RELib.IV.wdr.read_wdr; parsed and stored on a miss
+        with stats.stage('cache_lookup'):
+            entry = self.entry_path(filepath, "wdr", lod)
+            meta, arrays = self.load(entry)
+        if meta is not None:
+            stats.count('cache_hits')
+            drawable = self.restore_drawable(meta['drawables'][0], arrays, stats)
+            drawable.name = os.path.basename(filepath)
+            return drawable
+
+        stats.count('cache_misses')
+        drawable = read_wdr(filepath, stats, lod, progress)
+        with stats.stage('cache_store'):
+            self.store(entry, {'kind': "wdr", 'source': os.path.basename(filepath)}, [drawable])
+        return drawable
+
+    def read_wdd(self, filepath, stats=NULL_STATS, lod=LOD_HIGH, jobs=1, select=None, names=(), lazy=False, progress=None):
+        # Same result as RELib.IV.wdd.read_wdd. Only whole dictionaries are stored, but a
+        # cached one serves any selection, and entry names are re-resolved on every read.
+        with stats.stage('cache_lookup'):
+            entry = self.entry_path(filepath, "wdd", lod)
+            meta, arrays = self.load(entry)
+        if meta is None:
+            stats.count('cache_misses')
+            dictionary = read_wdd(filepath, stats, lod, jobs, select, names, lazy, progress)
+            if select is None:
+                with stats.stage('cache_store'):
+                    self.store(entry, {
+                        'kind': "wdd",
+                        'source': os.path.basename(filepath),
+                        'header': {key: encode_value(value) for key, value in dictionary.header.items()},
+                        'hashes': dictionary.hashes,
+                        'wdr_offsets': dictionary.wdr_offsets,
+                        'errors': dictionary.errors,
+                    }, dictionary.drawables)
+            return dictionary
+
+        stats.count('cache_hits')
+        name = os.path.basename(filepath)
+        header = {key: decode_value(value) for key, value in meta['header'].items()}
+        dictionary = DrawableDictionary(name, header, meta['hashes'], meta['wdr_offsets'])
+        dictionary.name_entries(os.path.splitext(name)[0], names)
+        dictionary.errors = {int(idx): error for idx, error in meta['errors'].items()}
+
+        selected = dictionary.select(select) if select is not None else range(len(dictionary.wdr_offsets))
+        dictionary.drawables = [None] * len(dictionary.wdr_offsets)
+        for done, idx in enumerate(selected, 1):
+            data = meta['drawables'][idx]
+            if data is not None:
+                drawable = dictionary.drawables[idx] = self.restore_drawable(data, arrays, stats)
+                drawable.name = dictionary.entry_names[idx]
+                stats.count('drawables')
+            if progress is not None:
+                progress(done, len(selected))
+        return dictionary
+
+    #######################################################
+    def load(self, entry):
+        # (meta, arrays.bin memmap) for a stored entry, (None, None) on a miss or an unreadable entry
+        meta_path = os.path.join(entry, META_FILE)
+        if not os.path.isfile(meta_path):
+            return None, None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            arrays_path = os.path.join(entry, ARRAYS_FILE)
+            arrays = np.memmap(arrays_path, dtype=np.uint8, mode='r') if os.path.getsize(arrays_path) else np.zeros(0, dtype=np.uint8)
+            os.utime(meta_path)     # Marks the entry as recently used
+        except (OSError, ValueError, KeyError) as e:
+            diag.error("⚠️ Discarding unreadable cache entry {}: {}", entry, e)
+            shutil.rmtree(entry, ignore_errors=True)
+            return None, None
+        arrays = [self.array_view(arrays, spec) for spec in meta['arrays']]
+        return meta, arrays
+
+    @staticmethod
+    def array_view(arrays, spec):
+        dtype = np.lib.format.descr_to_dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        offset = spec['offset']
+        return arrays[offset:offset + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+
+    def restore_drawable(self, data, arrays, stats=NULL_STATS):
+        def array(index):
+            return arrays[index] if index is not None else None
+
+        models = []
+        for model in data['models']:
+            geometries = []
+            for geometry in model['geometries']:
+                vertex = geometry['vertex_data']
+                vertex_data = VertexData(
+                    vertex['count'],
+                    uvs=[arrays[index] for index in vertex['uvs']],
+                    **{attribute: array(vertex[attribute]) for attribute in VERTEX_ARRAYS}
+                )
+                triangles = arrays[geometry['triangles']]
+                geometries.append(DrawableGeometry(
+                    geometry['index'],
+                    decode_record(geometry['record']),
+                    decode_record(geometry['vertex_buffer']),
+                    decode_record(geometry['index_buffer']),
+                    decode_record(geometry['declaration']),
+                    vertex_data,
+                    triangles,
+                    geometry['index_size'],
+                    geometry['content_hash'],
+                ))
+                stats.count('geometries')
+                stats.count('vertices', vertex_data.count)
+                stats.count('triangles', len(triangles))
+            models.append(DrawableModel(model['index'], decode_record(model['record']), geometries, model['lod']))
+        return Drawable(data['name'], decode_record(data['header']), models)
+
+    #######################################################
+    def store(self, entry, meta, drawables):
+        # Written to a scratch directory and renamed into place, so readers never see half an entry.
+        # A full disk or read-only cache only costs the caching, never the import.
+        scratch = f"{entry}.tmp{os.getpid()}"
+        try:
+            os.makedirs(scratch, exist_ok=True)
+            with open(os.path.join(scratch, ARRAYS_FILE), 'wb') as f:
+                writer = ArrayWriter(f)
+                meta['drawables'] = [self.describe_drawable(drawable, writer) if drawable is not None else None for drawable in drawables]
+                meta['arrays'] = writer.specs
+            meta['parser_version'] = PARSER_VERSION
+            meta['format'] = CACHE_FORMAT
+            with open(os.path.join(scratch, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, separators=(',', ':'))
+            os.replace(scratch, entry)
+        except OSError as e:
+            diag.error("⚠️ Could not cache {}: {}", meta.get('source', entry), e)
+            shutil.rmtree(scratch, ignore_errors=True)
+            return False
+
+        self.evict(keep=entry)
+        return True
+
+    @staticmethod
+    def describe_drawable(drawable, writer):
+        return {
+            'name': drawable.name,
+            'header': encode_record(drawable.header),
+            'models': [{
+                'index': model.index,
+                'lod': model.lod,
+                'record': encode_record(model.record),
+                'geometries': [{
+                    'index': geometry.index,
+                    'record': encode_record(geometry.record),
+                    'vertex_buffer': encode_record(geometry.vertex_buffer),
+                    'index_buffer': encode_record(geometry.index_buffer),
+                    'declaration': encode_record(geometry.declaration),
+                    'index_size': geometry.index_size,
+                    'content_hash': geometry.content_hash,
+                    'triangles': writer.add(geometry.triangles),
+                    'vertex_data': {
+                        'count': geometry.vertex_data.count,
+                        'uvs': [writer.add(uvs) for uvs in geometry.vertex_data.uvs],
+                        **{attribute: writer.add(getattr(geometry.vertex_data, attribute)) for attribute in VERTEX_ARRAYS},
+                    },
+                } for geometry in model.geometries],
+            } for model in drawable.models],
+        }
+
+    #######################################################
+    def entries(self):
+        # [(last used, bytes, path), ...] for every complete entry
+        found = []
+        if not os.path.isdir(self.directory):
+            return found
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            meta_path = os.path.join(entry, META_FILE)
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, filename)) for filename in os.listdir(entry))
+                found.append((os.path.getmtime(meta_path), size, entry))
+            except OSError:
+                continue    # Scratch directory of an interrupted store, or removed meanwhile
+        return found
+
+    def evict(self, keep=None):
+        # Least recently used entries go first until the cache fits its cap again
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            try:
+                shutil.rmtree(entry)
+            except OSError:
+                continue    # Still mapped by an open import on Windows; retried on the next store
+            total -= size
+        return total
+
+    def clear(self):
+        for _, _, entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
+#######################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the BlenDR parsed resource cache.")
+    parser.add_argument("command", choices=("info", "clear"))
+    parser.add_argument("--dir", default=CACHE_DIR, help=f"Cache directory (default {CACHE_DIR})")
+    args = parser.parse_args(argv)
+
+    cache = ResourceCache(args.dir)
+    entries = cache.entries()
+    if args.command == "clear":
+        cache.clear()
+        print(f"🧹 Removed {len(entries)} cache entries from {args.dir}")
+    else:
+        print(f"📦 {args.dir}: {len(entries)} entries, {sum(size for _, size, _ in entries) / (1024 * 1024):.1f} MiB (cap {cache.max_bytes / (1024 * 1024):.0f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
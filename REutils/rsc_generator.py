@@ -0,0 +1,314 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#      *     *       *                 *       *       *         *    #
+#  *      //   ) )      *        *       //    ) ) //   ) )           #
+#        //___/ /  //  ___   *    __ *  //    / / //___/ /     *      #
+#   *   / __  (   // //___) ) //   ) ) //    / / / ___ (              #
+#      //    ) ) // //       //   / / //    / / //   | |   *      *   #
+#     //____/ / // ((____   //   / / //____/ / //    | |              #
+# BlenDR - Blender scripts to work with R* RAGE/openFormat file types #
+# 2024 - 2025 SpicyBung                                               #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Synthetic RSC5 drawable generator (.wdr / .wdd)
+#
+# Builds structurally valid RAGE IV drawables from the same BlockLayouts the
+# parser reads, so parser changes can be exercised and benchmarked without game
+# data. Each geometry is a flat grid of quads (two triangles per cell) whose
+# vertex layout follows the vertex declaration for the chosen stride.
+#
+#   python -m BlenDR.REutils.rsc_generator wdr out.wdr --geometries 4 --vertices 20000 --stride 52
+#   python -m BlenDR.REutils.rsc_generator wdd out.wdd --entries 16 --vertices 5000 --no-compress
+#   python -m BlenDR.REutils.rsc_generator img out.img --files a.wdr b.wdd
+
+import os
+import sys
+import zlib
+import struct
+import argparse
+import numpy as np
+
+from ..RELib.IV.rsc import RSC_MAGIC, RSC_HEADER, POINTER_SYSTEM, POINTER_GRAPHICS, POINTER_OFFSET_MASK, get_rsc_flags, read_rsc_header
+from ..RELib.IV.img import IMG_MAGIC, IMG_VERSION, IMG_BLOCK_SIZE, IMG_HEADER, IMG_ENTRY
+from ..RELib.IV.vertex import build_vertex_dtype
+from ..RELib.IV.indices import PRIMITIVE_TRIANGLE_LIST
+from ..RELib.IV.wdr import LOD_NAMES
+from .name_hash import joaat, split_key_list
+from ..RELib.IV.layouts import (
+    WDR_HEADER,
+    MODEL_COLLECTION,
+    MODEL,
+    GEOMETRY,
+    VERTEX_BUFFER,
+    INDEX_BUFFER,
+    VERTEX_DECLARATION
+)
+
+RSC_FILE_TYPE = 0x05
+RSC_VERSION_DRAWABLE = 110
+
+SYNTHETIC_VTABLE = 0     # vtables are replaced by the game when it loads a resource; the parser never reads them
+WDD_HEADER = struct.Struct('<IIIIIHHIHHI12s')    # pgDictionary<gtaDrawable>, 0x30 bytes
+
+# Usage flags of the declarations the known strides are built from (see vertex.STRIDE_DTYPES)
+STRIDE_USAGE_FLAGS = {
+    28: 0x0071,     # position, color, specular, uv0
+    36: 0x0059,     # position, normal, color, uv0
+    44: 0x005F,     # position, blend weights, blend indices, normal, color, uv0
+    52: 0x4059,     # position, normal, color, uv0, tangent
+    60: 0x405F,     # position, blend weights, blend indices, normal, color, uv0, tangent
+    68: 0x40DF,     # position, blend weights, blend indices, normal, color, uv0, uv1, tangent
+}
+
+MAX_VERTICES = 0xFFFF   # VertexBuffer vertex count is a u16
+
+
+#######################################################
+class SegmentBuilder:
+    # Append-only segment with aligned allocations; hands back raw 0x5/0x6 pointers
+    def __init__(self, pointer_nibble):
+        self.pointer_nibble = pointer_nibble
+        self.data = bytearray()
+
+    def allocate(self, size, alignment=16):
+        offset = -(-len(self.data) // alignment) * alignment
+        self.data.extend(bytes(offset + size - len(self.data)))
+        return offset
+
+    def pointer(self, offset):
+        if offset > POINTER_OFFSET_MASK:
+            raise ValueError(f"Segment offset 0x{offset:X} does not fit a 28-bit resource pointer; generate fewer or smaller drawables.")
+        return (self.pointer_nibble << 28) | offset
+
+    def write_block(self, layout, **values):
+        offset = self.allocate(layout.size)
+        layout.pack_into(self.data, offset, **values)
+        return self.pointer(offset)
+
+    def write_bytes(self, payload, alignment=16):
+        offset = self.allocate(len(payload), alignment)
+        self.data[offset:offset + len(payload)] = payload
+        return self.pointer(offset)
+
+
+#######################################################
+def build_grid_geometry(vertex_count, stride, offset=(0.0, 0.0, 0.0), seed=0):
+    # Returns (vertex bytes, index bytes, triangle count) for a grid of vertex_count vertices
+    if not 3 <= vertex_count <= MAX_VERTICES:
+        raise ValueError(f"Vertex count must be between 3 and {MAX_VERTICES}, got {vertex_count}.")
+
+    vertex_dtype = build_vertex_dtype(STRIDE_USAGE_FLAGS[stride], stride)
+    columns = max(2, int(np.ceil(np.sqrt(vertex_count))))
+    rows = -(-vertex_count // columns)
+
+    grid = np.arange(vertex_count)
+    x = (grid % columns).astype(np.float32)
+    y = (grid // columns).astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    vertices = np.zeros(vertex_count, dtype=vertex_dtype)
+    vertices['position'] = np.column_stack((x + offset[0], y + offset[1], rng.random(vertex_count, dtype=np.float32) * 0.1 + offset[2]))
+
+    names = vertex_dtype.names
+    if 'normal' in names:
+        vertices['normal'] = (0.0, 0.0, 1.0)
+    if 'color' in names:
+        vertices['color'] = rng.integers(0, 256, (vertex_count, 4), dtype=np.uint8)
+    if 'specular' in names:
+        vertices['specular'] = rng.integers(0, 256, (vertex_count, 4), dtype=np.uint8)
+    if 'blend_weights' in names:
+        vertices['blend_weights'] = (255, 0, 0, 0)
+    for name in names:
+        if name.startswith('uv'):
+            vertices[name] = np.column_stack((x / max(columns - 1, 1), y / max(rows - 1, 1)))
+    if 'tangent' in names:
+        vertices['tangent'] = (1.0, 0.0, 0.0, 1.0)
+
+    # Two triangles per complete grid cell
+    cell_x, cell_y = np.meshgrid(np.arange(columns - 1), np.arange(rows - 1))
+    corner = (cell_y * columns + cell_x).ravel()
+    quads = np.column_stack((corner, corner + 1, corner + columns, corner + columns + 1))
+    quads = quads[quads[:, 3] < vertex_count]
+    triangles = np.concatenate((quads[:, [0, 1, 2]], quads[:, [1, 3, 2]])).astype('<u2')
+
+    return vertices.tobytes(), triangles.tobytes(), len(triangles)
+#######################################################
+def write_model(system, graphics, declaration_ptr, geometry_count, vertex_count, stride, y_offset=0.0, seed=0):
+    # Writes one model and its geometries; returns the model's 0x5 pointer
+    geometry_ptrs = []
+    for geometry_index in range(geometry_count):
+        vertex_bytes, index_bytes, triangle_count = build_grid_geometry(vertex_count, stride, (geometry_index * 1000.0, y_offset, 0.0), seed + geometry_index)
+        vertex_data_ptr = graphics.write_bytes(vertex_bytes)
+        index_data_ptr = graphics.write_bytes(index_bytes)
+
+        vertex_buffer_ptr = system.write_block(
+            VERTEX_BUFFER,
+            vertex_count=vertex_count, data_ptr1=vertex_data_ptr, stride=stride, decl_ptr=declaration_ptr, data_ptr2=vertex_data_ptr
+        )
+        index_buffer_ptr = system.write_block(INDEX_BUFFER, index_count=triangle_count * 3, data_ptr=index_data_ptr, padding=b'')
+        geometry_ptrs.append(system.write_block(
+            GEOMETRY,
+            vertex_buffer_ptr=vertex_buffer_ptr, index_buffer_ptr=index_buffer_ptr,
+            index_count=triangle_count * 3, face_count=triangle_count, vertex_count=vertex_count,
+            primitive_type=PRIMITIVE_TRIANGLE_LIST, vertex_stride=stride
+        ))
+
+    geometry_array_ptr = system.write_bytes(struct.pack(f'<{geometry_count}I', *geometry_ptrs))
+    return system.write_block(
+        MODEL,
+        geometry_collection_ptr=geometry_array_ptr, number_of_geo_ptrs=geometry_count,
+        number_of_geometries=geometry_count, geometry_count=geometry_count
+    )
+#######################################################
+def write_model_collection(system, graphics, declaration_ptr, model_count, geometry_count, vertex_count, stride, seed=0):
+    # Models are stacked along Y so they stay apart when imported together; returns the collection's 0x5 pointer
+    extent = float(max(2, int(np.ceil(np.sqrt(vertex_count)))))
+    model_ptrs = [
+        write_model(system, graphics, declaration_ptr, geometry_count, vertex_count, stride, model_index * (extent + 1.0), seed + model_index * 10)
+        for model_index in range(model_count)
+    ]
+    model_array_ptr = system.write_bytes(struct.pack(f'<{model_count}I', *model_ptrs))
+    return system.write_block(MODEL_COLLECTION, model_array_ptr=model_array_ptr, model_count=model_count, model_capacity=model_count)
+#######################################################
+def write_drawable(system, graphics, geometry_count, vertex_count, stride, seed=0, model_count=1, lod_count=1):
+    # Lays one gtaDrawable out in the segments; returns the header's offset in the system segment.
+    # Each LOD below high gets a quarter of the vertices of the one above it.
+    if not 1 <= lod_count <= len(LOD_NAMES):
+        raise ValueError(f"LOD count must be between 1 and {len(LOD_NAMES)}, got {lod_count}.")
+
+    header_offset = system.allocate(WDR_HEADER.size)
+
+    declaration_ptr = system.write_block(VERTEX_DECLARATION, usage_flags=STRIDE_USAGE_FLAGS[stride], stride=stride)
+
+    lod_ptrs = [
+        write_model_collection(system, graphics, declaration_ptr, model_count, geometry_count, max(9, vertex_count >> (2 * lod)), stride, seed + lod * 1000)
+        for lod in range(lod_count)
+    ]
+    lod_ptrs += [0] * (len(LOD_NAMES) - lod_count)
+
+    extent = float(max(2, int(np.ceil(np.sqrt(vertex_count)))))
+
+    WDR_HEADER.pack_into(
+        system.data, header_offset,
+        vtable=SYNTHETIC_VTABLE, block_map_ptr=WDR_HEADER.size,
+        center_x=extent / 2, center_y=extent / 2,
+        min_x=0.0, min_y=0.0, min_z=0.0,
+        max_x=(geometry_count - 1) * 1000.0 + extent, max_y=model_count * (extent + 1.0) - 1.0, max_z=0.1,
+        max_vector_x=extent, max_vector_y=extent, max_vector_z=0.1,
+        model_collection_ptr=lod_ptrs[0], lod1_ptr=lod_ptrs[1], lod2_ptr=lod_ptrs[2], lod3_ptr=lod_ptrs[3],
+        object_count=model_count, reserved=b''
+    )
+    return header_offset
+#######################################################
+def pack_resource(system, graphics, compress=True):
+    flags, system_size, graphics_size = get_rsc_flags(len(system.data), max(len(graphics.data), 1))
+    payload = bytes(system.data).ljust(system_size, b'\0') + bytes(graphics.data).ljust(graphics_size, b'\0')
+    if compress:
+        payload = zlib.compress(payload, 9)    # IV resources use best compression
+    return RSC_HEADER.pack(RSC_MAGIC, RSC_FILE_TYPE, RSC_VERSION_DRAWABLE, flags) + payload
+#######################################################
+def build_wdr(geometry_count=1, vertex_count=1024, stride=36, compress=True, seed=0, model_count=1, lod_count=1):
+    system = SegmentBuilder(POINTER_SYSTEM)
+    graphics = SegmentBuilder(POINTER_GRAPHICS)
+    write_drawable(system, graphics, geometry_count, vertex_count, stride, seed, model_count, lod_count)
+    return pack_resource(system, graphics, compress)
+#######################################################
+def build_wdd(entry_count=4, geometry_count=1, vertex_count=1024, stride=36, compress=True, seed=0, hashes=None, model_count=1, lod_count=1, unique_entries=None):
+    # unique_entries < entry_count repeats byte-identical drawables, like props shared across a dictionary
+    system = SegmentBuilder(POINTER_SYSTEM)
+    graphics = SegmentBuilder(POINTER_GRAPHICS)
+
+    # Given hashes label the first entries; the rest get placeholder hashes
+    hashes = list(hashes or ())[:entry_count]
+    hashes += [0x10000000 + entry for entry in range(len(hashes), entry_count)]
+    header_offset = system.allocate(WDD_HEADER.size)
+    hash_array_ptr = system.write_bytes(struct.pack(f'<{entry_count}I', *hashes))
+    pointer_array_offset = system.allocate(4 * entry_count)
+
+    for entry in range(entry_count):
+        drawable_offset = write_drawable(system, graphics, geometry_count, vertex_count, stride, seed + (entry % (unique_entries or entry_count)) * 100, model_count, lod_count)
+        struct.pack_into('<I', system.data, pointer_array_offset + 4 * entry, system.pointer(drawable_offset))
+
+    WDD_HEADER.pack_into(
+        system.data, header_offset,
+        SYNTHETIC_VTABLE, 0, 0, 1,
+        hash_array_ptr, entry_count, entry_count,
+        system.pointer(pointer_array_offset), entry_count, entry_count,
+        0, b'\xCD' * 12
+    )
+    return pack_resource(system, graphics, compress)
+#######################################################
+def build_img(files):
+    # files: [(name, bytes), ...] -> IMG v3 archive, every entry block aligned. RSC entries carry
+    # their flags and version in the table the way the game's archives do.
+    names = b''.join(name.encode('utf-8') + b'\0' for name, _ in files)
+    table_size = len(files) * IMG_ENTRY.size + len(names)
+    data_start = -(-(IMG_HEADER.size + table_size) // IMG_BLOCK_SIZE) * IMG_BLOCK_SIZE
+
+    table = bytearray()
+    body = bytearray()
+    for name, content in files:
+        if content[:len(RSC_MAGIC)] == RSC_MAGIC:
+            header = read_rsc_header(content)
+            item_size, resource_type = header['flags'], header['version']
+        else:
+            item_size, resource_type = len(content), 0
+        used_blocks = -(-len(content) // IMG_BLOCK_SIZE)
+        padding = used_blocks * IMG_BLOCK_SIZE - len(content)
+        table += IMG_ENTRY.pack(item_size, resource_type, (data_start + len(body)) // IMG_BLOCK_SIZE, used_blocks, padding)
+        body += content + bytes(padding)
+
+    header = IMG_HEADER.pack(IMG_MAGIC, IMG_VERSION, len(files), table_size, IMG_ENTRY.size, 0)
+    return (header + table + names).ljust(data_start, b'\0') + body
+#######################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic RAGE IV RSC5 drawables.")
+    parser.add_argument("kind", choices=("wdr", "wdd", "img"))
+    parser.add_argument("output")
+    parser.add_argument("--entries", type=int, default=4, help="Drawables in a .wdd")
+    parser.add_argument("--lods", type=int, default=1, help="LODs per drawable, high first (1 - 4)")
+    parser.add_argument("--models", type=int, default=1, help="Models per LOD")
+    parser.add_argument("--names", default=None, help="Comma-separated entry names for a .wdd; hashed into its table with joaat")
+    parser.add_argument("--unique", type=int, default=None, help="Distinct drawables in a .wdd; entries beyond repeat them")
+    parser.add_argument("--geometries", type=int, default=1, help="Geometries per model")
+    parser.add_argument("--vertices", type=int, default=1024, help="Vertices per geometry")
+    parser.add_argument("--stride", type=int, default=36, choices=sorted(STRIDE_USAGE_FLAGS))
+    parser.add_argument("--no-compress", action="store_true", help="Store the payload raw instead of zlib")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--files", nargs="+", default=(), help="Files to pack into an .img")
+    args = parser.parse_args(argv)
+
+    if args.kind == "img":
+        files = []
+        for filepath in args.files:
+            with open(filepath, 'rb') as f:
+                files.append((os.path.basename(filepath), f.read()))
+        data = build_img(files)
+    elif args.kind == "wdr":
+        data = build_wdr(args.geometries, args.vertices, args.stride, not args.no_compress, args.seed, args.models, args.lods)
+    else:
+        hashes = [joaat(name) for name in split_key_list(args.names)] if args.names else None
+        data = build_wdd(
+            args.entries, args.geometries, args.vertices, args.stride, not args.no_compress, args.seed, hashes,
+            model_count=args.models, lod_count=args.lods, unique_entries=args.unique
+        )
+
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print(f"📦 Wrote {args.output} ({len(data)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,69 +31,16 @@ bl_info = {
     "category": "Import-Export"
 }
 
-import bpy
-
-from bpy.types import Menu
-
-from .REops import wdd_importer, wdr_importer
-from .oFOps import import_iv_mesh_odr, export_iv_mesh_odr
-
-
-class BLENDR_MT_import(Menu):
-    bl_idname = "BLENDR_MT_import"
-    bl_label = "BlenDR"
-
-    def draw(self, context):
-        layout = self.layout
-        layout.operator(wdr_importer.IMPORT_OT_wdr_reader.bl_idname, text="RAGE IV Drawable (.wdr)")
-        layout.operator(wdd_importer.IMPORT_OT_wdd_importer.bl_idname, text="RAGE IV Drawable Dictionary (.wdd)")
-        layout.separator()
-        layout.operator(import_iv_mesh_odr.ImportOpenIVFormats.bl_idname, text="OpenIV openFormats (.odr/.mesh)")
-
-
-class BLENDR_MT_export(Menu):
-    bl_idname = "BLENDR_MT_export"
-    bl_label = "BlenDR"
-
-    def draw(self, context):
-        self.layout.operator(export_iv_mesh_odr.ExportODR.bl_idname, text="OpenIV openFormat Drawable (.odr)")
-
-
-classes = (
-    BLENDR_MT_import,
-    BLENDR_MT_export,
-)
-
-
-def draw_import_menu(self, context):
-    self.layout.menu(BLENDR_MT_import.bl_idname, text="BlenDR")
-
-
-def draw_export_menu(self, context):
-    self.layout.menu(BLENDR_MT_export.bl_idname, text="BlenDR")
+# Blender-facing modules (REops, oFOps, REutils.mesh_builder) are only imported
+# from register(), so RELib, oFLib and the rest of REutils can be used as a plain
+# Python package outside Blender.
 
 
 def register():
-    wdr_importer.register()
-    wdd_importer.register()
-    import_iv_mesh_odr.register()
-    export_iv_mesh_odr.register()
-
-    for cls in classes:
-        bpy.utils.register_class(cls)
-
-    bpy.types.TOPBAR_MT_file_import.append(draw_import_menu)
-    bpy.types.TOPBAR_MT_file_export.append(draw_export_menu)
+    from .REops import menus
+    menus.register()
 
 
 def unregister():
-    bpy.types.TOPBAR_MT_file_export.remove(draw_export_menu)
-    bpy.types.TOPBAR_MT_file_import.remove(draw_import_menu)
-
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
-
-    export_iv_mesh_odr.unregister()
-    import_iv_mesh_odr.unregister()
-    wdd_importer.unregister()
-    wdr_importer.unregister()
+    from .REops import menus
+    menus.unregister()
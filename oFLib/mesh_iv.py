@@ -21,6 +21,167 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# OpenIV openFormat .mesh reader (plain Python, no bpy)
+#
+# Returns vertices as (x, y, z) tuples, faces as (a, b, c) tuples and the
+# material names referenced by the mesh.
+
 import os
-import bpy
-import struct 
\ No newline at end of file
+import numpy as np
+
+MATERIAL_NAME_LIMIT = 20    # Older OpenIV-friendly material name length
+
+#######################################################
+def parse_mesh_file(filepath, material_name_limit=None):
+    vertices = []
+    faces = []
+    materials = []
+    reading_vertices = False
+    reading_faces = False
+
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
+        lines = file.readlines()
+
+    if not lines or not lines[0].strip().startswith("Version"):
+        raise ValueError("Unsupported .mesh file. Missing Version line.")
+
+    for line in lines[1:]:
+        stripped_line = line.strip()
+
+        if not stripped_line:
+            continue
+
+        if stripped_line.startswith("Verts"):
+            reading_vertices = True
+            reading_faces = False
+            continue
+
+        if stripped_line.startswith("Idx"):
+            reading_faces = True
+            reading_vertices = False
+            continue
+
+        if stripped_line.startswith("Material"):
+            material_name = read_mesh_material_name(stripped_line, material_name_limit)
+            if material_name:
+                materials.append(material_name)
+            continue
+
+        if stripped_line == "}":
+            reading_vertices = False
+            reading_faces = False
+            continue
+
+        if reading_vertices:
+            vertex = read_mesh_vertex(stripped_line)
+            if vertex:
+                vertices.append(vertex)
+            continue
+
+        if reading_faces:
+            face = read_mesh_face(stripped_line)
+            if face:
+                faces.append(face)
+
+    return vertices, faces, materials
+#######################################################
+def read_mesh_vertex(line):
+    position_text = line.split('/', 1)[0].strip()
+    parts = position_text.split()
+
+    if len(parts) < 3:
+        return None
+
+    try:
+        return (float(parts[0]), float(parts[1]), float(parts[2]))
+    except ValueError:
+        return None
+#######################################################
+def read_mesh_face(line):
+    face_indices = []
+
+    for part in line.replace(',', ' ').split():
+        try:
+            face_indices.append(int(part))
+        except ValueError:
+            pass
+
+    if len(face_indices) >= 3:
+        return (face_indices[0], face_indices[1], face_indices[2])
+
+    return None
+#######################################################
+def read_mesh_material_name(line, material_name_limit=None):
+    parts = line.split()
+    if len(parts) < 2:
+        return None
+
+    material_name = os.path.splitext(os.path.basename(parts[1].replace('\\', os.sep)))[0]
+    return clean_material_name(material_name, material_name_limit)
+#######################################################
+def clean_material_name(material_name, material_name_limit=None):
+    if not material_name:
+        material_name = "default_material"
+    if material_name_limit:
+        material_name = material_name[:material_name_limit]
+    return material_name
+#######################################################
+def ensure_valid_vertices(vertices):
+    valid_vertices = [vertex for vertex in vertices if is_valid_vertex(vertex)]
+
+    if not valid_vertices:
+        return [(0.0, 0.0, 0.0)]
+
+    for index, vertex in enumerate(vertices):
+        if not is_valid_vertex(vertex):
+            nearest_valid = valid_vertices[-1]
+            vertices[index] = (nearest_valid[0] + 0.1, nearest_valid[1] + 0.1, nearest_valid[2] + 0.1)
+
+    return vertices
+#######################################################
+def ensure_valid_faces(faces, vertex_count):
+    valid_faces = [face for face in faces if is_valid_face(face, vertex_count)]
+
+    if not valid_faces:
+        if vertex_count >= 3:
+            return [(0, 1, 2)]
+        return []
+
+    for index, face in enumerate(faces):
+        if not is_valid_face(face, vertex_count):
+            faces[index] = valid_faces[-1]
+
+    return faces
+#######################################################
+def is_valid_vertex(vertex):
+    return isinstance(vertex, tuple) and len(vertex) == 3 and all(isinstance(coord, float) for coord in vertex)
+#######################################################
+def is_valid_face(face, vertex_count):
+    return isinstance(face, tuple) and len(face) >= 3 and all(isinstance(index, int) and 0 <= index < vertex_count for index in face[:3])
+#######################################################
+def write_mesh_file(filepath, positions, triangles, normals=None, uvs=None, materials=(), version="11 13"):
+    # Vertex lines are "x y z[ / nx ny nz][ / u v]"; the importer only reads up to the first '/'
+    columns = [np.asarray(positions, dtype=np.float32).reshape(-1, 3)]
+    vertex_format = "%.6f %.6f %.6f"
+    if normals is not None:
+        columns.append(np.asarray(normals, dtype=np.float32).reshape(-1, 3))
+        vertex_format += " / %.6f %.6f %.6f"
+    if uvs is not None:
+        columns.append(np.asarray(uvs, dtype=np.float32).reshape(-1, 2))
+        vertex_format += " / %.6f %.6f"
+
+    vertices = np.hstack(columns) if len(columns) > 1 else columns[0]
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+    with open(filepath, 'w', encoding='utf-8', newline='\r\n') as file:
+        file.write(f"Version {version}\n")
+        for material in materials:
+            file.write(f"Material {material}\n")
+
+        file.write("Verts {\n")
+        np.savetxt(file, vertices, fmt="    " + vertex_format)
+        file.write("}\n")
+
+        file.write("Idx {\n")
+        np.savetxt(file, triangles, fmt="    %d %d %d")
+        file.write("}\n")
@@ -21,6 +21,183 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# OpenIV openFormat .odr reader (plain Python, no bpy)
+#
+# Returns a dict with the version, shader records, LOD mesh references,
+# bounding box, center and radius, as the openFormat importer consumes it.
+
 import os
-import bpy
-import struct 
\ No newline at end of file
+
+from .mesh_iv import clean_material_name
+
+LOD_ORDER = ("high", "med", "low", "vlow")
+LOD_SUFFIXES = ("_high", "_med", "_low", "_vlow")
+
+#######################################################
+def parse_odr_file(filepath, material_name_limit=None):
+    data = empty_odr_data()
+    current_shader = None
+
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
+        for line in file:
+            line = line.strip()
+
+            if not line:
+                continue
+
+            if line.startswith("Version"):
+                parts = line.split()
+                data["version"] = parts[1] if len(parts) > 1 else None
+                continue
+
+            if line.startswith("Shaders"):
+                continue
+
+            if line.startswith("{"):
+                current_shader = {}
+                continue
+
+            if line.startswith("}"):
+                if current_shader:
+                    data["shaders"].append(current_shader)
+                current_shader = None
+                continue
+
+            if current_shader is not None:
+                shader = read_odr_shader(line, material_name_limit)
+                if shader:
+                    current_shader.update(shader)
+                continue
+
+            lod = read_odr_lod(line)
+            if lod:
+                lod_name, lod_data = lod
+                data["lods"][lod_name] = lod_data
+                continue
+
+            if line.startswith("center"):
+                data["center"] = read_vector_line(line)
+                continue
+
+            if line.startswith("AABBMin"):
+                data["bounding_box"]["min"] = read_vector_line(line)
+                continue
+
+            if line.startswith("AABBMax"):
+                data["bounding_box"]["max"] = read_vector_line(line)
+                continue
+
+            if line.startswith("radius"):
+                parts = line.split()
+                data["radius"] = to_float(parts[1]) if len(parts) > 1 else None
+
+    return data
+#######################################################
+def empty_odr_data():
+    return {
+        "version": None,
+        "shaders": [],
+        "lods": {},
+        "bounding_box": {},
+        "center": None,
+        "radius": None
+    }
+#######################################################
+def read_odr_shader(line, material_name_limit=None):
+    parts = line.split()
+    if len(parts) < 2:
+        return None
+
+    shader_name = parts[0]
+    full_material_path = parts[1]
+    material_name = os.path.splitext(os.path.basename(full_material_path.replace('\\', os.sep)))[0]
+    params = [to_float(part, part) for part in parts[2:]]
+
+    return {
+        "shader_name": shader_name,
+        "material_name": clean_material_name(material_name, material_name_limit),
+        "params": params
+    }
+#######################################################
+def read_odr_lod(line):
+    parts = line.split()
+    if len(parts) < 2 or parts[0] not in LOD_ORDER:
+        return None
+
+    lod_name = parts[0]
+    mesh_file = parts[1]
+    distance = to_float(parts[2]) if len(parts) > 2 else None
+    return lod_name, {"mesh_file": mesh_file, "distance": distance}
+#######################################################
+def read_vector_line(line):
+    parts = line.split()[1:4]
+    if len(parts) != 3:
+        return None
+    return tuple(to_float(part, 0.0) for part in parts)
+#######################################################
+def to_float(value, fallback=None):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return fallback
+#######################################################
+def get_lod_items(odr_data):
+    lods = odr_data.get("lods", {})
+    items = []
+
+    for lod_name in LOD_ORDER:
+        lod_data = lods.get(lod_name)
+        if lod_data:
+            items.append((lod_name, lod_data))
+
+    return items
+#######################################################
+def find_matching_odr(directory, base_mesh_name):
+    odr_base_name = base_mesh_name
+
+    for suffix in LOD_SUFFIXES:
+        if odr_base_name.endswith(suffix):
+            odr_base_name = odr_base_name[: -len(suffix)]
+            break
+
+    odr_filepath = os.path.join(directory, f"{odr_base_name}.odr")
+    if os.path.exists(odr_filepath):
+        return odr_filepath
+
+    return None
+#######################################################
+def get_lod_name_from_mesh_name(base_mesh_name):
+    for lod_name in LOD_ORDER:
+        if base_mesh_name.endswith(f"_{lod_name}"):
+            return lod_name
+    return "high"
+#######################################################
+def write_odr_file(filepath, data, version="110 12"):
+    # Writes the same dict parse_odr_file() returns
+    with open(filepath, 'w', encoding='utf-8', newline='\r\n') as file:
+        file.write(f"Version {data.get('version') or version}\n")
+
+        file.write("Shaders\n")
+        for shader in data.get("shaders", []):
+            params = ' '.join(str(param) for param in shader.get("params", []))
+            file.write("{\n")
+            file.write(f"    {shader.get('shader_name', 'gta_default.sps')} {shader.get('material_name') or 'default_material'}.sps {params}".rstrip() + "\n")
+            file.write("}\n")
+
+        lods = data.get("lods", {})
+        for lod_name in LOD_ORDER:
+            lod_data = lods.get(lod_name)
+            if lod_data:
+                distance = lod_data.get("distance")
+                file.write(f"{lod_name} {lod_data['mesh_file']} {9999.0 if distance is None else distance:.1f}\n")
+
+        if data.get("center") is not None:
+            file.write("center {:.6f} {:.6f} {:.6f}\n".format(*data["center"]))
+
+        bounds = data.get("bounding_box", {})
+        if bounds.get("min") is not None and bounds.get("max") is not None:
+            file.write("AABBMin {:.6f} {:.6f} {:.6f}\n".format(*bounds["min"]))
+            file.write("AABBMax {:.6f} {:.6f} {:.6f}\n".format(*bounds["max"]))
+
+        if data.get("radius") is not None:
+            file.write(f"radius {data['radius']:.6f}\n")
@@ -24,21 +24,154 @@
 import os
 import bpy
 
+from collections import namedtuple
+
 from mathutils import Vector
 from bpy.types import Operator
 from bpy.props import BoolProperty, CollectionProperty, StringProperty
 from bpy_extras.io_utils import ImportHelper
 
+from ..REutils.mesh_builder import build_mesh
+from ..REutils.import_stats import ImportStats, NULL_STATS
+from ..REops.wdr_importer import report_import_stats
+from ..REops.background_import import BackgroundImportMixin
+from ..oFLib.mesh_iv import (
+    MATERIAL_NAME_LIMIT,
+    parse_mesh_file,
+    clean_material_name,
+    ensure_valid_vertices,
+    ensure_valid_faces
+)
+from ..oFLib.odr_iv import (
+    parse_odr_file,
+    empty_odr_data,
+    get_lod_items,
+    find_matching_odr,
+    get_lod_name_from_mesh_name
+)
+
+
+ParsedMesh = namedtuple("ParsedMesh", ("name", "lod_name", "vertices", "faces", "materials"))
+
+
+class ParsedOpenFormat:
+    # One selected .odr/.mesh, read and waiting for its Blender objects
+    __slots__ = ("source", "collection_name", "odr_data", "helpers_name", "meshes")
+
+    def __init__(self, source, collection_name, odr_data, helpers_name=None):
+        self.source = source
+        self.collection_name = collection_name
+        self.odr_data = odr_data
+        self.helpers_name = helpers_name    # Base name of the bounds helpers, None for no helpers
+        self.meshes = []
+
+
+#######################################################
+# Reading is bpy-free, so a background import runs it on a worker thread. It returns
+# ([ParsedOpenFormat], [(report level, message)]); messages are reported once objects exist.
+def read_openformat_files(filepaths, name_limit=None, import_all_lods=True, stats=NULL_STATS, progress=None):
+    parsed_files = []
+    messages = []
+
+    for done, filepath in enumerate(filepaths, 1):
+        selected_file = os.path.basename(filepath)
+        extension = os.path.splitext(selected_file)[1].lower()
+
+        try:
+            if extension == ".odr":
+                parsed_files.append(read_odr_import(filepath, name_limit, import_all_lods, stats, messages))
+            elif extension == ".mesh":
+                parsed_files.append(read_mesh_with_matching_odr(filepath, name_limit, stats, messages))
+            else:
+                messages.append(({'WARNING'}, f"Skipped unsupported OpenIV openFormat file: {selected_file}"))
+
+        except Exception as error:
+            messages.append(({'ERROR'}, f"Error importing {selected_file}: {error}"))
+
+        if progress is not None:
+            progress(done, len(filepaths))
+
+    return parsed_files, messages
+
+
+def read_odr_import(odr_filepath, name_limit, import_all_lods, stats, messages):
+    directory = os.path.dirname(odr_filepath)
+    base_name = os.path.splitext(os.path.basename(odr_filepath))[0]
+    odr_data = read_odr(odr_filepath, name_limit, stats)
+    parsed_file = ParsedOpenFormat(os.path.basename(odr_filepath), f"{base_name}.odr", odr_data, base_name)
+
+    lod_items = get_lod_items(odr_data)
+
+    if not import_all_lods and lod_items:
+        lod_items = lod_items[:1]
+
+    if not lod_items:
+        guessed_mesh = os.path.join(directory, f"{base_name}_high.mesh")
+        if not os.path.exists(guessed_mesh):
+            guessed_mesh = os.path.join(directory, f"{base_name}.mesh")
+        lod_items = [("high", {"mesh_file": os.path.basename(guessed_mesh), "distance": None})]
+
+    for lod_name, lod_data in lod_items:
+        mesh_file = lod_data.get("mesh_file")
+        if not mesh_file:
+            continue
+
+        mesh_filepath = os.path.join(directory, mesh_file)
+        if not os.path.exists(mesh_filepath):
+            messages.append(({'WARNING'}, f"Missing {lod_name} mesh referenced by {os.path.basename(odr_filepath)}: {mesh_file}"))
+            continue
+
+        parsed_file.meshes.append(read_mesh(mesh_filepath, lod_name, name_limit, stats))
+
+    return parsed_file
+
+
+def read_mesh_with_matching_odr(mesh_filepath, name_limit, stats, messages):
+    directory = os.path.dirname(mesh_filepath)
+    mesh_name = os.path.basename(mesh_filepath)
+    base_mesh_name = os.path.splitext(mesh_name)[0]
+    odr_filepath = find_matching_odr(directory, base_mesh_name)
+    odr_data = read_odr(odr_filepath, name_limit, stats) if odr_filepath else empty_odr_data()
+    collection_name = os.path.basename(odr_filepath) if odr_filepath else f"{base_mesh_name}.mesh"
+    helpers_name = os.path.splitext(os.path.basename(odr_filepath))[0] if odr_filepath else None
+    parsed_file = ParsedOpenFormat(mesh_name, collection_name, odr_data, helpers_name)
+
+    parsed_file.meshes.append(read_mesh(mesh_filepath, get_lod_name_from_mesh_name(base_mesh_name), name_limit, stats))
+
+    if odr_filepath:
+        messages.append(({'INFO'}, f"Imported {mesh_name} with matching {os.path.basename(odr_filepath)} data applied."))
+    else:
+        messages.append(({'WARNING'}, f"Imported {mesh_name} but no matching .odr file found."))
+
+    return parsed_file
+
 
-LOD_ORDER = ("high", "med", "low", "vlow")
-LOD_SUFFIXES = ("_high", "_med", "_low", "_vlow")
+def read_odr(odr_filepath, name_limit, stats):
+    with stats.stage('text_parse'):
+        odr_data = parse_odr_file(odr_filepath, name_limit)
+    stats.count('bytes_read', os.path.getsize(odr_filepath))
+    return odr_data
 
 
-class ImportOpenIVFormats(Operator, ImportHelper):
+def read_mesh(mesh_filepath, lod_name, name_limit, stats):
+    with stats.stage('text_parse'):
+        vertices, faces, mesh_materials = parse_mesh_file(mesh_filepath, name_limit)
+        vertices = ensure_valid_vertices(vertices)
+        faces = ensure_valid_faces(faces, len(vertices))
+    stats.count('bytes_read', os.path.getsize(mesh_filepath))
+    stats.count('vertices', len(vertices))
+    stats.count('triangles', len(faces))
+
+    mesh_name = os.path.splitext(os.path.basename(mesh_filepath))[0]
+    return ParsedMesh(mesh_name, lod_name, vertices, faces, mesh_materials)
+
+
+class ImportOpenIVFormats(BackgroundImportMixin, Operator, ImportHelper):
     bl_idname = "import_scene.openiv_formats"
     bl_label = "Import OpenIV openFormats"
     bl_options = {'REGISTER', 'UNDO'}
     filename_ext = ".odr"
+    import_kind = "openFormat"
 
     filter_glob: StringProperty(default="*.odr;*.mesh", options={'HIDDEN'}, maxlen=255)
 
@@ -71,109 +204,66 @@ class ImportOpenIVFormats(Operator, ImportHelper):
         default=True
     )
 
+    write_stats_json: BoolProperty(
+        name="Write Import Stats",
+        description="Save stage timings and counters as JSON next to the imported file",
+        default=False
+    )
+
     def execute(self, context):
+        self._stats = stats = ImportStats(self.filepath, "openFormat")
         directory = os.path.dirname(self.filepath)
         selected_files = [file_elem.name for file_elem in self.files]
 
         if not selected_files:
             selected_files = [os.path.basename(self.filepath)]
 
-        imported_count = 0
+        filepaths = [os.path.join(directory, selected_file) for selected_file in selected_files]
+        name_limit = self.material_name_limit()
+        import_all_lods = self.import_all_lods
+        return self.run_import(context, lambda job: read_openformat_files(filepaths, name_limit, import_all_lods, stats, job.report))
 
-        for selected_file in selected_files:
-            filepath = os.path.join(directory, selected_file)
-            extension = os.path.splitext(selected_file)[1].lower()
+    def build_import(self, context, parsed):
+        parsed_files, messages = parsed
+        total = sum(len(parsed_file.meshes) for parsed_file in parsed_files)
+        self._imported_count = 0
 
+        for parsed_file in parsed_files:
             try:
-                if extension == ".odr":
-                    imported_count += self.import_odr(context, filepath)
-                elif extension == ".mesh":
-                    imported_count += self.import_mesh_with_matching_odr(context, filepath)
-                else:
-                    self.report({'WARNING'}, f"Skipped unsupported OpenIV openFormat file: {selected_file}")
+                collection = self.create_collection(context, parsed_file.collection_name)
+                for parsed_mesh in parsed_file.meshes:
+                    self.import_mesh_file(context, parsed_mesh, collection, parsed_file.odr_data)
+                    self._imported_count += 1
+                    yield self._imported_count, total
+
+                if self.create_bounds and parsed_file.helpers_name:
+                    self.create_odr_helpers(collection, parsed_file.odr_data, parsed_file.helpers_name)
 
             except Exception as error:
-                self.report({'ERROR'}, f"Error importing {selected_file}: {error}")
+                self.report({'ERROR'}, f"Error importing {parsed_file.source}: {error}")
+
+    def finish_import(self, context, parsed):
+        parsed_files, messages = parsed
+        for level, message in messages:
+            self.report(level, message)
 
-        if imported_count == 0:
+        if self._imported_count == 0:
             return {'CANCELLED'}
 
-        self.report({'INFO'}, f"Imported {imported_count} OpenIV openFormat mesh object(s).")
+        self.report({'INFO'}, f"Imported {self._imported_count} OpenIV openFormat mesh object(s).")
+        report_import_stats(self, self._stats)
         return {'FINISHED'}
 
-    def import_odr(self, context, odr_filepath):
-        directory = os.path.dirname(odr_filepath)
-        base_name = os.path.splitext(os.path.basename(odr_filepath))[0]
-        odr_data = self.parse_odr_file(odr_filepath)
-        collection = self.create_collection(context, f"{base_name}.odr")
-
-        imported_count = 0
-        lod_items = self.get_lod_items(odr_data)
-
-        if not self.import_all_lods and lod_items:
-            lod_items = lod_items[:1]
-
-        if not lod_items:
-            guessed_mesh = os.path.join(directory, f"{base_name}_high.mesh")
-            if not os.path.exists(guessed_mesh):
-                guessed_mesh = os.path.join(directory, f"{base_name}.mesh")
-            lod_items = [("high", {"mesh_file": os.path.basename(guessed_mesh), "distance": None})]
-
-        for lod_name, lod_data in lod_items:
-            mesh_file = lod_data.get("mesh_file")
-            if not mesh_file:
-                continue
-
-            mesh_filepath = os.path.join(directory, mesh_file)
-            if not os.path.exists(mesh_filepath):
-                self.report({'WARNING'}, f"Missing {lod_name} mesh referenced by {os.path.basename(odr_filepath)}: {mesh_file}")
-                continue
-
-            obj = self.import_mesh_file(context, mesh_filepath, collection, odr_data, lod_name)
-            if obj:
-                imported_count += 1
-
-        if self.create_bounds:
-            self.create_odr_helpers(collection, odr_data, base_name)
-
-        return imported_count
-
-    def import_mesh_with_matching_odr(self, context, mesh_filepath):
-        directory = os.path.dirname(mesh_filepath)
-        mesh_name = os.path.basename(mesh_filepath)
-        base_mesh_name = os.path.splitext(mesh_name)[0]
-        odr_filepath = self.find_matching_odr(directory, base_mesh_name)
-        odr_data = self.parse_odr_file(odr_filepath) if odr_filepath else self.empty_odr_data()
-        collection_name = os.path.basename(odr_filepath) if odr_filepath else f"{base_mesh_name}.mesh"
-        collection = self.create_collection(context, collection_name)
-        lod_name = self.get_lod_name_from_mesh_name(base_mesh_name)
-
-        obj = self.import_mesh_file(context, mesh_filepath, collection, odr_data, lod_name)
-
-        if obj and self.create_bounds and odr_filepath:
-            self.create_odr_helpers(collection, odr_data, os.path.splitext(os.path.basename(odr_filepath))[0])
-
-        if odr_filepath:
-            self.report({'INFO'}, f"Imported {mesh_name} with matching {os.path.basename(odr_filepath)} data applied.")
-        else:
-            self.report({'WARNING'}, f"Imported {mesh_name} but no matching .odr file found.")
-
-        return 1 if obj else 0
+    def import_mesh_file(self, context, parsed_mesh, collection, odr_data):
+        stats = self._stats
+        with stats.stage('mesh_build'):
+            mesh = build_mesh(parsed_mesh.name, parsed_mesh.vertices, parsed_mesh.faces)
 
-    def import_mesh_file(self, context, mesh_filepath, collection, odr_data, lod_name):
-        vertices, faces, mesh_materials = self.parse_mesh_file(mesh_filepath)
-        vertices = self.ensure_valid_vertices(vertices)
-        faces = self.ensure_valid_faces(faces, len(vertices))
+        obj = bpy.data.objects.new(name=parsed_mesh.name, object_data=mesh)
+        stats.count('objects_created')
+        obj["openiv_lod"] = parsed_mesh.lod_name
 
-        mesh_name = os.path.splitext(os.path.basename(mesh_filepath))[0]
-        mesh = bpy.data.meshes.new(name=mesh_name)
-        mesh.from_pydata(vertices, [], faces)
-        mesh.update()
-
-        obj = bpy.data.objects.new(name=mesh_name, object_data=mesh)
-        obj["openiv_lod"] = lod_name
-
-        lod_info = odr_data.get("lods", {}).get(lod_name)
+        lod_info = odr_data.get("lods", {}).get(parsed_mesh.lod_name)
         if lod_info and lod_info.get("distance") is not None:
             obj["openiv_lod_distance"] = lod_info["distance"]
 
@@ -181,7 +271,7 @@ class ImportOpenIVFormats(Operator, ImportHelper):
         context.view_layer.objects.active = obj
         obj.select_set(True)
 
-        for material_name in mesh_materials:
+        for material_name in parsed_mesh.materials:
             material = self.get_or_create_material(material_name)
             if not self.mesh_has_material(mesh, material.name):
                 mesh.materials.append(material)
@@ -201,258 +291,6 @@ class ImportOpenIVFormats(Operator, ImportHelper):
             context.scene.collection.children.link(collection)
         return collection
 
-    def get_lod_items(self, odr_data):
-        lods = odr_data.get("lods", {})
-        items = []
-
-        for lod_name in LOD_ORDER:
-            lod_data = lods.get(lod_name)
-            if lod_data:
-                items.append((lod_name, lod_data))
-
-        return items
-
-    def find_matching_odr(self, directory, base_mesh_name):
-        odr_base_name = base_mesh_name
-
-        for suffix in LOD_SUFFIXES:
-            if odr_base_name.endswith(suffix):
-                odr_base_name = odr_base_name[: -len(suffix)]
-                break
-
-        odr_filepath = os.path.join(directory, f"{odr_base_name}.odr")
-        if os.path.exists(odr_filepath):
-            return odr_filepath
-
-        return None
-
-    def get_lod_name_from_mesh_name(self, base_mesh_name):
-        for lod_name in LOD_ORDER:
-            if base_mesh_name.endswith(f"_{lod_name}"):
-                return lod_name
-        return "high"
-
-    def ensure_valid_vertices(self, vertices):
-        valid_vertices = [vertex for vertex in vertices if self.is_valid_vertex(vertex)]
-
-        if not valid_vertices:
-            return [(0.0, 0.0, 0.0)]
-
-        for index, vertex in enumerate(vertices):
-            if not self.is_valid_vertex(vertex):
-                nearest_valid = valid_vertices[-1]
-                vertices[index] = (nearest_valid[0] + 0.1, nearest_valid[1] + 0.1, nearest_valid[2] + 0.1)
-
-        return vertices
-
-    def ensure_valid_faces(self, faces, vertex_count):
-        valid_faces = [face for face in faces if self.is_valid_face(face, vertex_count)]
-
-        if not valid_faces:
-            if vertex_count >= 3:
-                return [(0, 1, 2)]
-            return []
-
-        for index, face in enumerate(faces):
-            if not self.is_valid_face(face, vertex_count):
-                faces[index] = valid_faces[-1]
-
-        return faces
-
-    def is_valid_vertex(self, vertex):
-        return isinstance(vertex, tuple) and len(vertex) == 3 and all(isinstance(coord, float) for coord in vertex)
-
-    def is_valid_face(self, face, vertex_count):
-        return isinstance(face, tuple) and len(face) >= 3 and all(isinstance(index, int) and 0 <= index < vertex_count for index in face[:3])
-
-    def parse_mesh_file(self, filepath):
-        vertices = []
-        faces = []
-        materials = []
-        reading_vertices = False
-        reading_faces = False
-
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
-            lines = file.readlines()
-
-        if not lines or not lines[0].strip().startswith("Version"):
-            raise ValueError("Unsupported .mesh file. Missing Version line.")
-
-        for line in lines[1:]:
-            stripped_line = line.strip()
-
-            if not stripped_line:
-                continue
-
-            if stripped_line.startswith("Verts"):
-                reading_vertices = True
-                reading_faces = False
-                continue
-
-            if stripped_line.startswith("Idx"):
-                reading_faces = True
-                reading_vertices = False
-                continue
-
-            if stripped_line.startswith("Material"):
-                material_name = self.read_mesh_material_name(stripped_line)
-                if material_name:
-                    materials.append(material_name)
-                continue
-
-            if stripped_line == "}":
-                reading_vertices = False
-                reading_faces = False
-                continue
-
-            if reading_vertices:
-                vertex = self.read_mesh_vertex(stripped_line)
-                if vertex:
-                    vertices.append(vertex)
-                continue
-
-            if reading_faces:
-                face = self.read_mesh_face(stripped_line)
-                if face:
-                    faces.append(face)
-
-        return vertices, faces, materials
-
-    def read_mesh_vertex(self, line):
-        position_text = line.split('/', 1)[0].strip()
-        parts = position_text.split()
-
-        if len(parts) < 3:
-            return None
-
-        try:
-            return (float(parts[0]), float(parts[1]), float(parts[2]))
-        except ValueError:
-            return None
-
-    def read_mesh_face(self, line):
-        face_indices = []
-
-        for part in line.replace(',', ' ').split():
-            try:
-                face_indices.append(int(part))
-            except ValueError:
-                pass
-
-        if len(face_indices) >= 3:
-            return (face_indices[0], face_indices[1], face_indices[2])
-
-        return None
-
-    def read_mesh_material_name(self, line):
-        parts = line.split()
-        if len(parts) < 2:
-            return None
-
-        material_name = os.path.splitext(os.path.basename(parts[1].replace('\\', os.sep)))[0]
-        return self.clean_material_name(material_name)
-
-    def parse_odr_file(self, filepath):
-        data = self.empty_odr_data()
-        current_shader = None
-
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
-            for line in file:
-                line = line.strip()
-
-                if not line:
-                    continue
-
-                if line.startswith("Version"):
-                    parts = line.split()
-                    data["version"] = parts[1] if len(parts) > 1 else None
-                    continue
-
-                if line.startswith("Shaders"):
-                    continue
-
-                if line.startswith("{"):
-                    current_shader = {}
-                    continue
-
-                if line.startswith("}"):
-                    if current_shader:
-                        data["shaders"].append(current_shader)
-                    current_shader = None
-                    continue
-
-                if current_shader is not None:
-                    shader = self.read_odr_shader(line)
-                    if shader:
-                        current_shader.update(shader)
-                    continue
-
-                lod = self.read_odr_lod(line)
-                if lod:
-                    lod_name, lod_data = lod
-                    data["lods"][lod_name] = lod_data
-                    continue
-
-                if line.startswith("center"):
-                    data["center"] = self.read_vector_line(line)
-                    continue
-
-                if line.startswith("AABBMin"):
-                    data["bounding_box"]["min"] = self.read_vector_line(line)
-                    continue
-
-                if line.startswith("AABBMax"):
-                    data["bounding_box"]["max"] = self.read_vector_line(line)
-                    continue
-
-                if line.startswith("radius"):
-                    parts = line.split()
-                    data["radius"] = self.to_float(parts[1]) if len(parts) > 1 else None
-
-        return data
-
-    def empty_odr_data(self):
-        return {
-            "version": None,
-            "shaders": [],
-            "lods": {},
-            "bounding_box": {},
-            "center": None,
-            "radius": None
-        }
-
-    def read_odr_shader(self, line):
-        parts = line.split()
-        if len(parts) < 2:
-            return None
-
-        shader_name = parts[0]
-        full_material_path = parts[1]
-        material_name = os.path.splitext(os.path.basename(full_material_path.replace('\\', os.sep)))[0]
-        params = [self.to_float(part, part) for part in parts[2:]]
-
-        return {
-            "shader_name": shader_name,
-            "material_name": self.clean_material_name(material_name),
-            "params": params
-        }
-
-    def read_odr_lod(self, line):
-        parts = line.split()
-        if len(parts) < 2 or parts[0] not in LOD_ORDER:
-            return None
-
-        lod_name = parts[0]
-        mesh_file = parts[1]
-        distance = self.to_float(parts[2]) if len(parts) > 2 else None
-        return lod_name, {"mesh_file": mesh_file, "distance": distance}
-
-    def read_vector_line(self, line):
-        parts = line.split()[1:4]
-        if len(parts) != 3:
-            return None
-        return tuple(self.to_float(part, 0.0) for part in parts)
-
     def apply_odr_data_to_mesh(self, mesh_obj, data):
         for shader_info in data.get("shaders", []):
             material = self.create_material(shader_info)
@@ -500,10 +338,7 @@ class ImportOpenIVFormats(Operator, ImportHelper):
             (5, 1), (5, 4), (5, 7),
             (6, 2), (6, 4), (6, 7),
         ]
-        mesh = bpy.data.meshes.new(mesh_name)
-        mesh.from_pydata(vertices, edges, [])
-        mesh.update()
-        return mesh
+        return build_mesh(mesh_name, vertices, edges=edges)
 
     def create_material(self, shader_info):
         material_name = shader_info.get("material_name") or "default_material"
@@ -535,17 +370,11 @@ class ImportOpenIVFormats(Operator, ImportHelper):
         return material
 
     def clean_material_name(self, material_name):
-        if not material_name:
-            material_name = "default_material"
-        if self.limit_material_name:
-            material_name = material_name[:20]
-        return material_name
+        return clean_material_name(material_name, self.material_name_limit())
+
+    def material_name_limit(self):
+        return MATERIAL_NAME_LIMIT if self.limit_material_name else None
 
-    def to_float(self, value, fallback=None):
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return fallback
 
 
 